@@ -0,0 +1,42 @@
+"""Add indexes for hot foreign-key and lookup columns
+
+Revision ID: 005_add_lookup_indexes
+Revises: 004_add_mod_build_phases
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "005_add_lookup_indexes"
+down_revision = "004_add_mod_build_phases"
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, covering columns)
+# playstyle_mods needs no index: its (playstyle_id, mod_id) primary key
+# already serves lookups by playstyle_id.
+INDEXES = [
+    ("ix_modlists_user_id_created_at", "modlists", ["user_id", "created_at", "id"], []),
+    ("ix_modlist_entries_modlist_id_load_order", "modlist_entries", ["modlist_id", "load_order"], ["id"]),
+    ("ix_modlist_knowledge_flags_modlist_id", "modlist_knowledge_flags", ["modlist_id"], ["id"]),
+    ("ix_mod_build_phases_game_id_phase_number", "mod_build_phases", ["game_id", "phase_number"], []),
+    ("ix_compatibility_rules_mod_id", "compatibility_rules", ["mod_id"], []),
+    ("ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], []),
+    ("ix_mods_nexus_game_domain_nexus_mod_id", "mods", ["nexus_game_domain", "nexus_mod_id"], []),
+]
+
+
+def upgrade() -> None:
+    # Idempotent: IF NOT EXISTS, since create_all may already have built them
+    for name, table, columns, include in INDEXES:
+        op.create_index(
+            name, table, columns,
+            if_not_exists=True,
+            postgresql_include=include,
+        )
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
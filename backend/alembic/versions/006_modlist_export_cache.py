@@ -0,0 +1,42 @@
+"""Persist resolved Nexus file IDs and materialized export payloads
+
+Revision ID: 006_modlist_export_cache
+Revises: 005_add_lookup_indexes
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "006_modlist_export_cache"
+down_revision = "005_add_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _column_exists(table: str, column: str) -> bool:
+    conn = op.get_bind()
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table, "column": column})
+    return result.scalar() is not None
+
+
+NEW_COLUMNS = [
+    ("modlist_entries", sa.Column("nexus_file_id", sa.Integer(), nullable=True)),
+    ("modlists", sa.Column("export_payload", sa.JSON(), nullable=True)),
+    ("modlists", sa.Column("export_etag", sa.String(64), nullable=True)),
+    ("modlists", sa.Column("export_refreshed_at", sa.DateTime(), nullable=True)),
+]
+
+
+def upgrade() -> None:
+    for table, column in NEW_COLUMNS:
+        if not _column_exists(table, column.name):
+            op.add_column(table, column)
+
+
+def downgrade() -> None:
+    for table, column in reversed(NEW_COLUMNS):
+        op.drop_column(table, column.name)
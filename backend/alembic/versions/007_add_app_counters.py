@@ -0,0 +1,47 @@
+"""Add app_counters table for stats and the reference-data version
+
+Revision ID: 007_add_app_counters
+Revises: 006_modlist_export_cache
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007_add_app_counters"
+down_revision = "006_modlist_export_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'app_counters'"
+    ))
+    if result.scalar() is None:
+        op.create_table(
+            "app_counters",
+            sa.Column("name", sa.String(50), primary_key=True),
+            sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        )
+
+    # Backfill the stats counter once, then keep it incrementally
+    conn.execute(sa.text("""
+        INSERT INTO app_counters (name, value)
+        SELECT 'modlists_generated', COUNT(*) FROM modlists
+        ON CONFLICT (name) DO NOTHING
+    """))
+
+    # Schema changed: invalidate cached reference data in running processes
+    conn.execute(sa.text("""
+        INSERT INTO app_counters (name, value) VALUES ('reference_data_version', 1)
+        ON CONFLICT (name) DO UPDATE SET value = app_counters.value + 1
+    """))
+
+
+def downgrade() -> None:
+    op.drop_table("app_counters")
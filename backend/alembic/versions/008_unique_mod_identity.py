@@ -0,0 +1,67 @@
+"""Make (nexus_game_domain, nexus_mod_id) a unique mod identity
+
+Revision ID: 008_unique_mod_identity
+Revises: 007_add_app_counters
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "008_unique_mod_identity"
+down_revision = "007_add_app_counters"
+branch_labels = None
+depends_on = None
+
+# Duplicate mods rows → the lowest id for the same Nexus identity
+_DUPLICATES = """
+    SELECT id, keep_id FROM (
+        SELECT id, MIN(id) OVER (PARTITION BY nexus_game_domain, nexus_mod_id) AS keep_id
+        FROM mods WHERE nexus_mod_id IS NOT NULL
+    ) d WHERE id <> keep_id
+"""
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Merge any duplicates so the unique index can be built: repoint
+    # references to the surviving row, then drop the extras
+    conn.execute(sa.text(f"CREATE TEMP TABLE mod_duplicates AS {_DUPLICATES}"))
+    conn.execute(sa.text("""
+        DELETE FROM playstyle_mods pm USING mod_duplicates d
+        WHERE pm.mod_id = d.id AND EXISTS (
+            SELECT 1 FROM playstyle_mods k
+            WHERE k.playstyle_id = pm.playstyle_id AND k.mod_id = d.keep_id
+        )
+    """))
+    for table, column in [
+        ("playstyle_mods", "mod_id"),
+        ("compatibility_rules", "mod_id"),
+        ("compatibility_rules", "related_mod_id"),
+        ("compatibility_rules", "patch_mod_id"),
+        ("modlist_entries", "mod_id"),
+    ]:
+        conn.execute(sa.text(
+            f"UPDATE {table} t SET {column} = d.keep_id "
+            f"FROM mod_duplicates d WHERE t.{column} = d.id"
+        ))
+    conn.execute(sa.text("DELETE FROM mods WHERE id IN (SELECT id FROM mod_duplicates)"))
+    conn.execute(sa.text("DROP TABLE mod_duplicates"))
+
+    op.drop_index("ix_mods_nexus_game_domain_nexus_mod_id", table_name="mods", if_exists=True)
+    op.create_index(
+        "uq_mods_nexus_game_domain_nexus_mod_id", "mods",
+        ["nexus_game_domain", "nexus_mod_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_mods_nexus_game_domain_nexus_mod_id", table_name="mods", if_exists=True)
+    op.create_index(
+        "ix_mods_nexus_game_domain_nexus_mod_id", "mods",
+        ["nexus_game_domain", "nexus_mod_id"],
+        if_not_exists=True,
+    )
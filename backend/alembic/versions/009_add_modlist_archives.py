@@ -0,0 +1,45 @@
+"""Add modlist_archives table for archived anonymous modlists
+
+Revision ID: 009_add_modlist_archives
+Revises: 008_unique_mod_identity
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "009_add_modlist_archives"
+down_revision = "008_unique_mod_identity"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'modlist_archives'"
+    ))
+    if result.scalar() is None:
+        op.create_table(
+            "modlist_archives",
+            sa.Column("id", UUID(as_uuid=True), primary_key=True),
+            sa.Column("game_id", sa.Integer(), sa.ForeignKey("games.id"), nullable=False),
+            sa.Column("playstyle_id", sa.Integer(), nullable=False),
+            sa.Column("llm_provider", sa.String(100), nullable=True),
+            sa.Column("entry_count", sa.Integer(), nullable=False, server_default="0"),
+            sa.Column("payload", sa.LargeBinary(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("archived_at", sa.DateTime(), nullable=False),
+        )
+    op.create_index(
+        "ix_modlist_archives_created_at", "modlist_archives", ["created_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("modlist_archives")
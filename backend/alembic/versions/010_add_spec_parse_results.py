@@ -0,0 +1,35 @@
+"""Add spec_parse_results table caching LLM spec parses
+
+Revision ID: 010_add_spec_parse_results
+Revises: 009_add_modlist_archives
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010_add_spec_parse_results"
+down_revision = "009_add_modlist_archives"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: only create if table doesn't exist
+    result = conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables "
+        "WHERE table_name = 'spec_parse_results'"
+    ))
+    if result.scalar() is None:
+        op.create_table(
+            "spec_parse_results",
+            sa.Column("text_hash", sa.String(64), primary_key=True),
+            sa.Column("specs", sa.JSON(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("spec_parse_results")
@@ -0,0 +1,49 @@
+"""Fix the inverted Frostfall/SkyUI "requires" compatibility rule
+
+The seed stored "SkyUI requires Frostfall"; it is Frostfall that requires
+SkyUI. Rules are now checked when mods are added during generation, so the
+inverted row would tell the model to add Frostfall to every SkyUI list.
+
+Revision ID: 011_fix_frostfall_skyui_rule
+Revises: 010_add_spec_parse_results
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "011_fix_frostfall_skyui_rule"
+down_revision = "010_add_spec_parse_results"
+branch_labels = None
+depends_on = None
+
+_SKYUI = (
+    "(SELECT id FROM mods WHERE nexus_game_domain = 'skyrimspecialedition' AND nexus_mod_id = 12604)"
+)
+_FROSTFALL = (
+    "(SELECT id FROM mods WHERE nexus_game_domain = 'skyrimspecialedition' AND nexus_mod_id = 28029)"
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Idempotent: drop the inverted row if the correct one already exists,
+    # otherwise turn it around
+    conn.execute(sa.text(f"""
+        DELETE FROM compatibility_rules
+        WHERE rule_type = 'requires' AND mod_id = {_SKYUI} AND related_mod_id = {_FROSTFALL}
+          AND EXISTS (
+              SELECT 1 FROM compatibility_rules
+              WHERE rule_type = 'requires' AND mod_id = {_FROSTFALL} AND related_mod_id = {_SKYUI}
+          )
+    """))
+    conn.execute(sa.text(f"""
+        UPDATE compatibility_rules SET mod_id = related_mod_id, related_mod_id = mod_id
+        WHERE rule_type = 'requires' AND mod_id = {_SKYUI} AND related_mod_id = {_FROSTFALL}
+    """))
+
+
+def downgrade() -> None:
+    # Data fix only; the inverted rule is not restored
+    pass
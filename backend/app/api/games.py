@@ -1,38 +1,62 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.api.http_cache import conditional_json_response
+from app.database import get_read_db
 from app.models.game import Game
 from app.models.playstyle import Playstyle
 from app.schemas.game import GameResponse, PlaystyleResponse
+from app.services.reference_cache import ReferenceDataCache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Reference data changes only when seeds run; let browsers/CDNs reuse it
+_CACHE_CONTROL = "public, max-age=300"
+
+
+async def _cached_games(db: AsyncSession) -> tuple[list[dict], str]:
+    async def load():
+        result = await db.execute(select(Game))
+        return [GameResponse.model_validate(g).model_dump(mode="json") for g in result.scalars().all()]
+
+    return await ReferenceDataCache.get_instance().get(db, "games", load)
+
 
 @router.get("/", response_model=list[GameResponse])
-async def list_games(db: AsyncSession = Depends(get_db)):
+async def list_games(request: Request, db: AsyncSession = Depends(get_read_db)):
     try:
-        result = await db.execute(select(Game))
-        games = result.scalars().all()
-        return games
+        payload, etag = await _cached_games(db)
     except Exception as e:
         logger.exception("Failed to query games")
         raise HTTPException(status_code=503, detail=f"Database unavailable: {type(e).__name__}")
+    return conditional_json_response(request, payload, etag, _CACHE_CONTROL)
 
 
 @router.get("/{game_id}/playstyles", response_model=list[PlaystyleResponse])
-async def list_playstyles(game_id: int, db: AsyncSession = Depends(get_db)):
-    try:
+async def list_playstyles(game_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    async def load():
         result = await db.execute(
             select(Playstyle).where(Playstyle.game_id == game_id)
         )
-        playstyles = result.scalars().all()
-        return playstyles
+        return [PlaystyleResponse.model_validate(p).model_dump(mode="json") for p in result.scalars().all()]
+
+    try:
+        # Only cache playstyles for games that exist, so arbitrary IDs
+        # can't grow the cache without bound
+        games, _ = await _cached_games(db)
+        known = any(g["id"] == game_id for g in games)
+        if known:
+            payload, etag = await ReferenceDataCache.get_instance().get(
+                db, f"playstyles:{game_id}", load,
+            )
     except Exception as e:
         logger.exception("Failed to query playstyles")
         raise HTTPException(status_code=503, detail=f"Database unavailable: {type(e).__name__}")
+    if not known:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return conditional_json_response(request, payload, etag, _CACHE_CONTROL)
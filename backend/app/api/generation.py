@@ -1,29 +1,39 @@
 """Generation API: Start, stream (SSE), poll status, and resume modlist generation.
 
+Generations run through the GenerationScheduler worker pool rather than as
+unbounded background tasks.
+
 POST /api/generation/start      — Start a new generation (background task)
 GET  /api/generation/{id}/events — SSE stream (replay + live events)
 GET  /api/generation/{id}/status — Quick polling endpoint
+GET  /api/generation/stats       — Scheduler and result-cache metrics
 POST /api/generation/{id}/resume — Resume a paused generation
+POST /api/generation/{id}/cancel — Cancel a queued, running or paused generation
+WS   /api/generation/{id}/ws     — Multiplexed event stream + control channel
 """
 
 import asyncio
-import json
 import logging
 import uuid as _uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+import msgpack
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
-from app.api.modlist import save_modlist_to_db
+from app.api.modlist import clone_modlist, save_modlist_to_db
 from app.database import async_session, get_db
+from app.knowledge import KnowledgeFiles, methodology_context_stats
 from app.models.user import User
 from app.schemas.modlist import ModlistGenerateRequest
+from app.serialization import dumps, loads, sse_frame
 from app.services.auth import decode_access_token
+from app.services.generation_cache import GenerationResultCache, request_fingerprint
 from app.services.generation_manager import GenerationManager
+from app.services.generation_scheduler import GenerationScheduler
 from app.services.modlist_generator import (
     GenerationSession,
     PauseGeneration,
@@ -45,7 +55,7 @@ class GenerationStartResponse(BaseModel):
 
 
 class GenerationStatusResponse(BaseModel):
-    status: str  # running | complete | error | paused
+    status: str  # running | complete | error | paused | cancelled
     generation_id: str
     modlist_id: str | None = None
     event_count: int = 0
@@ -57,6 +67,23 @@ class ResumeResponse(BaseModel):
     status: str  # "resumed"
 
 
+class CancelResponse(BaseModel):
+    status: str  # "cancelling" | "cancelled"
+
+
+class GenerationStatsResponse(BaseModel):
+    scheduler: dict
+    result_cache: dict
+    # game slug → phase → methodology context size in prompt tokens
+    methodology: dict
+    # knowledge file version, tracked files and hot-reload count
+    knowledge: dict
+
+
+# Statuses (and matching event types) after which no more events follow
+_TERMINAL_STATUSES = ("complete", "error", "cancelled")
+
+
 # ──────────────────────────────────────────────
 # Background generation task
 # ──────────────────────────────────────────────
@@ -79,6 +106,25 @@ async def _run_generation_task(
 
     try:
         async with async_session() as db:
+            uid = _uuid.UUID(user_id) if user_id else None
+            cache = GenerationResultCache.get_instance()
+            fingerprint = await request_fingerprint(db, request)
+
+            # Serve identical requests from a recent result when opted in
+            if request.use_cache and resume_session is None:
+                cached_id = cache.lookup(fingerprint)
+                if cached_id:
+                    modlist = await clone_modlist(db, _uuid.UUID(cached_id), request, uid)
+                    if modlist:
+                        emitter({"type": "cache_hit", "source_modlist_id": cached_id})
+                        manager.set_complete(generation_id, str(modlist.id))
+                        logger.info(
+                            f"Generation {generation_id} served from cache "
+                            f"(modlist {cached_id} → {modlist.id})"
+                        )
+                        return
+                    cache.invalidate_modlist(cached_id)
+
             result = await generate_modlist(
                 db=db,
                 request=request,
@@ -86,12 +132,13 @@ async def _run_generation_task(
                 nexus_api_key=nexus_api_key,
                 resume_from_phase=resume_from_phase,
                 resume_session=resume_session,
+                control=manager.get_state(generation_id).control,
             )
 
             # Save modlist to DB
-            uid = _uuid.UUID(user_id) if user_id else None
             modlist = await save_modlist_to_db(db, request, result, uid)
             modlist_id = str(modlist.id)
+            cache.store(fingerprint, modlist_id)
 
             manager.set_complete(generation_id, modlist_id)
             logger.info(
@@ -117,12 +164,25 @@ async def _run_generation_task(
             mods_so_far=len(session_snapshot.get("modlist", [])),
         )
 
+    except asyncio.CancelledError:
+        logger.info(f"Generation {generation_id} cancelled")
+        manager.set_cancelled(generation_id)
+        raise
+
     except Exception as e:
         error_msg = f"{type(e).__name__}: {str(e)[:200]}"
         logger.error(f"Generation {generation_id} failed: {error_msg}")
         manager.set_error(generation_id, error_msg)
 
 
+def _queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many generations in progress. Please try again shortly.",
+        headers={"Retry-After": "30"},
+    )
+
+
 # ──────────────────────────────────────────────
 # Endpoints
 # ──────────────────────────────────────────────
@@ -132,10 +192,12 @@ async def start_generation(
     request: ModlistGenerateRequest,
     current_user: User = Depends(get_current_user),
 ):
-    """Start a modlist generation as a background task.
+    """Queue a modlist generation as a background task.
 
     Returns immediately with a generation_id. Use /events for SSE streaming
-    or /status for polling.
+    or /status for polling. If all worker slots are busy the generation
+    waits in the scheduler queue and receives "queued" events with its
+    position; if the queue itself is full, responds 503.
     """
     # Validate Nexus API key — required for live mod search
     nexus_key = (current_user.settings.nexus_api_key if current_user.settings else "") or ""
@@ -145,22 +207,40 @@ async def start_generation(
             detail="Nexus Mods API key required. Add one in Settings.",
         )
 
+    scheduler = GenerationScheduler.get_instance()
+    if not scheduler.has_capacity():
+        raise _queue_full()
+
     manager = GenerationManager.get_instance()
     generation_id = manager.create_generation(user_id=str(current_user.id))
 
-    # Launch the background task
-    asyncio.create_task(
-        _run_generation_task(
+    # Queue the background task; it starts as soon as a worker slot is free
+    scheduler.submit(
+        generation_id,
+        str(current_user.id),
+        lambda: _run_generation_task(
             generation_id=generation_id,
             request=request,
             user_id=str(current_user.id),
             nexus_api_key=nexus_key,
-        )
+        ),
     )
 
     return GenerationStartResponse(generation_id=generation_id)
 
 
+@router.get("/stats", response_model=GenerationStatsResponse)
+async def get_generation_stats(current_user: User = Depends(get_current_user)):
+    """Scheduler load, result-cache hit rate, methodology prompt sizes and
+    knowledge version for this API process."""
+    return GenerationStatsResponse(
+        scheduler=GenerationScheduler.get_instance().stats(),
+        result_cache=GenerationResultCache.get_instance().stats(),
+        methodology=methodology_context_stats(),
+        knowledge=KnowledgeFiles.get_instance().stats(),
+    )
+
+
 async def _get_user_from_token(token: str, db: AsyncSession) -> User | None:
     """Validate a JWT token and return the User. Used for SSE auth."""
     payload = decode_access_token(token)
@@ -206,10 +286,10 @@ async def stream_events(
         """Yields SSE-formatted events."""
         # Phase 1: Replay all stored events
         for event in state.events:
-            yield f"data: {json.dumps(event)}\n\n"
+            yield sse_frame(event)
 
         # If already terminal, stop
-        if state.status in ("complete", "error"):
+        if state.status in _TERMINAL_STATUSES:
             return
 
         # Phase 2: Subscribe to live events
@@ -221,22 +301,22 @@ async def stream_events(
             while True:
                 try:
                     event = await asyncio.wait_for(queue.get(), timeout=15.0)
-                    yield f"data: {json.dumps(event)}\n\n"
+                    yield sse_frame(event)
 
                     # Terminal events — close the stream
-                    if event.get("type") in ("complete", "error"):
+                    if event.get("type") in _TERMINAL_STATUSES:
                         return
                 except asyncio.TimeoutError:
                     # Send keepalive comment to prevent proxy/browser timeout
-                    yield ": keepalive\n\n"
+                    yield b": keepalive\n\n"
 
                     # Check if generation ended while we were waiting
                     current_state = manager.get_state(generation_id)
-                    if current_state and current_state.status in ("complete", "error", "paused"):
+                    if current_state and current_state.status in (*_TERMINAL_STATUSES, "paused"):
                         # Drain any remaining events in queue
                         while not queue.empty():
                             event = queue.get_nowait()
-                            yield f"data: {json.dumps(event)}\n\n"
+                            yield sse_frame(event)
                         return
 
         finally:
@@ -285,7 +365,7 @@ async def resume_generation(
     """Resume a paused generation from where it left off.
 
     Reconstructs the GenerationSession from the saved snapshot and
-    launches a new background task starting from the paused phase.
+    queues a new background task starting from the paused phase.
     """
     manager = GenerationManager.get_instance()
     state = manager.get_state(generation_id)
@@ -322,20 +402,215 @@ async def resume_generation(
 
     phase_number = state.paused_at_phase or 1
 
+    scheduler = GenerationScheduler.get_instance()
+    if not scheduler.has_capacity():
+        raise _queue_full()
+
     # Mark as resumed
     phase_name = state.pause_reason or "Unknown"
     manager.set_resumed(generation_id, phase_name=phase_name, phase_number=phase_number)
 
-    # Launch new background task
-    asyncio.create_task(
-        _run_generation_task(
+    # Queue new background task
+    scheduler.submit(
+        generation_id,
+        str(current_user.id),
+        lambda: _run_generation_task(
             generation_id=generation_id,
             request=request,
             user_id=str(current_user.id),
             nexus_api_key=nexus_key,
             resume_from_phase=phase_number,
             resume_session=session,
-        )
+        ),
     )
 
     return ResumeResponse(status="resumed")
+
+
+@router.post("/{generation_id}/cancel", response_model=CancelResponse)
+async def cancel_generation(
+    generation_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Cancel a generation and stop its in-flight LLM and Nexus calls.
+
+    Running generations finish cancelling asynchronously and then emit a
+    terminal "cancelled" event; queued and paused ones are cancelled
+    immediately.
+    """
+    manager = GenerationManager.get_instance()
+    state = manager.get_state(generation_id)
+    if not state:
+        raise HTTPException(status_code=404, detail="Generation not found")
+
+    if state.user_id and state.user_id != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not your generation")
+
+    if not manager.cancel(generation_id):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Generation is already {state.status}",
+        )
+
+    status = "cancelled" if state.status == "cancelled" else "cancelling"
+    return CancelResponse(status=status)
+
+
+# ──────────────────────────────────────────────
+# WebSocket transport
+# ──────────────────────────────────────────────
+
+_WS_SUBPROTOCOL_MSGPACK = "msgpack"
+_WS_AUTH_TIMEOUT = 10.0
+_WS_CLOSE_UNAUTHORIZED = 4401
+
+
+@router.websocket("/{generation_id}/ws")
+async def generation_socket(websocket: WebSocket, generation_id: str):
+    """Bidirectional generation channel sharing the SSE event store.
+
+    Protocol (one JSON text frame per message, or one binary msgpack frame
+    when the client negotiates the "msgpack" subprotocol):
+
+    1. The client's first message must be {"type": "auth", "token": <JWT>},
+       so the token never has to appear in the URL.
+    2. The server replays and then streams events for {generation_id} as
+       {"type": "event", "generation_id": ..., "event": {...}}.
+    3. The client may then send, each optionally carrying a
+       "generation_id" (defaults to the one in the path):
+         {"type": "subscribe"} / {"type": "unsubscribe"} — multiplex more
+             generations over the same connection
+         {"type": "cancel"}
+         {"type": "pause_after_phase"} — refused during the last phase
+         {"type": "skip_phase", "phase_number": N}
+       Each is answered with {"type": "ack", ...} or {"type": "error", ...}.
+    """
+    binary = _WS_SUBPROTOCOL_MSGPACK in websocket.scope.get("subprotocols", [])
+    await websocket.accept(subprotocol=_WS_SUBPROTOCOL_MSGPACK if binary else None)
+
+    send_lock = asyncio.Lock()
+
+    async def send(frame: dict) -> None:
+        async with send_lock:
+            if binary:
+                await websocket.send_bytes(msgpack.packb(frame))
+            else:
+                await websocket.send_text(dumps(frame))
+
+    async def receive() -> dict:
+        if binary:
+            message = msgpack.unpackb(await websocket.receive_bytes())
+        else:
+            message = loads(await websocket.receive_text())
+        if not isinstance(message, dict):
+            raise ValueError("Frame must be an object")
+        return message
+
+    # Authenticate with the first frame
+    try:
+        auth = await asyncio.wait_for(receive(), timeout=_WS_AUTH_TIMEOUT)
+    except WebSocketDisconnect:
+        return
+    except (asyncio.TimeoutError, ValueError, msgpack.UnpackException):
+        await websocket.close(code=_WS_CLOSE_UNAUTHORIZED)
+        return
+
+    current_user = None
+    if auth.get("type") == "auth" and isinstance(auth.get("token"), str):
+        async with async_session() as db:
+            current_user = await _get_user_from_token(auth["token"], db)
+    if not current_user:
+        await websocket.close(code=_WS_CLOSE_UNAUTHORIZED)
+        return
+
+    user_id = str(current_user.id)
+    manager = GenerationManager.get_instance()
+    forwarders: dict[str, asyncio.Task] = {}
+
+    async def forward(gid: str) -> None:
+        """Replay stored events for one generation, then stream live ones."""
+        # Subscribe before snapshotting so no event falls between the two
+        queue = await manager.subscribe(gid)
+        if not queue:
+            return
+        state = manager.get_state(gid)
+        replay = list(state.events)
+        try:
+            for event in replay:
+                await send({"type": "event", "generation_id": gid, "event": event})
+            if state.status in _TERMINAL_STATUSES:
+                return
+            while True:
+                event = await queue.get()
+                await send({"type": "event", "generation_id": gid, "event": event})
+                if event.get("type") in _TERMINAL_STATUSES:
+                    return
+        finally:
+            manager.unsubscribe(gid, queue)
+            forwarders.pop(gid, None)
+
+    def owned_state(gid: str):
+        state = manager.get_state(gid)
+        if not state or state.user_id != user_id:
+            return None
+        return state
+
+    async def handle(message: dict) -> None:
+        action = message.get("type")
+        gid = message.get("generation_id") or generation_id
+        state = owned_state(gid)
+        if not state:
+            await send({"type": "error", "action": action, "generation_id": gid,
+                        "message": "Generation not found"})
+            return
+
+        if action == "subscribe":
+            if gid not in forwarders:
+                forwarders[gid] = asyncio.create_task(forward(gid))
+        elif action == "unsubscribe":
+            task = forwarders.pop(gid, None)
+            if task:
+                task.cancel()
+        elif action == "cancel":
+            if not manager.cancel(gid):
+                await send({"type": "error", "action": action, "generation_id": gid,
+                            "message": f"Generation is {state.status}"})
+                return
+        elif action == "pause_after_phase":
+            if state.status not in ("queued", "running"):
+                await send({"type": "error", "action": action, "generation_id": gid,
+                            "message": f"Generation is {state.status}"})
+                return
+            if not state.control.can_pause:
+                await send({"type": "error", "action": action, "generation_id": gid,
+                            "message": "No phase follows the current one"})
+                return
+            state.control.pause_after_phase = True
+        elif action == "skip_phase":
+            try:
+                state.control.skip_phases.add(int(message["phase_number"]))
+            except (KeyError, TypeError, ValueError):
+                await send({"type": "error", "action": action, "generation_id": gid,
+                            "message": "skip_phase requires an integer phase_number"})
+                return
+        else:
+            await send({"type": "error", "action": action, "generation_id": gid,
+                        "message": f"Unknown message type: {action}"})
+            return
+
+        await send({"type": "ack", "action": action, "generation_id": gid})
+
+    try:
+        await handle({"type": "subscribe", "generation_id": generation_id})
+        while True:
+            try:
+                message = await receive()
+            except (ValueError, msgpack.UnpackException):
+                await send({"type": "error", "message": "Malformed frame"})
+                continue
+            await handle(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        for task in list(forwarders.values()):
+            task.cancel()
@@ -0,0 +1,31 @@
+"""ETag / conditional-GET helpers for cacheable JSON endpoints."""
+
+import hashlib
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.serialization import dumps_canonical
+
+
+def compute_etag(payload) -> str:
+    """Strong ETag over the canonical JSON encoding of a payload."""
+    return '"' + hashlib.sha256(dumps_canonical(payload)).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an If-None-Match header value matches the current ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def conditional_json_response(
+    request: Request, payload, etag: str, cache_control: str,
+) -> Response:
+    """Return 304 if the client already has this ETag, else the JSON payload."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return ORJSONResponse(content=payload, headers=headers)
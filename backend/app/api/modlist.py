@@ -1,27 +1,39 @@
-import asyncio
+import base64
 import logging
 import uuid
+from datetime import datetime
+from typing import AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import delete, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, delete, func, insert, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.database import async_read_session, async_session, get_db, get_read_db, has_read_replica
 from app.models.game import Game
 from app.models.mod import Mod
 from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
 from app.models.playstyle import Playstyle
 from app.models.playstyle_mod import PlaystyleMod
 from app.models.user import User
+from app.serialization import dumpb
 from app.schemas.modlist import (
-    ExportModEntry, ModEntry, ModlistExportResponse,
-    ModlistGenerateRequest, ModlistResponse, UserKnowledgeFlag,
+    ModEntry, ModlistExportResponse,
+    ModlistGenerateRequest, ModlistResponse, ModlistSummary, UserKnowledgeFlag,
 )
 from app.services.modlist_generator import (
     generate_modlist as run_generation, GenerationResult, _is_version_compatible,
 )
-from app.services.nexus_client import NexusModsClient
+from app.services.generation_cache import GenerationResultCache
+from app.services.mod_catalog import link_entry_rows
+from app.services.modlist_archive import load_archived
+from app.services.reference_cache import MODLISTS_GENERATED, increment_counter
+from app.services.modlist_export import (
+    archived_export, export_is_stale, get_export, load_modlist_for_export, refresh_export,
+)
 from app.api.deps import get_current_user, get_current_user_optional
+from app.api.http_cache import conditional_json_response
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +45,7 @@ def _entry_to_schema(entry: ModlistEntry) -> ModEntry:
     return ModEntry(
         mod_id=entry.mod_id,
         nexus_mod_id=entry.nexus_mod_id,
+        nexus_file_id=entry.nexus_file_id,
         name=entry.name or "Unknown",
         author=entry.author,
         summary=entry.summary,
@@ -53,6 +66,183 @@ def _flag_to_schema(flag: ModlistKnowledgeFlag) -> UserKnowledgeFlag:
     )
 
 
+# ── NDJSON streaming (Accept: application/x-ndjson) ──
+
+_NDJSON = "application/x-ndjson"
+_STREAM_BATCH = 500  # rows fetched per server-side cursor round trip
+
+
+def _wants_ndjson(request: Request) -> bool:
+    return _NDJSON in request.headers.get("accept", "")
+
+
+def _ndjson(obj: dict) -> bytes:
+    return dumpb(obj) + b"\n"
+
+
+def _modlist_line(ml: Modlist) -> dict:
+    return {
+        "type": "modlist",
+        "id": ml.id,
+        "game_id": ml.game_id,
+        "playstyle_id": ml.playstyle_id,
+        "llm_provider": ml.llm_provider,
+        "used_fallback": ml.llm_provider == "fallback",
+    }
+
+
+def _entry_line(entry: ModlistEntry) -> dict:
+    return {
+        "type": "entry",
+        "modlist_id": entry.modlist_id,
+        "mod_id": entry.mod_id,
+        "nexus_mod_id": entry.nexus_mod_id,
+        "name": entry.name or "Unknown",
+        "author": entry.author,
+        "summary": entry.summary,
+        "reason": entry.reason,
+        "load_order": entry.load_order,
+        "is_patch": entry.is_patch,
+        "patches_mods": entry.patches_mods,
+        "compatibility_notes": entry.compatibility_notes,
+    }
+
+
+def _flag_line(flag: ModlistKnowledgeFlag) -> dict:
+    return {
+        "type": "flag",
+        "modlist_id": flag.modlist_id,
+        "mod_a": flag.mod_a_name,
+        "mod_b": flag.mod_b_name,
+        "issue": flag.issue,
+        "severity": flag.severity,
+    }
+
+
+async def _stream_modlist(
+    sessionmaker: async_sessionmaker, modlist_id: uuid.UUID,
+) -> AsyncIterator[bytes]:
+    """One modlist as NDJSON: a "modlist" line, its entries, then its flags.
+
+    Uses its own session: the request-scoped one is closed before a
+    streaming body is sent.
+    """
+    async with sessionmaker() as db:
+        modlist = await db.get(Modlist, modlist_id)
+        if not modlist:
+            return
+        yield _ndjson(_modlist_line(modlist))
+
+        entries = await db.stream_scalars(
+            select(ModlistEntry)
+            .where(ModlistEntry.modlist_id == modlist_id)
+            .order_by(ModlistEntry.load_order, ModlistEntry.id)
+            .execution_options(yield_per=_STREAM_BATCH)
+        )
+        async for entry in entries:
+            yield _ndjson(_entry_line(entry))
+
+        flags = await db.stream_scalars(
+            select(ModlistKnowledgeFlag)
+            .where(ModlistKnowledgeFlag.modlist_id == modlist_id)
+            .execution_options(yield_per=_STREAM_BATCH)
+        )
+        async for flag in flags:
+            yield _ndjson(_flag_line(flag))
+
+
+async def _stream_my_modlists(page: Select) -> AsyncIterator[bytes]:
+    """Modlists selected by `page` (a Modlist.id query) as NDJSON.
+
+    Modlists and entries come from a single streamed join, so each
+    "modlist" line (with a `cursor` to resume after it) is followed by its
+    entries. Flags follow at the end, tagged with their modlist_id.
+    """
+    async with async_session() as db:
+        rows = await db.stream(
+            select(Modlist, ModlistEntry)
+            .outerjoin(ModlistEntry, ModlistEntry.modlist_id == Modlist.id)
+            .where(Modlist.id.in_(page))
+            .order_by(Modlist.created_at.desc(), Modlist.id.desc(), ModlistEntry.load_order, ModlistEntry.id)
+            .execution_options(yield_per=_STREAM_BATCH)
+        )
+        current_id = None
+        async for modlist, entry in rows:
+            if modlist.id != current_id:
+                current_id = modlist.id
+                yield _ndjson({**_modlist_line(modlist), "cursor": _encode_cursor(modlist)})
+            if entry is not None:
+                yield _ndjson(_entry_line(entry))
+
+        flags = await db.stream_scalars(
+            select(ModlistKnowledgeFlag)
+            .where(ModlistKnowledgeFlag.modlist_id.in_(page))
+            .execution_options(yield_per=_STREAM_BATCH)
+        )
+        async for flag in flags:
+            yield _ndjson(_flag_line(flag))
+
+
+async def _stream_archived(archived: ModlistResponse) -> AsyncIterator[bytes]:
+    """An archived modlist in the same NDJSON shape as _stream_modlist."""
+    yield _ndjson({
+        "type": "modlist",
+        "id": archived.id,
+        "game_id": archived.game_id,
+        "playstyle_id": archived.playstyle_id,
+        "llm_provider": archived.llm_provider,
+        "used_fallback": archived.used_fallback,
+    })
+    for entry in archived.entries:
+        yield _ndjson({"type": "entry", "modlist_id": archived.id, **entry.model_dump()})
+    for flag in archived.user_knowledge_flags:
+        yield _ndjson({"type": "flag", "modlist_id": archived.id, **flag.model_dump()})
+
+
+def _entry_row(modlist_id: uuid.UUID, mod_data: dict, index: int) -> dict:
+    """Column values for one ModlistEntry built from a generated mod dict."""
+    return {
+        "modlist_id": modlist_id,
+        "nexus_mod_id": mod_data.get("nexus_mod_id"),
+        "nexus_file_id": mod_data.get("nexus_file_id"),
+        "mod_id": mod_data.get("mod_id"),
+        "name": mod_data.get("name", "Unknown"),
+        "author": mod_data.get("author"),
+        "summary": mod_data.get("summary"),
+        "reason": mod_data.get("reason"),
+        "load_order": mod_data.get("load_order", index + 1),
+        "enabled": True,
+        "download_status": "pending",
+        "is_patch": mod_data.get("is_patch", False),
+        "patches_mods": mod_data.get("patches_mods"),
+    }
+
+
+def _flag_row(modlist_id: uuid.UUID, flag_data: dict) -> dict:
+    return {
+        "modlist_id": modlist_id,
+        "mod_a_name": flag_data["mod_a"],
+        "mod_b_name": flag_data["mod_b"],
+        "issue": flag_data["issue"],
+        "severity": flag_data.get("severity", "warning"),
+    }
+
+
+async def _bulk_insert_children(
+    db: AsyncSession, entry_rows: list[dict], flag_rows: list[dict],
+) -> None:
+    """Insert entry and flag rows with one executemany INSERT per table.
+
+    Bypasses the ORM unit of work: SQLAlchemy batches the rows into
+    multi-row INSERT ... VALUES statements, which is far cheaper than
+    tracking 80+ objects on the event loop.
+    """
+    if entry_rows:
+        await db.execute(insert(ModlistEntry), entry_rows)
+    if flag_rows:
+        await db.execute(insert(ModlistKnowledgeFlag), flag_rows)
+
+
 async def save_modlist_to_db(
     db: AsyncSession,
     request: ModlistGenerateRequest,
@@ -62,6 +252,7 @@ async def save_modlist_to_db(
     """Save a generation result to the database.
 
     Creates the Modlist, ModlistEntry rows, and ModlistKnowledgeFlag rows.
+    Nexus mods are upserted into `mods` and each entry's mod_id is linked.
     Returns the saved Modlist with its generated UUID.
 
     This helper is used by both the legacy synchronous endpoint and the
@@ -80,32 +271,89 @@ async def save_modlist_to_db(
     db.add(modlist)
     await db.flush()
 
-    for i, mod_data in enumerate(result.entries):
-        entry = ModlistEntry(
-            modlist_id=modlist.id,
-            nexus_mod_id=mod_data.get("nexus_mod_id"),
-            mod_id=mod_data.get("mod_id"),
-            name=mod_data.get("name", "Unknown"),
-            author=mod_data.get("author"),
-            summary=mod_data.get("summary"),
-            reason=mod_data.get("reason"),
-            load_order=mod_data.get("load_order", i + 1),
-            enabled=True,
-            download_status="pending",
-            is_patch=mod_data.get("is_patch", False),
-            patches_mods=mod_data.get("patches_mods"),
-        )
-        db.add(entry)
-
-    for flag_data in result.knowledge_flags:
-        flag = ModlistKnowledgeFlag(
-            modlist_id=modlist.id,
-            mod_a_name=flag_data["mod_a"],
-            mod_b_name=flag_data["mod_b"],
-            issue=flag_data["issue"],
-            severity=flag_data.get("severity", "warning"),
-        )
-        db.add(flag)
+    entry_rows = [_entry_row(modlist.id, mod_data, i) for i, mod_data in enumerate(result.entries)]
+    game = await db.get(Game, request.game_id)
+    if game:
+        await link_entry_rows(db, game.nexus_domain, entry_rows)
+    await _bulk_insert_children(
+        db,
+        entry_rows,
+        [_flag_row(modlist.id, flag_data) for flag_data in result.knowledge_flags],
+    )
+    await increment_counter(db, MODLISTS_GENERATED)
+
+    await db.commit()
+    return modlist
+
+
+async def clone_modlist(
+    db: AsyncSession,
+    source_id: uuid.UUID,
+    request: ModlistGenerateRequest,
+    user_id: uuid.UUID | None = None,
+) -> Modlist | None:
+    """Copy a saved modlist (entries and flags) for a new request.
+
+    Used when a generation is served from the result cache. The copy
+    records the requesting user's hardware. Returns None if the source
+    modlist no longer exists.
+    """
+    source = await db.get(Modlist, source_id)
+    if not source:
+        return None
+
+    modlist = Modlist(
+        game_id=request.game_id,
+        playstyle_id=request.playstyle_id,
+        gpu_model=request.gpu,
+        cpu_model=request.cpu,
+        ram_gb=request.ram_gb,
+        vram_mb=request.vram_mb,
+        llm_provider=source.llm_provider,
+        user_id=user_id,
+    )
+    db.add(modlist)
+    await db.flush()
+
+    entry_result = await db.execute(
+        select(ModlistEntry).where(ModlistEntry.modlist_id == source_id)
+    )
+    flag_result = await db.execute(
+        select(ModlistKnowledgeFlag).where(ModlistKnowledgeFlag.modlist_id == source_id)
+    )
+    await _bulk_insert_children(
+        db,
+        [
+            {
+                "modlist_id": modlist.id,
+                "nexus_mod_id": e.nexus_mod_id,
+                "nexus_file_id": e.nexus_file_id,
+                "mod_id": e.mod_id,
+                "name": e.name,
+                "author": e.author,
+                "summary": e.summary,
+                "reason": e.reason,
+                "load_order": e.load_order,
+                "enabled": True,
+                "download_status": "pending",
+                "is_patch": e.is_patch,
+                "patches_mods": e.patches_mods,
+                "compatibility_notes": e.compatibility_notes,
+            }
+            for e in entry_result.scalars().all()
+        ],
+        [
+            {
+                "modlist_id": modlist.id,
+                "mod_a_name": f.mod_a_name,
+                "mod_b_name": f.mod_b_name,
+                "issue": f.issue,
+                "severity": f.severity,
+            }
+            for f in flag_result.scalars().all()
+        ],
+    )
+    await increment_counter(db, MODLISTS_GENERATED)
 
     await db.commit()
     return modlist
@@ -142,7 +390,7 @@ async def generate_modlist(
         entry_result = await db.execute(
             select(ModlistEntry)
             .where(ModlistEntry.modlist_id == modlist.id)
-            .order_by(ModlistEntry.load_order)
+            .order_by(ModlistEntry.load_order, ModlistEntry.id)
         )
         entries_schema = [_entry_to_schema(e) for e in entry_result.scalars().all()]
         knowledge_flags_schema = [
@@ -169,21 +417,22 @@ async def generate_modlist(
         db.add(modlist)
         await db.flush()
 
-        entries_schema = []
-        for i, mod_data in enumerate(fallback_mods):
-            entry = ModlistEntry(
-                modlist_id=modlist.id,
-                mod_id=mod_data.get("mod_id"),
-                name=mod_data.get("name", "Unknown"),
-                author=mod_data.get("author"),
-                summary=mod_data.get("summary"),
-                reason=mod_data.get("reason"),
-                load_order=mod_data.get("load_order", i + 1),
-                enabled=True,
-                download_status="pending",
+        entry_rows = [
+            _entry_row(modlist.id, mod_data, i) for i, mod_data in enumerate(fallback_mods)
+        ]
+        await _bulk_insert_children(db, entry_rows, [])
+        entries_schema = [
+            ModEntry(
+                mod_id=row["mod_id"],
+                name=row["name"],
+                author=row["author"],
+                summary=row["summary"],
+                reason=row["reason"],
+                load_order=row["load_order"],
             )
-            db.add(entry)
-            entries_schema.append(_entry_to_schema(entry))
+            for row in entry_rows
+        ]
+        await increment_counter(db, MODLISTS_GENERATED)
 
         await db.commit()
         knowledge_flags_schema = []
@@ -236,46 +485,131 @@ async def _fallback_modlist(
     return mods
 
 
+def _encode_cursor(modlist: Modlist) -> str:
+    raw = f"{modlist.created_at.isoformat()}|{modlist.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        created_at, modlist_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), uuid.UUID(modlist_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _paginate_mine(
+    stmt: Select, user_id: uuid.UUID, limit: int | None, cursor: str | None,
+) -> Select:
+    """Restrict a Modlist query to one user's lists, newest first.
+
+    Uses keyset pagination on (created_at, id) so deep pages cost the same
+    as the first one. Fetches one extra row to detect a following page.
+    """
+    stmt = stmt.where(Modlist.user_id == user_id).order_by(
+        Modlist.created_at.desc(), Modlist.id.desc(),
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(Modlist.created_at, Modlist.id) < _decode_cursor(cursor))
+    if limit:
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+
+def _set_next_cursor(response: Response, rows: list, limit: int | None, modlist_of) -> list:
+    """Trim the look-ahead row and expose the next page cursor as a header."""
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = _encode_cursor(modlist_of(rows[-1]))
+    return rows
+
+
 @router.get("/mine", response_model=list[ModlistResponse])
 async def get_my_modlists(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get all modlists for the current user."""
-    result = await db.execute(
-        select(Modlist)
-        .where(Modlist.user_id == current_user.id)
-        .order_by(Modlist.created_at.desc())
-    )
-    modlists = result.scalars().all()
+    """Get the current user's modlists, newest first.
 
-    responses = []
-    for ml in modlists:
-        entry_result = await db.execute(
-            select(ModlistEntry)
-            .where(ModlistEntry.modlist_id == ml.id)
-            .order_by(ModlistEntry.load_order)
-        )
-        entries = [_entry_to_schema(e) for e in entry_result.scalars().all()]
+    Entries and flags are eager-loaded in two batched queries rather than
+    two queries per modlist. Pass `limit` to page; the next page's cursor is
+    returned in the X-Next-Cursor header.
 
-        flag_result = await db.execute(
-            select(ModlistKnowledgeFlag)
-            .where(ModlistKnowledgeFlag.modlist_id == ml.id)
-        )
-        flags = [_flag_to_schema(f) for f in flag_result.scalars().all()]
-
-        responses.append(
-            ModlistResponse(
-                id=ml.id,
-                game_id=ml.game_id,
-                playstyle_id=ml.playstyle_id,
-                entries=entries,
-                llm_provider=ml.llm_provider,
-                user_knowledge_flags=flags,
-            )
+    With `Accept: application/x-ndjson` the result is streamed line by line
+    from a server-side cursor instead (see _stream_my_modlists).
+    """
+    if _wants_ndjson(request):
+        page = _paginate_mine(select(Modlist.id), current_user.id, None, cursor)
+        if limit:
+            page = page.limit(limit)
+        return StreamingResponse(_stream_my_modlists(page), media_type=_NDJSON)
+
+    stmt = _paginate_mine(
+        select(Modlist).options(
+            selectinload(Modlist.entries),
+            selectinload(Modlist.knowledge_flags),
+        ),
+        current_user.id, limit, cursor,
+    )
+    result = await db.execute(stmt)
+    modlists = _set_next_cursor(response, list(result.scalars().all()), limit, lambda ml: ml)
+
+    return [
+        ModlistResponse(
+            id=ml.id,
+            game_id=ml.game_id,
+            playstyle_id=ml.playstyle_id,
+            entries=[_entry_to_schema(e) for e in ml.entries],
+            llm_provider=ml.llm_provider,
+            user_knowledge_flags=[_flag_to_schema(f) for f in ml.knowledge_flags],
         )
+        for ml in modlists
+    ]
 
-    return responses
+
+@router.get("/mine/summary", response_model=list[ModlistSummary])
+async def get_my_modlist_summaries(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=200),
+    cursor: str | None = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Like /mine, but returns entry and flag counts instead of full entries."""
+    entry_count = (
+        select(func.count(ModlistEntry.id))
+        .where(ModlistEntry.modlist_id == Modlist.id)
+        .correlate(Modlist)
+        .scalar_subquery()
+    )
+    flag_count = (
+        select(func.count(ModlistKnowledgeFlag.id))
+        .where(ModlistKnowledgeFlag.modlist_id == Modlist.id)
+        .correlate(Modlist)
+        .scalar_subquery()
+    )
+    stmt = _paginate_mine(
+        select(Modlist, entry_count, flag_count), current_user.id, limit, cursor,
+    )
+    result = await db.execute(stmt)
+    rows = _set_next_cursor(response, list(result.all()), limit, lambda row: row[0])
+
+    return [
+        ModlistSummary(
+            id=ml.id,
+            game_id=ml.game_id,
+            playstyle_id=ml.playstyle_id,
+            llm_provider=ml.llm_provider,
+            created_at=ml.created_at,
+            entry_count=entries,
+            flag_count=flags,
+        )
+        for ml, entries, flags in rows
+    ]
 
 
 @router.delete("/{modlist_id}", status_code=204)
@@ -305,100 +639,70 @@ async def delete_modlist(
     )
     await db.delete(modlist)
     await db.commit()
+    GenerationResultCache.get_instance().invalidate_modlist(str(ml_uuid))
 
 
 @router.get("/{modlist_id}/export", response_model=ModlistExportResponse)
 async def export_modlist(
     modlist_id: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     nexus_api_key: str | None = Query(None),
     db: AsyncSession = Depends(get_db),
 ):
     """Export modlist for MO2 plugin with optional file_id resolution.
 
-    If nexus_api_key is provided, resolves the primary file_id for each
-    mod via the Nexus Mods API. Otherwise, entries are returned without
-    file_ids — the plugin can resolve them locally.
+    The payload is materialized on first request and then served from the
+    modlist row with an ETag, so repeat requests with If-None-Match get a
+    304. If nexus_api_key is provided, missing primary file_ids are resolved
+    via the Nexus Mods API and persisted; stale exports, including IDs Nexus
+    couldn't return, are re-checked in the background. Without a key,
+    entries that were never resolved have no file_id — the plugin can
+    resolve them locally. Archived modlists are exported from the archive
+    as they were when archived.
     """
     try:
         ml_uuid = uuid.UUID(modlist_id)
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid modlist ID")
 
-    modlist = await db.get(Modlist, ml_uuid)
+    modlist = await load_modlist_for_export(db, ml_uuid)
     if not modlist:
-        raise HTTPException(status_code=404, detail="Modlist not found")
+        archived = await load_archived(db, ml_uuid)
+        if not archived:
+            raise HTTPException(status_code=404, detail="Modlist not found")
+        try:
+            payload, etag = await archived_export(db, archived)
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        return conditional_json_response(request, payload, etag, "public, no-cache")
 
-    game = await db.get(Game, modlist.game_id)
-    if not game:
-        raise HTTPException(status_code=404, detail="Game not found")
+    try:
+        payload, etag = await get_export(db, modlist, nexus_api_key)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-    entry_result = await db.execute(
-        select(ModlistEntry)
-        .where(ModlistEntry.modlist_id == ml_uuid)
-        .order_by(ModlistEntry.load_order)
-    )
-    db_entries = entry_result.scalars().all()
-
-    # Optionally resolve file_ids via Nexus API
-    file_id_map: dict[int, int | None] = {}
-    if nexus_api_key:
-        client = NexusModsClient(nexus_api_key)
-
-        async def resolve_file_id(nexus_mod_id: int) -> tuple[int, int | None]:
-            try:
-                files = await client.get_mod_files(game.nexus_domain, nexus_mod_id)
-                if files:
-                    primary = next((f for f in files if f.get("isPrimary")), files[0])
-                    return nexus_mod_id, primary.get("fileId")
-            except Exception:
-                logger.warning(f"Failed to resolve file_id for mod {nexus_mod_id}")
-            return nexus_mod_id, None
-
-        nexus_ids = [e.nexus_mod_id for e in db_entries if e.nexus_mod_id]
-        results = await asyncio.gather(
-            *(resolve_file_id(mid) for mid in nexus_ids)
-        )
-        file_id_map = dict(results)
-
-    entries = [
-        ExportModEntry(
-            nexus_mod_id=e.nexus_mod_id,
-            file_id=file_id_map.get(e.nexus_mod_id) if e.nexus_mod_id else None,
-            name=e.name or "Unknown",
-            author=e.author,
-            load_order=e.load_order,
-            is_patch=e.is_patch,
-            patches_mods=e.patches_mods,
-        )
-        for e in db_entries
-    ]
+    if nexus_api_key and export_is_stale(modlist):
+        background_tasks.add_task(refresh_export, modlist.id, nexus_api_key)
 
-    return ModlistExportResponse(
-        id=modlist.id,
-        game_domain=game.nexus_domain,
-        game_name=game.name,
-        mod_count=len(entries),
-        entries=entries,
-    )
+    return conditional_json_response(request, payload, etag, "public, no-cache")
 
 
-@router.get("/{modlist_id}", response_model=ModlistResponse)
-async def get_modlist(modlist_id: str, db: AsyncSession = Depends(get_db)):
-    """Get a previously generated modlist by ID."""
-    try:
-        ml_uuid = uuid.UUID(modlist_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid modlist ID")
+async def _exists_on_primary(ml_uuid: uuid.UUID) -> bool:
+    async with async_session() as primary:
+        return await primary.get(Modlist, ml_uuid) is not None
+
 
+async def _load_modlist_response(db: AsyncSession, ml_uuid: uuid.UUID) -> ModlistResponse | None:
     modlist = await db.get(Modlist, ml_uuid)
     if not modlist:
-        raise HTTPException(status_code=404, detail="Modlist not found")
+        return None
 
     # Load entries — use denormalized fields directly
     entry_result = await db.execute(
         select(ModlistEntry)
         .where(ModlistEntry.modlist_id == ml_uuid)
-        .order_by(ModlistEntry.load_order)
+        .order_by(ModlistEntry.load_order, ModlistEntry.id)
     )
     entries = [_entry_to_schema(e) for e in entry_result.scalars().all()]
 
@@ -418,3 +722,44 @@ async def get_modlist(modlist_id: str, db: AsyncSession = Depends(get_db)):
         user_knowledge_flags=flags,
         used_fallback=modlist.llm_provider == "fallback",
     )
+
+
+@router.get("/{modlist_id}", response_model=ModlistResponse)
+async def get_modlist(
+    modlist_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get a previously generated modlist by ID.
+
+    Send `Accept: application/x-ndjson` to stream it line by line. Modlists
+    moved to the archive are served from there.
+    """
+    try:
+        ml_uuid = uuid.UUID(modlist_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid modlist ID")
+
+    if _wants_ndjson(request):
+        # Check existence up front so a missing list is still a 404
+        if await db.get(Modlist, ml_uuid):
+            sessionmaker = async_read_session
+        elif has_read_replica() and await _exists_on_primary(ml_uuid):
+            sessionmaker = async_session
+        elif archived := await load_archived(db, ml_uuid):
+            return StreamingResponse(_stream_archived(archived), media_type=_NDJSON)
+        else:
+            raise HTTPException(status_code=404, detail="Modlist not found")
+        return StreamingResponse(_stream_modlist(sessionmaker, ml_uuid), media_type=_NDJSON)
+
+    response = await _load_modlist_response(db, ml_uuid)
+    if response is None and has_read_replica():
+        # The replica may not have caught up with a generation that just
+        # finished — retry on the primary before reporting 404
+        async with async_session() as primary:
+            response = await _load_modlist_response(primary, ml_uuid)
+    if response is None:
+        response = await load_archived(db, ml_uuid)
+    if response is None:
+        raise HTTPException(status_code=404, detail="Modlist not found")
+    return response
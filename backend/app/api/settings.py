@@ -1,6 +1,7 @@
 import logging
+from functools import lru_cache
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,6 +11,7 @@ from app.llm.registry import get_public_registry
 from app.models.user import User
 from app.models.user_settings import UserSettings
 from app.api.deps import get_current_user
+from app.api.http_cache import compute_etag, conditional_json_response
 from app.services.nexus_client import NexusModsClient
 
 logger = logging.getLogger(__name__)
@@ -57,10 +59,18 @@ async def _get_or_create_settings(
 
 # ── Provider Registry (public, no auth) ──────────────────────
 
+@lru_cache
+def _public_registry_with_etag() -> tuple[list[dict], str]:
+    # The registry is static for the life of the process
+    registry = get_public_registry()
+    return registry, compute_etag(registry)
+
+
 @router.get("/llm-providers")
-async def list_llm_providers():
+async def list_llm_providers(request: Request):
     """Return the list of supported LLM providers for frontend rendering."""
-    return get_public_registry()
+    registry, etag = _public_registry_with_etag()
+    return conditional_json_response(request, registry, etag, "public, max-age=3600")
 
 
 # ── LLM API Keys (auth required) ─────────────────────────────
@@ -139,8 +149,8 @@ async def validate_nexus_key(
         return {"valid": False, "error": "No Nexus API key saved. Add one in Settings."}
 
     try:
-        client = NexusModsClient(api_key=nexus_key)
-        user_info = await client.validate_key()
+        async with NexusModsClient(api_key=nexus_key) as client:
+            user_info = await client.validate_key()
         return {
             "valid": True,
             "username": user_info.get("name"),
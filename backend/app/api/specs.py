@@ -1,18 +1,42 @@
-from fastapi import APIRouter
+import asyncio
+from collections import Counter
 
-from app.schemas.specs import SpecsInput, SpecsParseResponse, TierScores
-from app.services.spec_parser import parse_specs
-from app.services.tier_classifier import classify_hardware_tier
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.deps import get_current_user
+from app.config import get_settings
+from app.models.user import User
+from app.schemas.specs import (
+    HardwareSpecs,
+    SpecsBatchInput,
+    SpecsBatchItem,
+    SpecsBatchResponse,
+    SpecsInput,
+    SpecsParseResponse,
+    SpecsRefineResponse,
+    TierScores,
+)
+from app.services.spec_cache import SpecParseCache
+from app.services.spec_parser import parse_specs, parse_specs_batch, parse_specs_deferred
+from app.services.tier_classifier import classify_hardware_tier, classify_hardware_tiers
 
 router = APIRouter()
 
 
-@router.post("/parse", response_model=SpecsParseResponse)
-async def parse_hardware_specs(input: SpecsInput):
-    specs, method = await parse_specs(input.raw_text)
+def _tier_scores(tier_info: dict) -> TierScores:
+    return TierScores(
+        vram=tier_info["vram_score"],
+        cpu=tier_info["cpu_score"],
+        ram=tier_info["ram_score"],
+        gpu_gen=tier_info["gpu_gen_score"],
+        overall=tier_info["overall_score"],
+    )
+
 
+def _classify(specs: HardwareSpecs) -> dict:
     # Classify hardware tier using multi-factor scoring
-    tier_info = classify_hardware_tier(
+    return classify_hardware_tier(
         gpu=specs.gpu,
         vram_mb=specs.vram_mb,
         cpu=specs.cpu,
@@ -21,16 +45,95 @@ async def parse_hardware_specs(input: SpecsInput):
         cpu_speed_ghz=specs.cpu_speed_ghz,
     )
 
+
+@router.post("/parse", response_model=SpecsParseResponse)
+async def parse_hardware_specs(input: SpecsInput):
+    refine_id = None
+    if input.defer_llm:
+        specs, method, refine_id = await parse_specs_deferred(input.raw_text)
+    else:
+        specs, method = await parse_specs(input.raw_text)
+
+    tier_info = _classify(specs)
     return SpecsParseResponse(
         specs=specs,
         raw_text=input.raw_text,
         parse_method=method,
         tier=tier_info["tier"],
-        tier_scores=TierScores(
-            vram=tier_info["vram_score"],
-            cpu=tier_info["cpu_score"],
-            ram=tier_info["ram_score"],
-            gpu_gen=tier_info["gpu_gen_score"],
-            overall=tier_info["overall_score"],
-        ),
+        tier_scores=_tier_scores(tier_info),
+        refine_id=refine_id,
+    )
+
+
+@router.get("/refine/{refine_id}", response_model=SpecsRefineResponse)
+async def get_spec_refinement(
+    refine_id: str,
+    response: Response,
+    wait: float = Query(10.0, ge=0),
+):
+    """Result of a deferred LLM parse (see `defer_llm`).
+
+    Waits up to `wait` seconds for a pending refinement, then answers 202
+    with status "pending" so the client can ask again.
+    """
+    cache = SpecParseCache.get_instance()
+    task = cache.pending(refine_id)
+    if task is not None:
+        timeout = min(wait, get_settings().spec_refine_max_wait_seconds)
+        try:
+            specs = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            response.status_code = 202
+            return SpecsRefineResponse(status="pending")
+    else:
+        specs = await cache.lookup(refine_id)
+        if specs is None:
+            raise HTTPException(status_code=404, detail="Unknown or failed refinement")
+
+    if specs is None or not (specs.gpu or specs.cpu):
+        return SpecsRefineResponse(status="failed")
+    tier_info = _classify(specs)
+    return SpecsRefineResponse(
+        status="done",
+        specs=specs,
+        tier=tier_info["tier"],
+        tier_scores=_tier_scores(tier_info),
+    )
+
+
+def _parse_and_classify(raw_texts: list[str]) -> list[SpecsBatchItem]:
+    parsed = parse_specs_batch(raw_texts)
+    tiers = classify_hardware_tiers(specs for specs, _ in parsed)
+    return [
+        SpecsBatchItem(
+            specs=specs,
+            parse_method=method,
+            tier=tier_info["tier"],
+            tier_scores=_tier_scores(tier_info),
+        )
+        for (specs, method), tier_info in zip(parsed, tiers)
+    ]
+
+
+@router.post("/parse-batch", response_model=SpecsBatchResponse)
+async def parse_hardware_specs_batch(
+    input: SpecsBatchInput,
+    current_user: User = Depends(get_current_user),
+):
+    """Parse and classify many spec blobs in one request (regex only).
+
+    Results are in input order. Parsing runs in a worker thread so a large
+    batch doesn't stall the event loop.
+    """
+    max_items = get_settings().specs_batch_max_items
+    if len(input.raw_texts) > max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {max_items} spec records per batch",
+        )
+
+    results = await run_in_threadpool(_parse_and_classify, input.raw_texts)
+    return SpecsBatchResponse(
+        results=results,
+        tier_counts=dict(Counter(item.tier for item in results)),
     )
@@ -1,13 +1,14 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models.modlist import Modlist
+from app.api.http_cache import compute_etag, conditional_json_response
+from app.database import get_read_db
 from app.models.game import Game
 from app.schemas.stats import StatsResponse
+from app.services.reference_cache import MODLISTS_GENERATED, ReferenceDataCache, get_counter
 
 logger = logging.getLogger(__name__)
 
@@ -15,21 +16,29 @@ router = APIRouter()
 
 
 @router.get("/", response_model=StatsResponse)
-async def get_stats(db: AsyncSession = Depends(get_db)):
-    """Public stats for the landing page."""
-    try:
-        modlist_result = await db.execute(select(func.count()).select_from(Modlist))
-        modlists_generated = modlist_result.scalar_one()
+async def get_stats(request: Request, db: AsyncSession = Depends(get_read_db)):
+    """Public stats for the landing page.
 
-        games_result = await db.execute(select(func.count()).select_from(Game))
-        games_supported = games_result.scalar_one()
+    modlists_generated comes from a counter maintained on save rather than
+    COUNT(*) over modlists; the game count is cached reference data.
+    """
+    async def count_games():
+        result = await db.execute(select(func.count()).select_from(Game))
+        return result.scalar_one()
 
-        return StatsResponse(
-            modlists_generated=modlists_generated,
-            games_supported=games_supported,
+    try:
+        modlists_generated = await get_counter(db, MODLISTS_GENERATED)
+        games_supported, _ = await ReferenceDataCache.get_instance().get(
+            db, "games_supported", count_games,
         )
     except Exception as e:
         logger.exception("Failed to query stats")
         raise HTTPException(
             status_code=503, detail=f"Database unavailable: {type(e).__name__}"
         )
+
+    payload = StatsResponse(
+        modlists_generated=modlists_generated,
+        games_supported=games_supported,
+    ).model_dump()
+    return conditional_json_response(request, payload, compute_etag(payload), "public, max-age=60")
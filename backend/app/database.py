@@ -1,13 +1,59 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
-from app.config import get_settings
+from app.config import Settings, get_settings
+from app.serialization import dumps, loads
 
 settings = get_settings()
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+
+def _engine_kwargs(url: str, settings: Settings) -> dict:
+    """Pool and driver options for create_async_engine.
+
+    SQLite (tests, local dev) keeps SQLAlchemy's defaults; pool sizing and
+    asyncpg options only apply to Postgres.
+    """
+    kwargs: dict = {"echo": settings.debug}
+    if url.startswith("sqlite"):
+        return kwargs
+
+    kwargs.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+    )
+    if url.startswith("postgresql+asyncpg"):
+        kwargs["connect_args"] = {
+            "command_timeout": settings.database_command_timeout,
+            # asyncpg's own cache and SQLAlchemy's adapter cache; both must
+            # be 0 when connecting through pgbouncer in transaction mode
+            "statement_cache_size": settings.database_statement_cache_size,
+            "prepared_statement_cache_size": settings.database_statement_cache_size,
+        }
+    return kwargs
+
+
+# JSON columns (export payloads, patches_mods) are encoded with orjson
+_json_codec = {"json_serializer": dumps, "json_deserializer": loads}
+
+engine = create_async_engine(
+    settings.database_url, **_engine_kwargs(settings.database_url, settings), **_json_codec,
+)
+
+# Read-only routes use the replica when one is configured, else the primary
+read_engine: AsyncEngine = (
+    create_async_engine(
+        settings.database_read_url,
+        **_engine_kwargs(settings.database_read_url, settings), **_json_codec,
+    )
+    if settings.database_read_url
+    else engine
+)
 
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 class Base(DeclarativeBase):
@@ -20,3 +66,41 @@ async def get_db() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """Session for read-only routes, routed to the replica if configured.
+
+    Replicas lag the primary slightly; routes that must see a write the
+    same client just made should use get_db instead.
+    """
+    async with async_read_session() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def has_read_replica() -> bool:
+    return read_engine is not engine
+
+
+def pool_status() -> dict:
+    """Connection pool counters for the primary (and replica) engine."""
+    engines = {"primary": engine}
+    if has_read_replica():
+        engines["replica"] = read_engine
+
+    status = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        if hasattr(pool, "checkedout"):
+            status[name] = {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        else:
+            status[name] = {"pool": type(pool).__name__}
+    return status
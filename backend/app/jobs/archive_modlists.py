@@ -0,0 +1,36 @@
+"""Archive old anonymous modlists (see services/modlist_archive.py).
+
+Runs in batches of `modlist_archive_batch_size`, one transaction each, until
+nothing older than the cutoff is left. Safe to schedule daily.
+
+Usage (from backend/):
+    python -m app.jobs.archive_modlists [--days 90] [--batch-size 200]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from app.database import async_session
+from app.services.modlist_archive import archive_modlists
+
+logger = logging.getLogger(__name__)
+
+
+async def main(days: int | None = None, batch_size: int | None = None) -> int:
+    total = 0
+    async with async_session() as db:
+        while archived := await archive_modlists(db, days, batch_size):
+            total += archived
+            logger.info(f"Archived {total} modlists so far")
+    logger.info(f"Archival complete: {total} modlists archived")
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(main(args.days, args.batch_size))
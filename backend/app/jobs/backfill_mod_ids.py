@@ -0,0 +1,106 @@
+"""Link existing modlist entries to the `mods` table.
+
+Entries saved before mod upserting have a nexus_mod_id but no mod_id. For
+each game this upserts the distinct Nexus mods (metadata from the most
+recent entry) and sets mod_id on matching entries, one batch of Nexus IDs
+per transaction so the job can be interrupted and rerun safely.
+
+Usage (from backend/):
+    python -m app.jobs.backfill_mod_ids [--batch-size 500]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.game import Game
+from app.models.mod import Mod
+from app.models.modlist import Modlist, ModlistEntry
+from app.services.mod_catalog import upsert_nexus_mods
+
+logger = logging.getLogger(__name__)
+
+
+def _unlinked(game_id: int):
+    return (
+        ModlistEntry.mod_id.is_(None),
+        ModlistEntry.nexus_mod_id.is_not(None),
+        ModlistEntry.modlist_id.in_(select(Modlist.id).where(Modlist.game_id == game_id)),
+    )
+
+
+async def _backfill_batch(db: AsyncSession, game: Game, nexus_ids: list[int]) -> int:
+    """Upsert one batch of Nexus mods and link their entries. Returns rows linked."""
+    latest = await db.execute(
+        select(ModlistEntry.nexus_mod_id, ModlistEntry.name, ModlistEntry.author, ModlistEntry.summary)
+        .where(*_unlinked(game.id), ModlistEntry.nexus_mod_id.in_(nexus_ids))
+        .order_by(ModlistEntry.id.desc())
+    )
+    mods: dict[int, dict] = {}
+    for nexus_id, name, author, summary in latest.all():
+        mods.setdefault(nexus_id, {
+            "nexus_mod_id": nexus_id, "name": name, "author": author, "summary": summary,
+        })
+    await upsert_nexus_mods(db, game.nexus_domain, list(mods.values()))
+
+    result = await db.execute(
+        update(ModlistEntry)
+        .where(*_unlinked(game.id), ModlistEntry.nexus_mod_id.in_(nexus_ids))
+        .values(mod_id=(
+            select(Mod.id)
+            .where(
+                Mod.nexus_game_domain == game.nexus_domain,
+                Mod.nexus_mod_id == ModlistEntry.nexus_mod_id,
+            )
+            .scalar_subquery()
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def backfill_game(db: AsyncSession, game: Game, batch_size: int = 500) -> int:
+    """Backfill every unlinked entry of one game. Returns rows linked."""
+    linked = 0
+    while True:
+        batch = await db.execute(
+            select(ModlistEntry.nexus_mod_id)
+            .where(*_unlinked(game.id))
+            .distinct()
+            .order_by(ModlistEntry.nexus_mod_id)
+            .limit(batch_size)
+        )
+        nexus_ids = list(batch.scalars().all())
+        if not nexus_ids:
+            return linked
+        batch_linked = await _backfill_batch(db, game, nexus_ids)
+        if not batch_linked:
+            # Nothing matched (shouldn't happen after the upsert); avoid looping
+            logger.warning(f"{game.slug}: could not link Nexus IDs {nexus_ids[:5]}...")
+            return linked
+        linked += batch_linked
+
+
+async def main(batch_size: int = 500) -> int:
+    total = 0
+    async with async_session() as db:
+        games = (await db.execute(select(Game))).scalars().all()
+        for game in games:
+            linked = await backfill_game(db, game, batch_size)
+            logger.info(f"{game.slug}: linked {linked} entries")
+            total += linked
+    logger.info(f"Backfill complete: linked {total} entries")
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,79 @@
+"""Recompute every user's stored hardware tier.
+
+Run after changing the scoring in tier_classifier. Users are read in
+primary-key order, one batch per transaction, classified with
+classify_hardware_tiers, and only rows whose tier changed are written back
+with a single bulk UPDATE. Users without any hardware specs are skipped.
+
+Usage (from backend/):
+    python -m app.jobs.retier_users [--batch-size 1000] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+from collections import Counter
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import async_session
+from app.models.user import User
+from app.services.tier_classifier import classify_hardware_tiers
+
+logger = logging.getLogger(__name__)
+
+_SPEC_COLUMNS = (
+    User.gpu_model, User.vram_mb, User.cpu_model,
+    User.ram_gb, User.cpu_cores, User.cpu_speed_ghz,
+)
+
+
+async def retier_users(
+    db: AsyncSession, batch_size: int = 1000, dry_run: bool = False,
+) -> Counter:
+    """Re-tier all users with specs. Returns counts of "old -> new" changes."""
+    changes: Counter = Counter()
+    last_id = None
+    while True:
+        query = (
+            select(User.id, User.hardware_tier, *_SPEC_COLUMNS)
+            .where(or_(*(column.is_not(None) for column in _SPEC_COLUMNS)))
+            .order_by(User.id)
+            .limit(batch_size)
+        )
+        if last_id is not None:
+            query = query.where(User.id > last_id)
+        rows = (await db.execute(query)).mappings().all()
+        if not rows:
+            return changes
+        last_id = rows[-1]["id"]
+
+        updates = []
+        for row, tier_info in zip(rows, classify_hardware_tiers(rows)):
+            if tier_info["tier"] != row["hardware_tier"]:
+                changes[f"{row['hardware_tier']} -> {tier_info['tier']}"] += 1
+                updates.append({"id": row["id"], "hardware_tier": tier_info["tier"]})
+
+        if updates and not dry_run:
+            await db.execute(update(User), updates)
+            await db.commit()
+
+
+async def main(batch_size: int = 1000, dry_run: bool = False) -> int:
+    async with async_session() as db:
+        changes = await retier_users(db, batch_size, dry_run)
+    for transition, count in sorted(changes.items()):
+        logger.info(f"{transition}: {count}")
+    total = sum(changes.values())
+    logger.info(f"Re-tier complete: {total} users {'would change' if dry_run else 'changed'}")
+    return total
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.dry_run))
@@ -3,6 +3,12 @@
 Provides phase-targeted methodology context for the modlist generation pipeline.
 Each game has its own markdown file (skyrim.md, fallout4.md) containing structured
 sections that are injected into LLM prompts during the relevant build phases.
+Contexts are precomputed per (game, phase) and capped by a token budget.
+Files are discovered by their `game:` metadata and hot-reloaded when edited;
+knowledge_version() changes whenever any of them does.
+Shared documents (modding_common.md, the root methodology reference) are
+served through a BM25 index instead: related_methodology() for phase prompts
+and lookup_methodology() for the LLM tool of the same name.
 
 Usage:
     from app.knowledge import get_methodology_context
@@ -10,6 +16,27 @@ Usage:
     context = get_methodology_context("skyrimse", phase_number=1)
 """
 
-from app.knowledge.resolver import get_methodology_context
+from app.knowledge.files import KnowledgeFiles, knowledge_version
+from app.knowledge.resolver import (
+    LoadOrderCategory,
+    get_methodology_context,
+    load_order_categories,
+    methodology_context_stats,
+    methodology_source,
+    precompute_methodology_contexts,
+)
+from app.knowledge.retrieval import KnowledgeIndex, lookup_methodology, related_methodology
 
-__all__ = ["get_methodology_context"]
+__all__ = [
+    "KnowledgeFiles",
+    "KnowledgeIndex",
+    "LoadOrderCategory",
+    "get_methodology_context",
+    "knowledge_version",
+    "load_order_categories",
+    "lookup_methodology",
+    "methodology_context_stats",
+    "methodology_source",
+    "precompute_methodology_contexts",
+    "related_methodology",
+]
@@ -0,0 +1,175 @@
+"""Discovery and change tracking of knowledge markdown files.
+
+Every `*.md` in app/knowledge (plus the optional methodology reference at
+the repository root) is tracked. A file whose `<system_context>` block has
+a `game: <slug>` entry is that game's methodology; files without one are
+shared documents. Adding a game only takes dropping in a new file.
+
+refresh() stats the files at most every `knowledge_reload_interval_seconds`
+and re-reads only those whose mtime changed; a file counts as changed only
+if its content hash differs. `version` is a digest of every file's hash, so
+anything keyed on it (phase contexts, the retrieval index, the generation
+result cache) is invalidated exactly when the knowledge changes — without a
+worker restart.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+KNOWLEDGE_DIR = Path(__file__).parent
+# (directory, glob) pairs to track; the root reference document is absent
+# in deployments that only ship backend/
+_SOURCES = [
+    (KNOWLEDGE_DIR, "*.md"),
+    (KNOWLEDGE_DIR.parents[2], "compass_artifact*.md"),
+]
+
+_SYSTEM_CONTEXT_RE = re.compile(r"<system_context>(.*?)</system_context>", re.DOTALL)
+
+
+def parse_system_context(text: str) -> tuple[dict[str, str], str]:
+    """Split a document into its `<system_context>` metadata and the rest."""
+    match = _SYSTEM_CONTEXT_RE.search(text)
+    if not match:
+        return {}, text
+    metadata = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip():
+            metadata[key.strip()] = value.strip()
+    return metadata, text[:match.start()] + text[match.end():]
+
+
+@dataclass
+class KnowledgeFile:
+    path: Path
+    mtime: float
+    digest: str
+    text: str
+    metadata: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def game(self) -> str | None:
+        return self.metadata.get("game") or None
+
+
+def _read(path: Path) -> KnowledgeFile:
+    raw = path.read_bytes()
+    text = raw.decode("utf-8")
+    return KnowledgeFile(
+        path=path,
+        mtime=path.stat().st_mtime,
+        digest=hashlib.sha256(raw).hexdigest(),
+        text=text,
+        metadata=parse_system_context(text)[0],
+    )
+
+
+class KnowledgeFiles:
+    """Singleton registry of knowledge files, reloaded when they change."""
+
+    _instance: "KnowledgeFiles | None" = None
+
+    def __init__(self, sources: list[tuple[Path, str]], check_interval: float):
+        self.sources = sources
+        self.check_interval = check_interval
+        self._files: dict[Path, KnowledgeFile] = {}
+        self._checked_at: float | None = None
+        self.version = ""
+        self.reloads = 0
+
+    @classmethod
+    def get_instance(cls) -> "KnowledgeFiles":
+        if cls._instance is None:
+            cls._instance = cls(
+                sources=_SOURCES,
+                check_interval=get_settings().knowledge_reload_interval_seconds,
+            )
+        return cls._instance
+
+    def _paths(self) -> list[Path]:
+        paths: list[Path] = []
+        for directory, pattern in self.sources:
+            paths.extend(sorted(directory.glob(pattern)))
+        return paths
+
+    def refresh(self, force: bool = False) -> bool:
+        """Pick up added, edited and removed files. Returns True on change."""
+        now = time.monotonic()
+        if (
+            not force
+            and self._checked_at is not None
+            and now - self._checked_at < self.check_interval
+        ):
+            return False
+        self._checked_at = now
+
+        changed = False
+        seen = set()
+        for path in self._paths():
+            seen.add(path)
+            current = self._files.get(path)
+            try:
+                if current and path.stat().st_mtime == current.mtime:
+                    continue
+                loaded = _read(path)
+            except (OSError, UnicodeDecodeError):
+                logger.warning("Could not read knowledge file %s", path)
+                continue
+            if current and loaded.digest == current.digest:
+                current.mtime = loaded.mtime  # touched, not edited
+                continue
+            self._files[path] = loaded
+            changed = True
+            if current:
+                logger.info("Knowledge file changed: %s", path.name)
+
+        for path in set(self._files) - seen:
+            del self._files[path]
+            changed = True
+
+        if changed:
+            self.version = hashlib.sha256(
+                "".join(f"{f.name}:{f.digest}" for f in self._sorted()).encode()
+            ).hexdigest()[:16]
+            self.reloads += 1
+        return changed
+
+    def _sorted(self) -> list[KnowledgeFile]:
+        return sorted(self._files.values(), key=lambda f: (f.path.parent != KNOWLEDGE_DIR, f.name))
+
+    def files(self) -> list[KnowledgeFile]:
+        """Current files, bundled ones first."""
+        self.refresh()
+        return self._sorted()
+
+    def game_files(self) -> dict[str, KnowledgeFile]:
+        """Game slug → methodology file."""
+        return {f.game: f for f in self.files() if f.game}
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "files": len(self._files),
+            "games": sorted(f.game for f in self._files.values() if f.game),
+            "reloads": self.reloads,
+        }
+
+
+def knowledge_version() -> str:
+    """Digest of the current knowledge files."""
+    store = KnowledgeFiles.get_instance()
+    store.refresh()
+    return store.version
@@ -1,23 +1,51 @@
 """Resolves methodology knowledge relevant to a specific generation phase.
 
-Parses structured markdown files (skyrim.md, fallout4.md) at import time
-and provides phase-targeted methodology context for LLM prompts.
+Game knowledge files (skyrim.md, fallout4.md — any file whose
+<system_context> declares `game: <slug>`, see files.py) are markdown split into XML-like
+blocks (`<tag> ... </tag>`). A block is tied to a phase when it is headed
+"## Phase N"; blocks that cover several phases (e.g. the Nexus category
+mapping, with one "**Phase N (...):**" paragraph per phase) are split so
+each phase only receives its own paragraph. Everything else applies to all
+phases. A `<system_context>` block holds file metadata and is never sent to
+the LLM.
+
+The context string for every (game, phase) is built once — see
+precompute_methodology_contexts(), run at startup — and rebuilt only when
+the game's file changes on disk. It is trimmed to the
+`methodology_token_budget` setting by dropping the lowest-priority sections
+first. A block can set its priority with `<tag priority="N">`; higher N is
+trimmed first. Phase-specific sections default to 0, the rest to 1.
 """
 
 import logging
 import re
+import sys
 from dataclasses import dataclass, field
-from pathlib import Path
+
+from app.config import get_settings
+from app.knowledge.files import KnowledgeFiles, parse_system_context
 
 logger = logging.getLogger(__name__)
 
-_KNOWLEDGE_DIR = Path(__file__).parent
+_HEADER = (
+    "\nREFERENCE METHODOLOGY (community best practices — "
+    "use this knowledge when selecting and evaluating mods):\n"
+)
+
+_BLOCK_RE = re.compile(
+    r"^<(\w+)((?:\s+\w+=\"[^\"]*\")*)\s*>[ \t]*\n(.*?)^</\1>[ \t]*$",
+    re.MULTILINE | re.DOTALL,
+)
+_ATTR_RE = re.compile(r"(\w+)=\"([^\"]*)\"")
+# Start of a subsection: a markdown heading or a bold paragraph lead-in
+_MARKER_RE = re.compile(r"^(?:#{1,4}\s+|\*\*)(.*)$")
+_PHASE_RE = re.compile(r"^Phase\s+(\d+)\b", re.IGNORECASE)
+# "7. Meshes/textures — architecture and landscape (SMIM, Skyrim 2020, Skyland)"
+_CATEGORY_LINE_RE = re.compile(r"^(\d+)\.\s+(.+?)\s*$", re.MULTILINE)
+_EXAMPLES_RE = re.compile(r"\(([^)]*)\)")
 
-# Game slug → markdown filename
-_GAME_FILES: dict[str, str] = {
-    "skyrimse": "skyrim.md",
-    "fallout4": "fallout4.md",
-}
+PHASE_PRIORITY = 0
+UNIVERSAL_PRIORITY = 1
 
 
 @dataclass(frozen=True)
@@ -28,6 +56,15 @@ class MethodologySection:
     content: str
     phases: frozenset[int]
     is_universal: bool = False
+    priority: int = UNIVERSAL_PRIORITY
+
+
+@dataclass(frozen=True)
+class LoadOrderCategory:
+    """One line of a game's <load_order_categories> sequence."""
+    rank: int
+    name: str
+    examples: tuple[str, ...] = ()
 
 
 @dataclass
@@ -35,10 +72,28 @@ class GameMethodology:
     """All parsed methodology content for a single game."""
     universal_principles: str
     sections: list[MethodologySection] = field(default_factory=list)
+    metadata: dict[str, str] = field(default_factory=dict)
+    load_order_categories: tuple[LoadOrderCategory, ...] = ()
+
+
+@dataclass(frozen=True)
+class PhaseContext:
+    """The prepared methodology context for one (game, phase)."""
+    text: str
+    tokens: int
+    sections: tuple[str, ...]
+    trimmed: tuple[str, ...] = ()
+
 
+# Module-level caches, refreshed when a file's content hash changes:
+# game slug → (file digest, parsed methodology)
+_cache: dict[str, tuple[str, GameMethodology]] = {}
+_contexts: dict[tuple[str, int], PhaseContext] = {}
 
-# Module-level cache: parsed once per process
-_cache: dict[str, GameMethodology] = {}
+
+def estimate_tokens(text: str) -> int:
+    """Approximate LLM token count (~4 characters per token for English)."""
+    return (len(text) + 3) // 4
 
 
 def _parse_phases(phases_str: str) -> frozenset[int]:
@@ -48,134 +103,246 @@ def _parse_phases(phases_str: str) -> frozenset[int]:
     )
 
 
-def _parse_methodology_file(filepath: Path) -> GameMethodology:
-    """Parse a methodology markdown file into structured sections."""
-    text = filepath.read_text(encoding="utf-8")
+def _title_of(content: str, default: str) -> str:
+    match = re.match(r"#+\s+(.+)", content)
+    return match.group(1).strip() if match else default
+
+
+def _phase_of(marker_text: str) -> int | None:
+    match = _PHASE_RE.match(marker_text.strip("* "))
+    return int(match.group(1)) if match else None
+
 
-    # Split on section markers: <!-- section: id -->
-    section_pattern = re.compile(r"<!--\s*section:\s*(\w+)\s*-->")
-    parts = section_pattern.split(text)
+def _split_block(tag: str, body: str, priority: int | None) -> list[MethodologySection]:
+    """Turn one <tag> block into one or more sections.
 
-    # parts[0] = content before first section marker (universal principles)
-    # parts[1] = first section id, parts[2] = first section content, etc.
-    universal_principles = parts[0].strip()
+    A block with at most one "Phase N" marker is a single section. A block
+    with several is split at every subsection marker after its heading, so
+    each "Phase N" paragraph becomes its own section and the rest stays
+    universal.
+    """
+    lines = body.strip().splitlines()
+    markers = [(i, _MARKER_RE.match(line)) for i, line in enumerate(lines)]
+    markers = [(i, m.group(1)) for i, m in markers if m]
+    phase_markers = [p for _, text in markers if (p := _phase_of(text)) is not None]
+
+    if len(phase_markers) <= 1:
+        phases = frozenset(phase_markers)
+        content = "\n".join(lines).strip()
+        return [MethodologySection(
+            id=tag,
+            title=_title_of(content, tag),
+            content=content,
+            phases=phases,
+            is_universal=not phases,
+            priority=priority if priority is not None else (
+                PHASE_PRIORITY if phases else UNIVERSAL_PRIORITY
+            ),
+        )]
+
+    # Chunk boundaries: every marker except a heading on the first line
+    starts = [i for i, _ in markers if i > 0]
+    bounds = [0, *starts, len(lines)]
+    sections = []
+    title = None
+    for n, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        content = "\n".join(lines[start:end]).strip()
+        if not content:
+            continue
+        title = title or _title_of(content, tag)
+        phase = _phase_of(_MARKER_RE.match(lines[start]).group(1)) if start in starts else None
+        sections.append(MethodologySection(
+            id=f"{tag}#{n}",
+            title=title,
+            content=content,
+            phases=frozenset({phase}) if phase is not None else frozenset(),
+            is_universal=phase is None,
+            priority=priority if priority is not None else (
+                PHASE_PRIORITY if phase is not None else UNIVERSAL_PRIORITY
+            ),
+        ))
+    return sections
+
+
+def _parse_load_order_categories(body: str) -> tuple[LoadOrderCategory, ...]:
+    """The numbered category list of a <load_order_categories> block.
+
+    Example mod names in parentheses are kept separately; a "see ..."
+    cross-reference is not an example.
+    """
+    categories = []
+    for match in _CATEGORY_LINE_RE.finditer(body):
+        line = match.group(2).replace("*", "")
+        examples = []
+        for group in _EXAMPLES_RE.findall(line):
+            examples.extend(
+                name.strip() for name in re.split(r"[,/]", group)
+                if name.strip() and not name.strip().lower().startswith("see ")
+            )
+        categories.append(LoadOrderCategory(
+            rank=int(match.group(1)),
+            name=_EXAMPLES_RE.sub("", line).strip(" —-"),
+            examples=tuple(examples),
+        ))
+    return tuple(categories)
 
-    # Strip markdown metadata comments from universal principles
-    universal_principles = re.sub(
-        r"<!--.*?-->", "", universal_principles, flags=re.DOTALL
-    ).strip()
-    # Remove the top-level heading (e.g., "# Skyrim SE/AE Modding Methodology")
-    lines = universal_principles.split("\n")
-    if lines and lines[0].startswith("# "):
-        lines = lines[1:]
-    universal_principles = "\n".join(lines).strip()
 
+def _parse_methodology_text(text: str) -> GameMethodology:
+    """Parse methodology markdown into metadata and phase-tagged sections."""
+    metadata, text = parse_system_context(text)
     sections: list[MethodologySection] = []
-    for i in range(1, len(parts), 2):
-        section_id = parts[i]
-        if i + 1 >= len(parts):
-            break
-        section_content = parts[i + 1]
+    load_order_categories: tuple[LoadOrderCategory, ...] = ()
 
-        # Extract metadata comments from section content
-        phases_match = re.search(
-            r"<!--\s*phases:\s*([\d\s,]+)\s*-->", section_content
-        )
-        universal_match = re.search(
-            r"<!--\s*universal:\s*(true|false)\s*-->", section_content, re.IGNORECASE
-        )
+    for match in _BLOCK_RE.finditer(text):
+        tag, attrs, body = match.group(1), dict(_ATTR_RE.findall(match.group(2))), match.group(3)
 
-        phases = _parse_phases(phases_match.group(1)) if phases_match else frozenset()
-        is_universal = (
-            universal_match.group(1).lower() == "true" if universal_match else False
-        )
+        body = re.sub(r"<!--.*?-->", "", body, flags=re.DOTALL)
+        if tag == "load_order_categories":
+            load_order_categories = _parse_load_order_categories(body)
+        priority = int(attrs["priority"]) if attrs.get("priority", "").isdigit() else None
+        sections.extend(_split_block(tag, body, priority))
 
-        # Clean content: remove metadata comments and leading/trailing whitespace
-        clean_content = re.sub(
-            r"<!--.*?-->", "", section_content, flags=re.DOTALL
-        ).strip()
-
-        # Extract title from first heading
-        title = section_id
-        title_match = re.match(r"#\s+(.+)", clean_content)
-        if title_match:
-            title = title_match.group(1).strip()
-
-        sections.append(
-            MethodologySection(
-                id=section_id,
-                title=title,
-                content=clean_content,
-                phases=phases,
-                is_universal=is_universal,
-            )
-        )
+    # Text outside any block, minus the file's top-level "# Title" heading
+    outside = re.sub(r"<!--.*?-->", "", _BLOCK_RE.sub("", text), flags=re.DOTALL)
+    outside_lines = [
+        line for line in outside.strip().splitlines() if not line.startswith("# ")
+    ]
 
     return GameMethodology(
-        universal_principles=universal_principles,
+        universal_principles="\n".join(outside_lines).strip(),
         sections=sections,
+        metadata=metadata,
+        load_order_categories=load_order_categories,
     )
 
 
 def _get_game_methodology(game_slug: str) -> GameMethodology | None:
-    """Get parsed methodology for a game, using cache."""
-    if game_slug in _cache:
-        return _cache[game_slug]
-
-    filename = _GAME_FILES.get(game_slug)
-    if not filename:
+    """Get parsed methodology for a game, re-parsing if its file changed."""
+    file = KnowledgeFiles.get_instance().game_files().get(game_slug)
+    if not file:
         return None
 
-    filepath = _KNOWLEDGE_DIR / filename
-    if not filepath.exists():
-        logger.warning("Methodology file not found: %s", filepath)
-        return None
+    cached = _cache.get(game_slug)
+    if cached and cached[0] == file.digest:
+        return cached[1]
 
     try:
-        methodology = _parse_methodology_file(filepath)
-        _cache[game_slug] = methodology
-        logger.info(
-            "Loaded %s methodology: %d sections",
-            game_slug,
-            len(methodology.sections),
-        )
-        return methodology
+        methodology = _parse_methodology_text(file.text)
     except Exception:
-        logger.exception("Failed to parse methodology file: %s", filepath)
-        return None
+        logger.exception("Failed to parse methodology file: %s", file.path)
+        return cached[1] if cached else None
+
+    _cache[game_slug] = (file.digest, methodology)
+    for key in [k for k in _contexts if k[0] == game_slug]:
+        del _contexts[key]
+    logger.info(
+        "Loaded %s methodology from %s: %d sections",
+        game_slug,
+        file.name,
+        len(methodology.sections),
+    )
+    return methodology
 
 
-def get_methodology_context(game_slug: str, phase_number: int) -> str:
-    """Return methodology text relevant to a specific game and phase.
+def methodology_source(game_slug: str) -> str | None:
+    """Filename of a game's methodology document, if it has one."""
+    file = KnowledgeFiles.get_instance().game_files().get(game_slug)
+    return file.name if file else None
 
-    Args:
-        game_slug: "skyrimse" or "fallout4"
-        phase_number: The current phase number (1-based)
 
-    Returns:
-        A formatted string block to inject into the system prompt,
-        or empty string if no methodology exists for this game.
-    """
+def load_order_categories(game_slug: str) -> tuple[LoadOrderCategory, ...]:
+    """A game's load-order category sequence, first-loading first."""
     methodology = _get_game_methodology(game_slug)
-    if not methodology:
-        return ""
+    return methodology.load_order_categories if methodology else ()
+
+
+def _render(parts: list[str]) -> str:
+    return _HEADER + "\n\n".join(parts) if parts else ""
+
+
+def build_phase_context(
+    methodology: GameMethodology, phase_number: int, token_budget: int,
+) -> PhaseContext:
+    """Select a phase's sections and trim them to `token_budget` tokens.
 
-    # Collect relevant sections for this phase
+    Sections are dropped in order of descending priority, later sections
+    first, until the rendered context fits. A budget of 0 disables trimming.
+    """
     relevant = [
-        s
-        for s in methodology.sections
+        s for s in methodology.sections
         if s.is_universal or phase_number in s.phases
     ]
+    prefix = [methodology.universal_principles] if methodology.universal_principles else []
+
+    kept = list(relevant)
+    trimmed: list[str] = []
+    drop_order = sorted(
+        range(len(relevant)), key=lambda i: (relevant[i].priority, i), reverse=True,
+    )
+    text = _render(prefix + [s.content for s in kept])
+    for index in drop_order:
+        if not token_budget or estimate_tokens(text) <= token_budget:
+            break
+        section = relevant[index]
+        kept.remove(section)
+        trimmed.append(section.id)
+        text = _render(prefix + [s.content for s in kept])
+
+    return PhaseContext(
+        text=sys.intern(text),
+        tokens=estimate_tokens(text),
+        sections=tuple(s.id for s in kept),
+        trimmed=tuple(trimmed),
+    )
+
+
+def _phase_context(game_slug: str, phase_number: int) -> PhaseContext | None:
+    key = (game_slug, phase_number)
+    # Always resolve the methodology first: it drops stale contexts
+    methodology = _get_game_methodology(game_slug)
+    if not methodology:
+        return None
+    if key not in _contexts:
+        _contexts[key] = build_phase_context(
+            methodology, phase_number, get_settings().methodology_token_budget,
+        )
+    return _contexts[key]
 
-    parts = [methodology.universal_principles]
 
-    for section in relevant:
-        parts.append(section.content)
+def precompute_methodology_contexts(max_phase: int = 20) -> None:
+    """Build the context for every known game and phase 1..max_phase."""
+    for game_slug in KnowledgeFiles.get_instance().game_files():
+        for phase_number in range(1, max_phase + 1):
+            context = _phase_context(game_slug, phase_number)
+            if context and context.trimmed:
+                logger.info(
+                    "%s phase %d methodology trimmed to %d tokens (dropped %s)",
+                    game_slug, phase_number, context.tokens, ", ".join(context.trimmed),
+                )
 
-    methodology_block = "\n\n".join(parts)
 
-    return (
-        "\nREFERENCE METHODOLOGY (community best practices — "
-        "use this knowledge when selecting and evaluating mods):\n"
-        f"{methodology_block}"
-    )
+def methodology_context_stats() -> dict[str, dict[int, dict]]:
+    """Token size and section breakdown of each prepared (game, phase) context."""
+    stats: dict[str, dict[int, dict]] = {}
+    for (game_slug, phase_number), context in sorted(_contexts.items()):
+        stats.setdefault(game_slug, {})[phase_number] = {
+            "tokens": context.tokens,
+            "sections": len(context.sections),
+            "trimmed": list(context.trimmed),
+        }
+    return stats
+
+
+def get_methodology_context(game_slug: str, phase_number: int) -> str:
+    """Return methodology text relevant to a specific game and phase.
+
+    Args:
+        game_slug: Game slug declared by a knowledge file, e.g. "skyrimse"
+        phase_number: The current phase number (1-based)
+
+    Returns:
+        A formatted string block to inject into the system prompt,
+        or empty string if no methodology exists for this game.
+    """
+    context = _phase_context(game_slug, phase_number)
+    return context.text if context else ""
@@ -0,0 +1,215 @@
+"""BM25 retrieval over the knowledge markdown, chunked by heading.
+
+The resolver injects a game's own methodology file by phase. Shared
+material — modding_common.md and, when present, the long-form
+compass_artifact methodology reference at the repository root — is
+indexed here instead, so a phase prompt or the `lookup_methodology` tool
+pulls only the few chunks relevant to a query. Pure Python: the corpus is a
+few hundred chunks, so a sparse inverted index is plenty. The index is
+rebuilt whenever the knowledge version changes (see files.py).
+"""
+
+import logging
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+
+from app.config import get_settings
+from app.knowledge.files import KnowledgeFile, KnowledgeFiles, knowledge_version, parse_system_context
+
+logger = logging.getLogger(__name__)
+
+_HEADING_RE = re.compile(r"^(#{1,3})\s+(.+?)\s*$")
+_TAG_LINE_RE = re.compile(r"^</?\w+(?:\s+\w+=\"[^\"]*\")*\s*>\s*$")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_GAME_HINTS = {"skyrim": "skyrimse", "fallout": "fallout4", "fo4": "fallout4"}
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how if in into is it its of on "
+    "or that the their them then there these this to was were what when which "
+    "with within without you your".split()
+)
+
+# BM25 parameters (standard defaults)
+_K1 = 1.5
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class KnowledgeChunk:
+    """One heading-delimited piece of a knowledge document."""
+    source: str
+    title: str
+    text: str
+    game: str | None  # None = applies to every game
+
+
+def _infer_game(text: str) -> str | None:
+    lowered = text.lower()
+    games = {game for hint, game in _GAME_HINTS.items() if hint in lowered}
+    return games.pop() if len(games) == 1 else None
+
+
+def chunk_markdown(source: str, text: str) -> list[KnowledgeChunk]:
+    """Split a document at ##/### headings, keeping the parent ## title.
+
+    A `game:` entry in the file's <system_context> scopes every chunk to that
+    game; otherwise a chunk mentioning exactly one game is scoped to it.
+    """
+    metadata, text = parse_system_context(text)
+    file_game = metadata.get("game") or None
+
+    chunks: list[KnowledgeChunk] = []
+    parent, title, lines = "", "", []
+
+    def flush() -> None:
+        body = "\n".join(lines).strip()
+        if body:
+            full_title = f"{parent} › {title}" if parent and title != parent else title
+            chunks.append(KnowledgeChunk(
+                source=source,
+                title=full_title or source,
+                text=body,
+                game=file_game or _infer_game(full_title),
+            ))
+
+    for line in text.splitlines():
+        if _TAG_LINE_RE.match(line):
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading and len(heading.group(1)) >= 2:
+            flush()
+            title, lines = heading.group(2), []
+            if len(heading.group(1)) == 2:
+                parent = title
+            continue
+        if heading:
+            continue  # document title
+        lines.append(line)
+    flush()
+    return chunks
+
+
+class KnowledgeIndex:
+    """Singleton BM25 index over every knowledge document."""
+
+    _instance: "KnowledgeIndex | None" = None
+
+    def __init__(self, chunks: list[KnowledgeChunk], version: str = ""):
+        self.chunks = chunks
+        self.version = version
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+        for doc_id, chunk in enumerate(chunks):
+            terms = tokenize(f"{chunk.title} {chunk.text}")
+            self._lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self._postings.setdefault(term, []).append((doc_id, tf))
+        self._avg_length = sum(self._lengths) / len(chunks) if chunks else 0.0
+        n = len(chunks)
+        self._idf = {
+            term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+            for term, p in self._postings.items()
+        }
+
+    @classmethod
+    def get_instance(cls) -> "KnowledgeIndex":
+        version = knowledge_version()
+        if cls._instance is None or cls._instance.version != version:
+            cls._instance = cls.from_files(KnowledgeFiles.get_instance().files(), version)
+            logger.info(
+                "Knowledge index %s: %d chunks from %d files",
+                version,
+                len(cls._instance.chunks),
+                len({c.source for c in cls._instance.chunks}),
+            )
+        return cls._instance
+
+    @classmethod
+    def from_files(cls, files: list[KnowledgeFile], version: str = "") -> "KnowledgeIndex":
+        chunks = []
+        for file in files:
+            chunks.extend(chunk_markdown(file.name, file.text))
+        return cls(chunks, version)
+
+    def search(
+        self,
+        query: str,
+        k: int = 3,
+        game: str | None = None,
+        exclude_sources: frozenset[str] = frozenset(),
+    ) -> list[tuple[KnowledgeChunk, float]]:
+        """Top-k chunks for a query, restricted to shared or `game` chunks."""
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, tf in self._postings[term]:
+                norm = _K1 * (1 - _B + _B * self._lengths[doc_id] / self._avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (_K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        results = []
+        for doc_id, score in ranked:
+            chunk = self.chunks[doc_id]
+            if chunk.source in exclude_sources:
+                continue
+            if game and chunk.game not in (None, game):
+                continue
+            results.append((chunk, score))
+            if len(results) == k:
+                break
+        return results
+
+
+def _render_chunk(chunk: KnowledgeChunk, max_chars: int) -> str:
+    text = chunk.text if len(chunk.text) <= max_chars else chunk.text[:max_chars].rstrip() + " …"
+    return f"### {chunk.title} ({chunk.source})\n{text}"
+
+
+def related_methodology(game_slug: str, query: str, exclude_source: str | None = None) -> str:
+    """Prompt block of the top chunks for a phase, or "" if nothing matches.
+
+    `exclude_source` is the game's own methodology file, which the resolver
+    already injects.
+    """
+    return _related_methodology(knowledge_version(), game_slug, query, exclude_source)
+
+
+@lru_cache(maxsize=512)
+def _related_methodology(
+    version: str, game_slug: str, query: str, exclude_source: str | None,
+) -> str:
+    # `version` only keys the cache, so edited knowledge is never served stale
+    settings = get_settings()
+    results = KnowledgeIndex.get_instance().search(
+        query,
+        k=settings.methodology_retrieval_top_k,
+        game=game_slug,
+        exclude_sources=frozenset({exclude_source}) if exclude_source else frozenset(),
+    )
+    if not results:
+        return ""
+    blocks = [_render_chunk(chunk, settings.methodology_chunk_max_chars) for chunk, _ in results]
+    return "\nRELATED GUIDANCE (retrieved for this phase):\n" + "\n\n".join(blocks)
+
+
+def lookup_methodology(game_slug: str | None, query: str, k: int = 3) -> list[dict]:
+    """Search results for the `lookup_methodology` LLM tool."""
+    max_chars = get_settings().methodology_chunk_max_chars
+    return [
+        {
+            "title": chunk.title,
+            "source": chunk.source,
+            "text": chunk.text[:max_chars],
+            "score": round(score, 2),
+        }
+        for chunk, score in KnowledgeIndex.get_instance().search(query, k=k, game=game_slug)
+    ]
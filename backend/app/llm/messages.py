@@ -0,0 +1,110 @@
+"""Translation between OpenAI chat messages and Anthropic Messages API format.
+
+The pipeline keeps tool-loop history in OpenAI format (system message first,
+assistant `tool_calls`, one `tool` message per result). The Anthropic
+provider converts to its own format on the way in and back again for
+checkpoints, so a phase interrupted on one provider can be continued on any
+other from the last completed tool turn.
+"""
+
+from typing import Any
+
+from app.serialization import JSONDecodeError, dumps, loads
+
+
+def openai_to_anthropic(messages: list[dict]) -> tuple[str, list[dict]]:
+    """Convert OpenAI-format messages to (system_prompt, anthropic_messages)."""
+    system = ""
+    converted: list[dict] = []
+
+    for msg in messages:
+        role = msg["role"]
+
+        if role == "system":
+            system = msg.get("content") or ""
+
+        elif role == "assistant":
+            blocks: list[dict] = []
+            if msg.get("content"):
+                blocks.append({"type": "text", "text": msg["content"]})
+            for tc in msg.get("tool_calls") or []:
+                try:
+                    args = loads(tc["function"]["arguments"] or "{}")
+                except JSONDecodeError:
+                    args = {}
+                blocks.append({
+                    "type": "tool_use",
+                    "id": tc["id"],
+                    "name": tc["function"]["name"],
+                    "input": args,
+                })
+            converted.append({"role": "assistant", "content": blocks})
+
+        elif role == "tool":
+            result = {
+                "type": "tool_result",
+                "tool_use_id": msg["tool_call_id"],
+                "content": msg.get("content") or "",
+            }
+            # Anthropic expects all results of one turn in a single user message
+            previous = converted[-1] if converted else None
+            if (
+                previous
+                and previous["role"] == "user"
+                and isinstance(previous["content"], list)
+                and all(b.get("type") == "tool_result" for b in previous["content"])
+            ):
+                previous["content"].append(result)
+            else:
+                converted.append({"role": "user", "content": [result]})
+
+        else:
+            converted.append({"role": role, "content": msg.get("content") or ""})
+
+    return system, converted
+
+
+def anthropic_to_openai(system: str, messages: list[dict]) -> list[dict]:
+    """Convert an Anthropic system prompt + messages back to OpenAI format."""
+    converted: list[dict] = []
+    if system:
+        converted.append({"role": "system", "content": system})
+
+    for msg in messages:
+        content = msg["content"]
+
+        if isinstance(content, str):
+            converted.append({"role": msg["role"], "content": content})
+            continue
+
+        if msg["role"] == "assistant":
+            out: dict[str, Any] = {"role": "assistant"}
+            text = "".join(b["text"] for b in content if b.get("type") == "text")
+            if text:
+                out["content"] = text
+            tool_calls = [
+                {
+                    "id": b["id"],
+                    "type": "function",
+                    "function": {"name": b["name"], "arguments": dumps(b.get("input") or {})},
+                }
+                for b in content
+                if b.get("type") == "tool_use"
+            ]
+            if tool_calls:
+                out["tool_calls"] = tool_calls
+            converted.append(out)
+            continue
+
+        # User turn: tool results become individual tool messages
+        for block in content:
+            if block.get("type") == "tool_result":
+                converted.append({
+                    "role": "tool",
+                    "tool_call_id": block["tool_use_id"],
+                    "content": block.get("content") or "",
+                })
+            elif block.get("type") == "text":
+                converted.append({"role": "user", "content": block["text"]})
+
+    return converted
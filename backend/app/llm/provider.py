@@ -1,10 +1,11 @@
-import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Awaitable
 
 from openai import AsyncOpenAI
 from app.config import get_settings
+from app.llm.messages import anthropic_to_openai, openai_to_anthropic
+from app.serialization import JSONDecodeError, dumps, loads
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +27,18 @@ class LLMProvider(ABC):
         tool_handlers: dict[str, ToolHandler],
         max_iterations: int = 15,
         on_text: Callable[[str], None] | None = None,
+        on_checkpoint: Callable[[list[dict]], None] | None = None,
     ) -> list[dict]:
         """Run a tool-calling loop. Returns the full message history.
 
         Args:
+            messages: Conversation so far in OpenAI format. May be a
+                      checkpoint from an earlier run, in which case the
+                      loop continues from its last completed tool turn.
             on_text: Optional callback invoked when the LLM produces text content.
                      Used for streaming 'thinking' events to the frontend.
+            on_checkpoint: Optional callback invoked after every completed
+                           tool turn with the full history in OpenAI format.
         """
         pass
 
@@ -39,6 +46,10 @@ class LLMProvider(ABC):
     def get_model_name(self) -> str:
         pass
 
+    async def close(self) -> None:
+        """Release the provider's HTTP connections."""
+        pass
+
 
 class OpenAICompatibleProvider(LLMProvider):
     """Provider for any OpenAI-compatible API (Ollama, Groq, Together, HuggingFace)."""
@@ -65,6 +76,7 @@ class OpenAICompatibleProvider(LLMProvider):
         tool_handlers: dict[str, ToolHandler],
         max_iterations: int = 15,
         on_text: Callable[[str], None] | None = None,
+        on_checkpoint: Callable[[list[dict]], None] | None = None,
     ) -> list[dict]:
         """Run a tool-calling loop until the LLM stops calling tools or we hit max_iterations."""
         messages = list(messages)  # don't mutate caller's list
@@ -111,8 +123,8 @@ class OpenAICompatibleProvider(LLMProvider):
             for tc in choice.message.tool_calls:
                 fn_name = tc.function.name
                 try:
-                    args = json.loads(tc.function.arguments)
-                except json.JSONDecodeError:
+                    args = loads(tc.function.arguments)
+                except JSONDecodeError:
                     args = {}
 
                 handler = tool_handlers.get(fn_name)
@@ -121,15 +133,18 @@ class OpenAICompatibleProvider(LLMProvider):
                         result = await handler(**args)
                     except Exception as e:
                         logger.error(f"Tool {fn_name} failed: {e}")
-                        result = json.dumps({"error": str(e)})
+                        result = dumps({"error": str(e)})
                 else:
-                    result = json.dumps({"error": f"Unknown tool: {fn_name}"})
+                    result = dumps({"error": f"Unknown tool: {fn_name}"})
 
                 messages.append({
                     "role": "tool",
                     "tool_call_id": tc.id,
                     "content": result,
                 })
+
+            if on_checkpoint:
+                on_checkpoint(list(messages))
         else:
             logger.warning(f"Hit max iterations ({max_iterations})")
 
@@ -138,6 +153,9 @@ class OpenAICompatibleProvider(LLMProvider):
     def get_model_name(self) -> str:
         return self.model
 
+    async def close(self) -> None:
+        await self.client.close()
+
 
 class AnthropicProvider(LLMProvider):
     """Provider for Anthropic's Claude API (native Messages API)."""
@@ -164,15 +182,11 @@ class AnthropicProvider(LLMProvider):
         tool_handlers: dict[str, ToolHandler],
         max_iterations: int = 15,
         on_text: Callable[[str], None] | None = None,
+        on_checkpoint: Callable[[list[dict]], None] | None = None,
     ) -> list[dict]:
-        # Extract system prompt and convert messages
-        system = ""
-        anthropic_messages = []
-        for msg in messages:
-            if msg["role"] == "system":
-                system = msg["content"]
-            else:
-                anthropic_messages.append({"role": msg["role"], "content": msg["content"]})
+        # Extract system prompt and convert messages (including any tool
+        # turns from a checkpoint) to the Anthropic format
+        system, anthropic_messages = openai_to_anthropic(messages)
 
         # Convert OpenAI tool format to Anthropic format
         anthropic_tools = []
@@ -228,9 +242,9 @@ class AnthropicProvider(LLMProvider):
                         result = await handler(**tu.input)
                     except Exception as e:
                         logger.error(f"Tool {tu.name} failed: {e}")
-                        result = json.dumps({"error": str(e)})
+                        result = dumps({"error": str(e)})
                 else:
-                    result = json.dumps({"error": f"Unknown tool: {tu.name}"})
+                    result = dumps({"error": f"Unknown tool: {tu.name}"})
 
                 tool_results.append({
                     "type": "tool_result",
@@ -240,6 +254,9 @@ class AnthropicProvider(LLMProvider):
 
             # Anthropic expects all tool results in a single user message
             msgs.append({"role": "user", "content": tool_results})
+
+            if on_checkpoint:
+                on_checkpoint(anthropic_to_openai(system, msgs))
         else:
             logger.warning(f"[Anthropic] Hit max iterations ({max_iterations})")
 
@@ -248,6 +265,9 @@ class AnthropicProvider(LLMProvider):
     def get_model_name(self) -> str:
         return self.model
 
+    async def close(self) -> None:
+        await self.client.close()
+
 
 class LLMProviderFactory:
     """Factory to create LLM providers based on configuration or registry."""
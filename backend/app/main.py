@@ -3,12 +3,16 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from sqlalchemy import select, text
 
 from app.api import specs, games, modlist, settings, auth, stats, generation
 from app.config import get_settings
-from app.database import engine, async_session, Base
+from app.database import engine, async_session, Base, pool_status
+from app.knowledge import KnowledgeIndex, precompute_methodology_contexts
+from app.services.hardware_catalog import HardwareCatalog
+from app.services.generation_scheduler import GenerationScheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,7 +58,13 @@ async def lifespan(app: FastAPI):
         await init_db()
     except Exception:
         logger.exception("Database init failed — app will start without data")
+    precompute_methodology_contexts()
+    KnowledgeIndex.get_instance()
+    HardwareCatalog.get_instance()
     yield
+    await GenerationScheduler.get_instance().drain(
+        app_settings.generation_drain_timeout_seconds
+    )
 
 
 app = FastAPI(
@@ -62,6 +72,7 @@ app = FastAPI(
     description="AI-powered video game mod manager API",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Parse CORS origins and log them
@@ -76,6 +87,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class StreamSafeGZipMiddleware(GZipMiddleware):
+    """GZip that leaves SSE and NDJSON streams alone — compressing them
+    would buffer output until enough bytes accumulate."""
+
+    _STREAMING_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            accept = dict(scope["headers"]).get(b"accept", b"")
+            streaming = any(t in accept for t in self._STREAMING_TYPES)
+            if streaming or scope["path"].endswith("/events"):
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(StreamSafeGZipMiddleware, minimum_size=1000)
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.exception(f"Unhandled error on {request.method} {request.url.path}")
@@ -113,4 +143,5 @@ async def health_check():
         "app": app_settings.app_name,
         "db_ready": _db_ready,
         "db_status": db_status,
+        "db_pool": pool_status(),
     }
@@ -10,6 +10,9 @@ from app.models.user_oauth_provider import UserOAuthProvider
 from app.models.refresh_token import RefreshToken
 from app.models.email_verification import EmailVerification
 from app.models.mod_build_phase import ModBuildPhase
+from app.models.app_counter import AppCounter
+from app.models.modlist_archive import ModlistArchive
+from app.models.spec_parse_result import SpecParseResult
 
 __all__ = [
     "Game",
@@ -25,4 +28,7 @@ __all__ = [
     "RefreshToken",
     "EmailVerification",
     "ModBuildPhase",
+    "AppCounter",
+    "ModlistArchive",
+    "SpecParseResult",
 ]
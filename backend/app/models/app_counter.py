@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class AppCounter(Base):
+    """Named, incrementally maintained counters.
+
+    Holds the landing-page stats (so /api/stats doesn't COUNT(*) modlists)
+    and the reference-data version bumped by seeds and migrations.
+    """
+
+    __tablename__ = "app_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0)
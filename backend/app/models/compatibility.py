@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -6,6 +6,9 @@ from app.database import Base
 
 class CompatibilityRule(Base):
     __tablename__ = "compatibility_rules"
+    __table_args__ = (
+        Index("ix_compatibility_rules_mod_id", "mod_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     mod_id: Mapped[int] = mapped_column(ForeignKey("mods.id"))
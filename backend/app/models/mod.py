@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 
@@ -7,6 +7,14 @@ from app.database import Base
 
 class Mod(Base):
     __tablename__ = "mods"
+    __table_args__ = (
+        # Identity of a Nexus mod; target of the upsert in services/mod_catalog
+        Index(
+            "uq_mods_nexus_game_domain_nexus_mod_id",
+            "nexus_game_domain", "nexus_mod_id",
+            unique=True,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     nexus_mod_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, JSON
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
@@ -9,6 +9,10 @@ from app.database import Base
 
 class Modlist(Base):
     __tablename__ = "modlists"
+    __table_args__ = (
+        # /modlist/mine: filter by user, keyset-paginate on (created_at, id)
+        Index("ix_modlists_user_id_created_at", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -27,13 +31,27 @@ class Modlist(Base):
     llm_provider: Mapped[str | None] = mapped_column(String(100), nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
 
-    entries: Mapped[list["ModlistEntry"]] = relationship(back_populates="modlist")
+    # Materialized MO2 export (see services/modlist_export.py). Deferred so
+    # listing queries don't load the payload.
+    export_payload: Mapped[dict | None] = mapped_column(JSON, nullable=True, deferred=True)
+    export_etag: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    export_refreshed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    entries: Mapped[list["ModlistEntry"]] = relationship(
+        back_populates="modlist", order_by="[ModlistEntry.load_order, ModlistEntry.id]",
+    )
     knowledge_flags: Mapped[list["ModlistKnowledgeFlag"]] = relationship(back_populates="modlist")
     user: Mapped["User | None"] = relationship(back_populates="modlists")  # noqa: F821
 
 
 class ModlistEntry(Base):
     __tablename__ = "modlist_entries"
+    __table_args__ = (
+        Index(
+            "ix_modlist_entries_modlist_id_load_order", "modlist_id", "load_order",
+            postgresql_include=["id"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     modlist_id: Mapped[uuid.UUID] = mapped_column(
@@ -42,6 +60,8 @@ class ModlistEntry(Base):
     # mod_id is nullable — Nexus-discovered mods may not be in our mods table
     mod_id: Mapped[int | None] = mapped_column(ForeignKey("mods.id"), nullable=True)
     nexus_mod_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Primary Nexus file, resolved once for exports
+    nexus_file_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
     # Denormalized fields so we don't need the mods FK for display
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     author: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -59,6 +79,9 @@ class ModlistEntry(Base):
 
 class ModlistKnowledgeFlag(Base):
     __tablename__ = "modlist_knowledge_flags"
+    __table_args__ = (
+        Index("ix_modlist_knowledge_flags_modlist_id", "modlist_id", postgresql_include=["id"]),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     modlist_id: Mapped[uuid.UUID] = mapped_column(
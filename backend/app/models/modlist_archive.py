@@ -0,0 +1,30 @@
+import uuid
+from sqlalchemy import ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from app.database import Base
+
+
+class ModlistArchive(Base):
+    """A historical modlist moved out of the hot modlist tables.
+
+    `payload` is the zlib-compressed JSON of the modlist's ModlistResponse
+    (see services/modlist_archive.py); the ID is the original modlist ID so
+    old links keep resolving.
+    """
+
+    __tablename__ = "modlist_archives"
+    __table_args__ = (
+        Index("ix_modlist_archives_created_at", "created_at"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"))
+    playstyle_id: Mapped[int] = mapped_column(Integer)
+    llm_provider: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    entry_count: Mapped[int] = mapped_column(Integer, default=0)
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    created_at: Mapped[datetime] = mapped_column()
+    archived_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
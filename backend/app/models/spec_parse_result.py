@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class SpecParseResult(Base):
+    """LLM-parsed hardware specs for one pasted text.
+
+    Keyed by the SHA-256 of the whitespace-normalized text (see
+    services/spec_cache.py), so a DxDiag dump pasted again, by anyone,
+    skips the LLM call.
+    """
+
+    __tablename__ = "spec_parse_results"
+
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    specs: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(default=datetime.utcnow)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 import uuid
 
@@ -22,11 +24,14 @@ class ModlistGenerateRequest(BaseModel):
     available_storage_gb: int | None = None
     # User-supplied LLM credentials — tried in order, falls back on failure
     llm_credentials: list[LLMCredential] = []
+    # Reuse a recent modlist generated for an identical request, if any
+    use_cache: bool = False
 
 
 class ModEntry(BaseModel):
     mod_id: int | None = None
     nexus_mod_id: int | None = None
+    nexus_file_id: int | None = None
     name: str
     author: str | None = None
     summary: str | None = None
@@ -55,6 +60,17 @@ class ModlistResponse(BaseModel):
     generation_error: str | None = None
 
 
+class ModlistSummary(BaseModel):
+    """Lightweight listing row: counts instead of full entries."""
+    id: uuid.UUID
+    game_id: int
+    playstyle_id: int
+    llm_provider: str | None = None
+    created_at: datetime
+    entry_count: int = 0
+    flag_count: int = 0
+
+
 class ExportModEntry(BaseModel):
     nexus_mod_id: int | None = None
     file_id: int | None = None
@@ -3,6 +3,8 @@ from pydantic import BaseModel
 
 class SpecsInput(BaseModel):
     raw_text: str
+    # Return the regex result at once and refine with the LLM in the background
+    defer_llm: bool = False
 
 
 class HardwareSpecs(BaseModel):
@@ -29,3 +31,27 @@ class SpecsParseResponse(BaseModel):
     parse_method: str  # "regex" or "llm"
     tier: str | None = None  # "low", "mid", "high", "ultra"
     tier_scores: TierScores | None = None
+    refine_id: str | None = None  # set while an LLM refinement is pending
+
+
+class SpecsBatchInput(BaseModel):
+    raw_texts: list[str]
+
+
+class SpecsBatchItem(BaseModel):
+    specs: HardwareSpecs
+    parse_method: str  # "regex" or "regex_partial"
+    tier: str
+    tier_scores: TierScores
+
+
+class SpecsBatchResponse(BaseModel):
+    results: list[SpecsBatchItem]
+    tier_counts: dict[str, int]
+
+
+class SpecsRefineResponse(BaseModel):
+    status: str  # "pending", "done" or "failed"
+    specs: HardwareSpecs | None = None
+    tier: str | None = None
+    tier_scores: TierScores | None = None
@@ -15,6 +15,7 @@ from app.models.mod import Mod
 from app.models.playstyle_mod import PlaystyleMod
 from app.models.compatibility import CompatibilityRule
 from app.models.mod_build_phase import ModBuildPhase
+from app.services.reference_cache import bump_reference_version
 from app.seeds.seed_data import (
     GAMES,
     PLAYSTYLES,
@@ -273,6 +274,9 @@ async def main():
             session, FALLOUT4_BUILD_PHASES, game_map.get("fallout4")
         )
 
+        # Tell running API processes to drop cached games/playstyles
+        await bump_reference_version(session)
+
         await session.commit()
         print("Seed complete!")
 
@@ -367,7 +367,7 @@ SKYRIM_COMPATIBILITY = [
      "Load Precision after TDM for proper hit detection."),
     ("Frostfall - Hypothermia Camping Survival", "Campfire - Complete Camping System", "requires",
      "Frostfall requires Campfire as a framework."),
-    ("SkyUI", "Frostfall - Hypothermia Camping Survival", "requires",
+    ("Frostfall - Hypothermia Camping Survival", "SkyUI", "requires",
      "Frostfall requires SkyUI for the MCM configuration menu."),
     ("Noble Skyrim Mod HD-2K", "Skyland AIO", "conflicts",
      "Both are full texture packs. Choose one based on your preference."),
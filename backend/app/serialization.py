@@ -0,0 +1,36 @@
+"""Fast JSON encoding shared by API responses, SSE frames and tool results.
+
+Backed by orjson, which serializes several times faster than the stdlib and
+handles datetime/UUID natively. Integer dict keys are allowed (the session
+description cache is keyed by Nexus mod ID).
+"""
+
+from typing import Any
+
+import orjson
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode to compact JSON bytes."""
+    return orjson.dumps(obj, option=_OPTIONS)
+
+
+def dumps(obj: Any) -> str:
+    """Encode to a compact JSON string (for APIs that require str)."""
+    return orjson.dumps(obj, option=_OPTIONS).decode()
+
+
+def dumps_canonical(obj: Any) -> bytes:
+    """Sorted-key encoding for hashing; unknown types fall back to str()."""
+    return orjson.dumps(obj, option=_OPTIONS | orjson.OPT_SORT_KEYS, default=str)
+
+
+loads = orjson.loads
+JSONDecodeError = orjson.JSONDecodeError
+
+
+def sse_frame(event: dict) -> bytes:
+    """One Server-Sent Events `data:` frame."""
+    return b"data: " + orjson.dumps(event, option=_OPTIONS) + b"\n\n"
@@ -0,0 +1,138 @@
+"""Memoization of completed generations for identical requests.
+
+Many users ask for the same (game, playstyle, game version, hardware tier)
+combination. When a request opts in with `use_cache`, a recent modlist for
+the same fingerprint is cloned instead of rerunning the whole multi-phase
+LLM pipeline.
+
+The fingerprint uses the tier from classify_hardware_tier rather than raw
+GPU/CPU strings, plus the VRAM and storage budgets the pipeline enforces. It
+also includes a digest of the game's ModBuildPhase rows and the knowledge
+version, so editing the phases or a methodology file invalidates the cached
+results built from them.
+"""
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.knowledge.files import knowledge_version
+from app.models.mod_build_phase import ModBuildPhase
+from app.schemas.modlist import ModlistGenerateRequest
+from app.serialization import dumps_canonical
+from app.services.modlist_generator import generation_budgets
+from app.services.tier_classifier import classify_hardware_tier
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    modlist_id: str
+    stored_at: float
+
+
+class GenerationResultCache:
+    """Bounded, TTL-based map of request fingerprint → saved modlist ID."""
+
+    _instance: "GenerationResultCache | None" = None
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    @classmethod
+    def get_instance(cls) -> "GenerationResultCache":
+        if cls._instance is None:
+            settings = get_settings()
+            cls._instance = cls(
+                ttl_seconds=settings.generation_cache_ttl_seconds,
+                max_entries=settings.generation_cache_max_entries,
+            )
+        return cls._instance
+
+    def lookup(self, fingerprint: str) -> str | None:
+        """Return the cached modlist ID for a fingerprint, if still fresh."""
+        entry = self._entries.get(fingerprint)
+        if entry and time.time() - entry.stored_at <= self.ttl_seconds:
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return entry.modlist_id
+        if entry:
+            del self._entries[fingerprint]
+        self.misses += 1
+        return None
+
+    def store(self, fingerprint: str, modlist_id: str) -> None:
+        self._entries[fingerprint] = _CacheEntry(modlist_id=modlist_id, stored_at=time.time())
+        self._entries.move_to_end(fingerprint)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_modlist(self, modlist_id: str) -> None:
+        """Drop every fingerprint pointing at a modlist (e.g. after deletion)."""
+        stale = [k for k, e in self._entries.items() if e.modlist_id == modlist_id]
+        for key in stale:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+async def _phases_digest(db: AsyncSession, game_id: int) -> str:
+    """Hash the content of a game's build phases."""
+    result = await db.execute(
+        select(ModBuildPhase)
+        .where(ModBuildPhase.game_id == game_id)
+        .order_by(ModBuildPhase.phase_number)
+    )
+    digest = hashlib.sha256()
+    for phase in result.scalars().all():
+        digest.update(dumps_canonical([
+            phase.phase_number, phase.name, phase.description,
+            phase.search_guidance, phase.rules, phase.example_mods,
+            phase.is_playstyle_driven, phase.max_mods,
+        ]))
+    return digest.hexdigest()
+
+
+async def request_fingerprint(db: AsyncSession, request: ModlistGenerateRequest) -> str:
+    """Normalized cache key for a generation request."""
+    tier = classify_hardware_tier(
+        gpu=request.gpu, vram_mb=request.vram_mb,
+        cpu=request.cpu, ram_gb=request.ram_gb,
+        cpu_cores=request.cpu_cores, cpu_speed_ghz=request.cpu_speed_ghz,
+    )["tier"]
+    # The budgets the pipeline enforces, in the units it enforces them in
+    # (storage in whole GB), so a list built to fit a bigger drive or GPU
+    # is never served to a smaller one
+    vram_budget, storage_budget_gb = generation_budgets(request, tier)
+    parts = [
+        request.game_id,
+        request.playstyle_id,
+        (request.game_version or "").strip().lower(),
+        tier,
+        vram_budget,
+        storage_budget_gb,
+        await _phases_digest(db, request.game_id),
+        knowledge_version(),
+    ]
+    return hashlib.sha256(dumps_canonical(parts)).hexdigest()
@@ -1,7 +1,9 @@
 """In-memory manager for tracking active and recently completed generations.
 
 Stores events for SSE replay and manages subscriber queues for live streaming.
-Generations are cleaned up after 1 hour to bound memory usage.
+Generations are cleaned up after 1 hour to bound memory usage. A running
+generation whose last subscriber has been gone for the orphan grace period
+is cancelled so it stops spending LLM tokens and Nexus quota.
 """
 
 import asyncio
@@ -11,6 +13,9 @@ import uuid
 from dataclasses import dataclass, field
 from typing import Callable
 
+from app.config import get_settings
+from app.services.modlist_generator import GenerationControl
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,10 +26,17 @@ class GenerationState:
     generation_id: str
     events: list[dict] = field(default_factory=list)
     subscribers: list[asyncio.Queue] = field(default_factory=list)
-    status: str = "running"  # running | complete | error | paused
+    status: str = "running"  # queued | running | complete | error | paused | cancelled
     modlist_id: str | None = None
     created_at: float = field(default_factory=time.time)
 
+    # Client-issued control flags (pause-after-phase, skip-phase) and the
+    # background task running the pipeline, so it can be cancelled
+    control: GenerationControl = field(default_factory=GenerationControl)
+    task: asyncio.Task | None = None
+    # Pending auto-cancel, armed when the last subscriber leaves
+    orphan_timer: asyncio.TimerHandle | None = None
+
     # Pause/resume fields
     paused_at_phase: int | None = None
     session_snapshot: dict | None = None
@@ -39,20 +51,23 @@ class GenerationManager:
     Responsibilities:
     - Store events for each generation (for SSE replay on reconnect)
     - Push live events to subscriber queues (for active SSE connections)
-    - Track generation status (running/complete/error/paused)
+    - Track generation status (queued/running/complete/error/paused/cancelled)
     - Clean up old generations to bound memory
     """
 
     _instance: "GenerationManager | None" = None
 
-    def __init__(self):
+    def __init__(self, orphan_grace_seconds: float = 0):
         self._generations: dict[str, GenerationState] = {}
         self._lock = asyncio.Lock()
+        self.orphan_grace_seconds = orphan_grace_seconds
 
     @classmethod
     def get_instance(cls) -> "GenerationManager":
         if cls._instance is None:
-            cls._instance = cls()
+            cls._instance = cls(
+                orphan_grace_seconds=get_settings().generation_orphan_grace_seconds,
+            )
         return cls._instance
 
     def create_generation(self, user_id: str | None = None) -> str:
@@ -106,6 +121,7 @@ class GenerationManager:
 
         queue: asyncio.Queue = asyncio.Queue(maxsize=500)
         state.subscribers.append(queue)
+        self._disarm_orphan_timer(state)
         logger.info(
             f"New subscriber for generation {generation_id} "
             f"(total: {len(state.subscribers)})"
@@ -121,15 +137,95 @@ class GenerationManager:
                 f"Unsubscribed from generation {generation_id} "
                 f"(remaining: {len(state.subscribers)})"
             )
+            if not state.subscribers:
+                self._arm_orphan_timer(state)
+
+    def _arm_orphan_timer(self, state: GenerationState) -> None:
+        """Schedule auto-cancel of a generation nobody is watching.
+
+        Paused generations are left alone — they hold no resources and the
+        user may come back to resume them.
+        """
+        if self.orphan_grace_seconds <= 0 or state.status not in ("queued", "running"):
+            return
+        self._disarm_orphan_timer(state)
+        state.orphan_timer = asyncio.get_running_loop().call_later(
+            self.orphan_grace_seconds, self._cancel_orphan, state.generation_id,
+        )
+
+    def _disarm_orphan_timer(self, state: GenerationState) -> None:
+        if state.orphan_timer:
+            state.orphan_timer.cancel()
+            state.orphan_timer = None
+
+    def _cancel_orphan(self, generation_id: str) -> None:
+        state = self._generations.get(generation_id)
+        if not state:
+            return
+        state.orphan_timer = None
+        if state.subscribers or state.status not in ("queued", "running"):
+            return
+        logger.info(
+            f"Cancelling generation {generation_id}: no subscribers for "
+            f"{self.orphan_grace_seconds:.0f}s"
+        )
+        self.cancel(generation_id)
 
     def get_state(self, generation_id: str) -> GenerationState | None:
         return self._generations.get(generation_id)
 
+    def attach_task(self, generation_id: str, task: asyncio.Task) -> None:
+        """Keep a reference to the task running a generation.
+
+        Holding the reference prevents the task from being garbage-collected
+        mid-run and lets cancel() stop it.
+        """
+        state = self._generations.get(generation_id)
+        if state:
+            state.task = task
+
+    def cancel(self, generation_id: str) -> bool:
+        """Request cancellation of a running or paused generation.
+
+        Running generations are cancelled through their task; the task's
+        handler then calls set_cancelled(). Queued and paused generations
+        have no task and are marked cancelled directly. Returns False if the generation
+        is unknown or already finished.
+        """
+        state = self._generations.get(generation_id)
+        if not state or state.status in ("complete", "error", "cancelled"):
+            return False
+
+        if state.status == "paused" or state.task is None or state.task.done():
+            self.set_cancelled(generation_id)
+        else:
+            state.task.cancel()
+        return True
+
+    def set_queued(self, generation_id: str, position: int, queue_length: int) -> None:
+        """Mark generation as waiting for a scheduler slot."""
+        state = self._generations.get(generation_id)
+        if state:
+            state.status = "queued"
+            self.emit(generation_id, {
+                "type": "queued",
+                "position": position,
+                "queue_length": queue_length,
+            })
+
+    def set_dequeued(self, generation_id: str) -> None:
+        """Mark a previously queued generation as running."""
+        state = self._generations.get(generation_id)
+        if state and state.status == "queued":
+            state.status = "running"
+            self.emit(generation_id, {"type": "started"})
+
     def set_complete(self, generation_id: str, modlist_id: str) -> None:
         """Mark generation as complete with the saved modlist ID."""
         state = self._generations.get(generation_id)
         if state:
             state.status = "complete"
+            state.control.pause_after_phase = False
             state.modlist_id = modlist_id
             self.emit(generation_id, {
                 "type": "complete",
@@ -141,11 +237,22 @@ class GenerationManager:
         state = self._generations.get(generation_id)
         if state:
             state.status = "error"
+            state.control.pause_after_phase = False
             self.emit(generation_id, {
                 "type": "error",
                 "message": message,
             })
 
+    def set_cancelled(self, generation_id: str) -> None:
+        """Mark generation as cancelled."""
+        state = self._generations.get(generation_id)
+        if state and state.status != "cancelled":
+            state.status = "cancelled"
+            state.task = None
+            state.control.pause_after_phase = False
+            self._disarm_orphan_timer(state)
+            self.emit(generation_id, {"type": "cancelled"})
+
     def set_paused(
         self,
         generation_id: str,
@@ -179,6 +286,7 @@ class GenerationManager:
         if state:
             state.status = "running"
             state.paused_at_phase = None
+            state.control.pause_after_phase = False
             self.emit(generation_id, {
                 "type": "resumed",
                 "phase_name": phase_name,
@@ -186,14 +294,14 @@ class GenerationManager:
             })
 
     def cleanup_old(self, max_age: float = 3600) -> int:
-        """Remove completed/errored generations older than max_age seconds.
+        """Remove finished generations older than max_age seconds.
 
         Returns the number of cleaned-up generations.
         """
         now = time.time()
         to_remove = []
         for gid, state in self._generations.items():
-            if state.status in ("complete", "error") and now - state.created_at > max_age:
+            if state.status in ("complete", "error", "cancelled") and now - state.created_at > max_age:
                 to_remove.append(gid)
         for gid in to_remove:
             del self._generations[gid]
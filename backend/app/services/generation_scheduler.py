@@ -0,0 +1,223 @@
+"""Bounded scheduler for background modlist generations.
+
+Every generation is an LLM tool-calling loop that also spends Nexus quota,
+so they are admitted through a small worker pool instead of being spawned
+with a bare asyncio.create_task:
+
+- At most `generation_max_concurrent` generations run at once.
+- At most `generation_max_per_user` of them belong to the same user.
+- Waiting jobs are dispatched round-robin across users, so one user
+  queueing many generations can't starve everyone else.
+- Queued generations get "queued" events with their position, through the
+  same GenerationManager event store used by SSE and WebSocket clients.
+- On shutdown, drain() stops admitting jobs and waits for running ones.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from app.config import get_settings
+from app.services.generation_manager import GenerationManager
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerFullError(Exception):
+    """Raised when a job is submitted while the queue is full or draining."""
+    pass
+
+
+@dataclass
+class _Job:
+    generation_id: str
+    user_key: str
+    factory: Callable[[], Awaitable[None]]
+    last_position: int | None = None
+
+
+class GenerationScheduler:
+    """Singleton worker pool with per-user fairness and admission control."""
+
+    _instance: "GenerationScheduler | None" = None
+
+    def __init__(self, max_concurrent: int, max_per_user: int, max_queued: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_per_user = max(1, max_per_user)
+        self.max_queued = max(0, max_queued)
+
+        # user_key → waiting jobs; dict order is the round-robin order
+        self._queues: OrderedDict[str, deque[_Job]] = OrderedDict()
+        # generation_id → running task (strong refs so tasks aren't GC'd)
+        self._running: dict[str, asyncio.Task] = {}
+        self._running_users: dict[str, str] = {}
+        self._draining = False
+
+    @classmethod
+    def get_instance(cls) -> "GenerationScheduler":
+        if cls._instance is None:
+            settings = get_settings()
+            cls._instance = cls(
+                max_concurrent=settings.generation_max_concurrent,
+                max_per_user=settings.generation_max_per_user,
+                max_queued=settings.generation_max_queued,
+            )
+        return cls._instance
+
+    # ── Admission ──
+
+    def has_capacity(self) -> bool:
+        """Whether submit() would currently accept a new job."""
+        if self._draining:
+            return False
+        return self.queued_count() < self.max_queued or self._can_start_now()
+
+    def submit(
+        self,
+        generation_id: str,
+        user_id: str | None,
+        factory: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Queue a generation job and dispatch it as soon as a slot is free.
+
+        `factory` is called with no arguments when the job starts and must
+        return the coroutine that runs the generation.
+        """
+        if not self.has_capacity():
+            raise SchedulerFullError("Generation queue is full")
+
+        job = _Job(generation_id=generation_id, user_key=user_id or "", factory=factory)
+        self._queues.setdefault(job.user_key, deque()).append(job)
+        self._dispatch()
+        self._publish_positions()
+
+    # ── Dispatch ──
+
+    def _can_start_now(self) -> bool:
+        return len(self._running) < self.max_concurrent
+
+    def _running_for(self, user_key: str) -> int:
+        return sum(1 for u in self._running_users.values() if u == user_key)
+
+    def _is_cancelled(self, job: _Job) -> bool:
+        state = GenerationManager.get_instance().get_state(job.generation_id)
+        return state is None or state.status == "cancelled"
+
+    def _next_job(self) -> _Job | None:
+        """Pop the next job, round-robin over users below their limit."""
+        for user_key in list(self._queues):
+            queue = self._queues[user_key]
+            while queue and self._is_cancelled(queue[0]):
+                queue.popleft()
+            if not queue:
+                del self._queues[user_key]
+                continue
+            if self._running_for(user_key) >= self.max_per_user:
+                continue
+            job = queue.popleft()
+            # Move this user to the back of the rotation
+            del self._queues[user_key]
+            if queue:
+                self._queues[user_key] = queue
+            return job
+        return None
+
+    def _dispatch(self) -> None:
+        manager = GenerationManager.get_instance()
+        while self._can_start_now():
+            job = self._next_job()
+            if not job:
+                break
+            task = asyncio.create_task(job.factory())
+            self._running[job.generation_id] = task
+            self._running_users[job.generation_id] = job.user_key
+            task.add_done_callback(lambda t, job=job: self._finished(job, t))
+            manager.attach_task(job.generation_id, task)
+            if job.last_position is not None:
+                manager.set_dequeued(job.generation_id)
+
+    def _finished(self, job: _Job, task: asyncio.Task) -> None:
+        """Free the job's slot and start the next one.
+
+        A done callback rather than a finally in the job's coroutine: a task
+        cancelled before its first step never runs any of its code, so
+        neither a finally nor the pipeline's own cancellation handler would
+        release the slot or mark the generation cancelled.
+        """
+        self._running.pop(job.generation_id, None)
+        self._running_users.pop(job.generation_id, None)
+        if task.cancelled():
+            GenerationManager.get_instance().set_cancelled(job.generation_id)
+        if not self._draining:
+            self._dispatch()
+            self._publish_positions()
+
+    # ── Queue positions ──
+
+    def _queue_order(self) -> list[_Job]:
+        """Waiting jobs in the order they would be dispatched (round-robin)."""
+        queues = [
+            [job for job in q if not self._is_cancelled(job)]
+            for q in self._queues.values()
+        ]
+        order: list[_Job] = []
+        depth = 0
+        while True:
+            layer = [q[depth] for q in queues if depth < len(q)]
+            if not layer:
+                return order
+            order.extend(layer)
+            depth += 1
+
+    def _publish_positions(self) -> None:
+        """Emit a "queued" event to every waiting job whose position changed."""
+        manager = GenerationManager.get_instance()
+        order = self._queue_order()
+        for index, job in enumerate(order):
+            position = index + 1
+            if job.last_position != position:
+                job.last_position = position
+                manager.set_queued(job.generation_id, position, len(order))
+
+    def queued_count(self) -> int:
+        return sum(
+            1 for q in self._queues.values() for job in q if not self._is_cancelled(job)
+        )
+
+    def stats(self) -> dict:
+        return {
+            "running": len(self._running),
+            "queued": self.queued_count(),
+            "max_concurrent": self.max_concurrent,
+            "max_per_user": self.max_per_user,
+            "draining": self._draining,
+        }
+
+    # ── Shutdown ──
+
+    async def drain(self, timeout: float) -> None:
+        """Stop admitting jobs, cancel queued ones and wait for running ones.
+
+        Generations still running after `timeout` seconds are cancelled.
+        """
+        self._draining = True
+        manager = GenerationManager.get_instance()
+
+        for queue in self._queues.values():
+            for job in queue:
+                manager.set_error(job.generation_id, "Server is shutting down — please retry")
+        self._queues.clear()
+
+        tasks = list(self._running.values())
+        if not tasks:
+            return
+
+        logger.info(f"Draining {len(tasks)} running generation(s) (timeout {timeout}s)")
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} generation(s) still running at shutdown")
+            await asyncio.gather(*pending, return_exceptions=True)
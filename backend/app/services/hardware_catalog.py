@@ -0,0 +1,200 @@
+"""Packaged GPU/CPU catalog with normalized-name lookup.
+
+app/data/hardware_catalog.json lists known GPUs (VRAM, architecture, year
+and a relative performance index, RTX 4090 = 100) and CPUs (cores, threads,
+high-performance flag). Supporting a new card is a data change: add a line
+and bump `version`.
+
+Names are normalized (lowercased, vendor and trademark noise removed,
+"RTX4070Ti" spaced out, Intel F suffixes dropped) and indexed in a dict. A lookup tries, in order:
+the whole normalized name; every run of up to five consecutive words in it,
+longest first, so "NVIDIA GeForce RTX 3070 Laptop GPU" finds "rtx 3070";
+and, only if asked, a close difflib match for typos.
+
+GPUs also belong to a series ("rtx 40xx", "rx 6xxx", "arc axxx") found from
+the model number. A card missing from the catalog is estimated from the
+nearest catalogued model of its series, and each series carries the
+`score_floor` tier classification gave its generation before the catalog
+existed, so scoring by performance never ranks a card below its generation.
+"""
+
+import difflib
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CATALOG_PATH = Path(__file__).resolve().parent.parent / "data" / "hardware_catalog.json"
+
+_NOISE_RE = re.compile(r"\((?:r|tm)\)|[®™]|\b(?:nvidia|geforce|amd|ati|intel|radeon)\b")
+_SERIES_RE = re.compile(r"\b(rtx|gtx|rx)(?=\d)")
+_SUFFIX_RE = re.compile(r"(?<=\d)(ti|super|xtx|xt|gre)\b")
+# Intel's F suffix only drops the iGPU: "i7-13700KF" is looked up as "13700k"
+_INTEL_F_RE = re.compile(r"\b(\d{3,5}k?)f\b")
+_NON_WORD_RE = re.compile(r"[^a-z0-9]+")
+# Series prefix and model number of a normalized GPU name: "rx 6400" → ("rx ", "6400")
+_GPU_MODEL_RE = re.compile(r"\b((?:rtx|gtx|rx) |arc [ab])(\d{3,4})(?!\d)")
+
+_MAX_KEY_WORDS = 5
+_FUZZY_CUTOFF = 0.9
+
+
+def normalize_hardware_name(name: str) -> str:
+    """Canonical lookup form: "NVIDIA GeForce RTX4070Ti" → "rtx 4070 ti"."""
+    text = _NOISE_RE.sub(" ", name.lower())
+    text = _SERIES_RE.sub(r"\1 ", text)
+    text = _SUFFIX_RE.sub(r" \1", text)
+    text = _INTEL_F_RE.sub(r"\1", text)
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+@dataclass(frozen=True)
+class GpuModel:
+    name: str
+    vram_mb: int
+    architecture: str
+    year: int
+    perf: float
+
+
+@dataclass(frozen=True)
+class GpuSeries:
+    name: str
+    architecture: str
+    score_floor: int
+
+
+@dataclass(frozen=True)
+class CpuModel:
+    name: str
+    cores: int
+    threads: int
+    high_perf: bool = False
+
+
+class _Index:
+    """Normalized name → entry, with word-window and fuzzy fallbacks."""
+
+    def __init__(self, entries: dict):
+        self._entries = entries
+        self._keys = list(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, name: str | None, fuzzy: bool):
+        if not name:
+            return None
+        normalized = normalize_hardware_name(name)
+        entry = self._entries.get(normalized)
+        if entry is not None:
+            return entry
+
+        words = normalized.split()
+        for size in range(min(_MAX_KEY_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                entry = self._entries.get(" ".join(words[start:start + size]))
+                if entry is not None:
+                    return entry
+
+        if fuzzy:
+            close = difflib.get_close_matches(normalized, self._keys, n=1, cutoff=_FUZZY_CUTOFF)
+            if close:
+                return self._entries[close[0]]
+        return None
+
+
+def _series_keys(normalized: str) -> tuple[list[str], int] | None:
+    """Candidate series names, most specific first, and the model number.
+
+    "rx 6400" → (["rx 640x", "rx 64xx", "rx 6xxx", "rx xxxx"], 6400).
+    """
+    match = _GPU_MODEL_RE.search(normalized)
+    if match is None:
+        return None
+    prefix, digits = match.groups()
+    keys = [prefix + digits[:-n] + "x" * n for n in range(1, len(digits))]
+    return keys + [prefix + "x" * len(digits)], int(digits)
+
+
+class HardwareCatalog:
+    """Singleton in-memory index of the packaged hardware catalog."""
+
+    _instance: "HardwareCatalog | None" = None
+
+    def __init__(self, data: dict):
+        self.version: str = data["version"]
+        self._gpus = _Index({
+            normalize_hardware_name(g["name"]): GpuModel(**g) for g in data["gpus"]
+        })
+        self._cpus = _Index({
+            normalize_hardware_name(c["name"]): CpuModel(**c) for c in data["cpus"]
+        })
+        self._series = {s["name"]: GpuSeries(**s) for s in data["gpu_series"]}
+        # Series name → (model number, model) of its catalogued cards
+        self._series_gpus: dict[str, list[tuple[int, GpuModel]]] = {}
+        for gpu in data["gpus"]:
+            found = self._find_series(normalize_hardware_name(gpu["name"]))
+            if found is not None:
+                series, number = found
+                self._series_gpus.setdefault(series.name, []).append(
+                    (number, GpuModel(**gpu))
+                )
+
+    def _find_series(self, normalized: str) -> tuple[GpuSeries, int] | None:
+        candidates = _series_keys(normalized)
+        if candidates is None:
+            return None
+        keys, number = candidates
+        for key in keys:
+            series = self._series.get(key)
+            if series is not None:
+                return series, number
+        return None
+
+    @classmethod
+    def get_instance(cls) -> "HardwareCatalog":
+        if cls._instance is None:
+            cls._instance = cls.from_file(CATALOG_PATH)
+            logger.info(
+                "Hardware catalog %s: %d GPUs, %d CPUs",
+                cls._instance.version, len(cls._instance._gpus), len(cls._instance._cpus),
+            )
+        return cls._instance
+
+    @classmethod
+    def from_file(cls, path: Path) -> "HardwareCatalog":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def lookup_gpu(self, name: str | None, fuzzy: bool = True) -> GpuModel | None:
+        return self._gpus.lookup(name, fuzzy)
+
+    def lookup_gpu_series(self, name: str | None) -> GpuSeries | None:
+        if not name:
+            return None
+        found = self._find_series(normalize_hardware_name(name))
+        return found[0] if found else None
+
+    def estimate_gpu(self, name: str | None) -> GpuModel | None:
+        """The catalog entry for `name`, else the nearest model of its series.
+
+        Nearest is by model number; between equally near models the slower
+        one is used, so an estimate never flatters an uncatalogued card.
+        """
+        model = self.lookup_gpu(name)
+        if model is not None or not name:
+            return model
+        found = self._find_series(normalize_hardware_name(name))
+        if found is None:
+            return None
+        series, number = found
+        models = self._series_gpus.get(series.name)
+        if not models:
+            return None
+        return min(models, key=lambda item: (abs(item[0] - number), item[1].perf))[1]
+
+    def lookup_cpu(self, name: str | None, fuzzy: bool = True) -> CpuModel | None:
+        return self._cpus.lookup(name, fuzzy)
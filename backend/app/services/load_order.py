@@ -0,0 +1,215 @@
+"""Deterministic load order for generated modlists.
+
+The load_order values the LLM passes to add_to_modlist/add_patch collide
+across phases, so once generation finishes every mod and patch is ordered
+here instead:
+
+- Hard constraints are "loads before" edges: each mod a patch names in
+  patches_mods comes before the patch, and seeded "requires"/"load_after"
+  rules put a mod after the one it depends on.
+- Everything else follows the game's load-order category sequence from the
+  knowledge files (knowledge.load_order_categories). A mod's category comes
+  from the example mods listed in the sequence, matched on whole words with
+  digits trailing a word ignored, so "SKSE64" matches "SKSE". A mod with no
+  example match takes its phase's rank: the category the phase name points
+  to, else the latest category among the matched mods of that phase (the
+  unknown mods load after the recognized ones), else the previous phase's
+  rank.
+- Ties keep generation order: phase, then the LLM's load_order, then the
+  order the mods were added.
+
+Kahn's algorithm with a heap keyed on that order is a stable topological
+sort in O((V + E) log V). A cycle (two rules contradicting each other, or a
+patch listed as patching its own patch) doesn't fail the sort: the
+first-ranked mod on the cycle is placed anyway and the cycle is reported
+starting from it.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from app.knowledge import LoadOrderCategory
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_TRAILING_DIGITS_RE = re.compile(r"(?<=[a-z])\d+$")
+_STOP_WORDS = frozenset({"a", "and", "of", "the"})
+
+
+def normalize_mod_name(name: str) -> str:
+    """Matching key for mod names: "SkyUI - SE" and "skyui se" are the same mod."""
+    return " ".join(_NON_ALNUM_RE.sub(" ", name.casefold()).split())
+
+
+def _match_key(name: str) -> str:
+    """Padded name for example matching, digits trailing a word dropped.
+
+    "SKSE64" and "SkyUI5" become " skse " and " skyui "; standalone numbers
+    such as the "2020" in "Skyrim 2020" are kept.
+    """
+    words = (_TRAILING_DIGITS_RE.sub("", word) for word in normalize_mod_name(name).split())
+    return f" {' '.join(words)} "
+
+
+def _words(text: str) -> set[str]:
+    """Content words, crudely singularized: "Textures & Meshes" → {"texture", "meshe"}."""
+    return {
+        word.removesuffix("s") for word in normalize_mod_name(text).split()
+        if word not in _STOP_WORDS
+    }
+
+
+@dataclass
+class LoadOrderResult:
+    """Entries in their final load order, and any cycles that had to be broken."""
+    entries: list[dict]
+    cycles: list[list[str]] = field(default_factory=list)
+
+
+class _CategoryMatcher:
+    """Ranks mod and phase names against a load-order category sequence."""
+
+    def __init__(self, categories: Iterable[LoadOrderCategory]):
+        categories = sorted(categories, key=lambda c: c.rank)
+        self._examples = [
+            (key, category.rank)
+            for category in categories
+            for example in category.examples
+            if (key := _match_key(example)).strip()
+        ]
+        self._words = [(category.rank, _words(category.name)) for category in categories]
+
+    def by_mod_name(self, name: str) -> int | None:
+        """Rank of the first category naming this mod among its examples."""
+        key = _match_key(name)
+        return next((rank for example, rank in self._examples if example in key), None)
+
+    def by_phase_name(self, name: str) -> int | None:
+        """Rank of the category sharing the most words with a phase name."""
+        words = _words(name)
+        best_rank, best_overlap = None, 0
+        for rank, category_words in self._words:
+            overlap = len(words & category_words)
+            if overlap > best_overlap:
+                best_rank, best_overlap = rank, overlap
+        return best_rank
+
+
+def _cycle_through(start: int, predecessors: list[list[int]], placed: list[bool]) -> list[int]:
+    """A cycle of unplaced entries upstream of `start`, in load direction.
+
+    Only called once no entry is free, so every unplaced entry still has an
+    unplaced predecessor and walking back from `start` must revisit one.
+    """
+    path: list[int] = []
+    seen: dict[int, int] = {}
+    node = start
+    while node not in seen:
+        seen[node] = len(path)
+        path.append(node)
+        node = next(p for p in predecessors[node] if not placed[p])
+    return path[seen[node]:][::-1]
+
+
+def solve_load_order(
+    entries: list[dict],
+    load_after: Iterable[tuple[int, int]] = (),
+    categories: Iterable[LoadOrderCategory] = (),
+    phase_names: dict[int, str] | None = None,
+) -> LoadOrderResult:
+    """Order generated entries and renumber their load_order from 1.
+
+    Args:
+        entries: Mod and patch dicts as built by the generation tools
+            ("name", "nexus_mod_id", "phase", "load_order", "patches_mods")
+        load_after: (earlier, later) Nexus mod ID pairs from compatibility rules
+        categories: The game's load-order category sequence
+        phase_names: Build phase number → name, for entries tagged with a phase
+    """
+    phase_names = phase_names or {}
+    count = len(entries)
+    matcher = _CategoryMatcher(categories)
+
+    # Generation order: phase, then the LLM's load_order, then insertion
+    phase_position = {number: i for i, number in enumerate(sorted(phase_names))}
+    generation_order = sorted(range(count), key=lambda i: (
+        phase_position.get(entries[i].get("phase"), len(phase_position)),
+        entries[i]["load_order"] if entries[i].get("load_order") is not None else float("inf"),
+        i,
+    ))
+
+    # Entries grouped by phase, phases in build order (untagged entries last)
+    name_ranks = [matcher.by_mod_name(entry["name"]) for entry in entries]
+    phases: dict[int | None, list[int]] = {}
+    for i in generation_order:
+        phases.setdefault(entries[i].get("phase"), []).append(i)
+
+    phase_rank: dict[int | None, int] = {}
+    rank = 0
+    for phase, members in phases.items():
+        matched = [name_ranks[i] for i in members if name_ranks[i] is not None]
+        named = matcher.by_phase_name(phase_names[phase]) if phase in phase_names else None
+        if named is not None:
+            rank = named
+        elif matched:
+            rank = max(matched)
+        phase_rank[phase] = rank
+
+    key: list[tuple[int, int]] = [(0, 0)] * count
+    for position, i in enumerate(generation_order):
+        own = name_ranks[i]
+        key[i] = (own if own is not None else phase_rank[entries[i].get("phase")], position)
+
+    by_nexus_id: dict[int, int] = {}
+    by_name: dict[str, int] = {}
+    for i, entry in enumerate(entries):
+        if entry.get("nexus_mod_id") is not None:
+            by_nexus_id.setdefault(entry["nexus_mod_id"], i)
+        by_name.setdefault(normalize_mod_name(entry["name"]), i)
+
+    successors: list[set[int]] = [set() for _ in range(count)]
+
+    def add_edge(before: int | None, after: int | None) -> None:
+        if before is not None and after is not None and before != after:
+            successors[before].add(after)
+
+    for i, entry in enumerate(entries):
+        for patched in entry.get("patches_mods") or ():
+            add_edge(by_name.get(normalize_mod_name(patched)), i)
+    for earlier, later in load_after:
+        add_edge(by_nexus_id.get(earlier), by_nexus_id.get(later))
+
+    indegree = [0] * count
+    predecessors: list[list[int]] = [[] for _ in range(count)]
+    for i, after in enumerate(successors):
+        for j in after:
+            indegree[j] += 1
+            predecessors[j].append(i)
+
+    heap = [(key[i], i) for i in range(count) if indegree[i] == 0]
+    heapq.heapify(heap)
+    placed = [False] * count
+    order: list[int] = []
+    cycles: list[list[str]] = []
+    while len(order) < count:
+        if not heap:
+            stuck = min((i for i in range(count) if not placed[i]), key=key.__getitem__)
+            cycle = _cycle_through(stuck, predecessors, placed)
+            release = min(cycle, key=key.__getitem__)
+            start = cycle.index(release)
+            cycles.append([entries[i]["name"] for i in cycle[start:] + cycle[:start]])
+            indegree[release] = 0
+            heap.append((key[release], release))
+        _, i = heapq.heappop(heap)
+        placed[i] = True
+        order.append(i)
+        for j in successors[i]:
+            indegree[j] -= 1
+            if indegree[j] == 0:
+                heapq.heappush(heap, (key[j], j))
+
+    ordered = [entries[i] for i in order]
+    for position, entry in enumerate(ordered, start=1):
+        entry["load_order"] = position
+    return LoadOrderResult(entries=ordered, cycles=cycles)
@@ -0,0 +1,78 @@
+"""Upsert of Nexus mods discovered during generation into the `mods` table.
+
+Generated entries used to store only denormalized name/author/summary with
+a null `mod_id`, so the same popular mod was duplicated across thousands of
+modlists and couldn't be joined. Saving a modlist now upserts each Nexus
+mod on (nexus_game_domain, nexus_mod_id) and links the entry to it.
+
+Existing rows are never overwritten: seeded mods carry curated metadata
+(category, performance impact, version support) that an LLM-written
+summary shouldn't replace.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.mod import Mod
+
+# Dialects with INSERT ... ON CONFLICT support
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _mod_row(game_domain: str, mod_data: dict) -> dict:
+    nexus_id = mod_data["nexus_mod_id"]
+    author = mod_data.get("author") or None
+    return {
+        "nexus_mod_id": nexus_id,
+        "nexus_game_domain": game_domain,
+        "name": (mod_data.get("name") or "Unknown")[:255],
+        "author": author[:100] if author else None,
+        "summary": mod_data.get("summary") or None,
+        "source": "nexus",
+        "external_url": f"https://www.nexusmods.com/{game_domain}/mods/{nexus_id}",
+    }
+
+
+async def upsert_nexus_mods(
+    db: AsyncSession, game_domain: str, mods: list[dict],
+) -> dict[int, int]:
+    """Ensure every Nexus mod in `mods` has a `mods` row.
+
+    `mods` are generated entry dicts; those without a `nexus_mod_id` are
+    ignored. Returns a nexus_mod_id → mods.id map covering all of them.
+    Does not commit.
+    """
+    rows: dict[int, dict] = {}
+    for mod_data in mods:
+        if mod_data.get("nexus_mod_id") is not None:
+            rows.setdefault(mod_data["nexus_mod_id"], _mod_row(game_domain, mod_data))
+    if not rows:
+        return {}
+
+    insert = _UPSERT_INSERTS[db.get_bind().dialect.name]
+    await db.execute(
+        insert(Mod).on_conflict_do_nothing(
+            index_elements=["nexus_game_domain", "nexus_mod_id"],
+        ),
+        list(rows.values()),
+    )
+    result = await db.execute(
+        select(Mod.nexus_mod_id, Mod.id).where(
+            Mod.nexus_game_domain == game_domain,
+            Mod.nexus_mod_id.in_(rows),
+        )
+    )
+    return dict(result.all())
+
+
+async def link_entry_rows(
+    db: AsyncSession, game_domain: str, entry_rows: list[dict],
+) -> None:
+    """Set `mod_id` on ModlistEntry rows, upserting their mods first."""
+    unlinked = [r for r in entry_rows if r["mod_id"] is None and r["nexus_mod_id"] is not None]
+    if not unlinked:
+        return
+    ids = await upsert_nexus_mods(db, game_domain, unlinked)
+    for row in unlinked:
+        row["mod_id"] = ids.get(row["nexus_mod_id"])
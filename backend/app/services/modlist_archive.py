@@ -0,0 +1,103 @@
+"""Archival of old anonymous modlists into compressed blobs.
+
+Modlists from the legacy unauthenticated /generate endpoint (user_id null)
+are never listed or deleted by anyone, yet their entries and flags sit in
+the hot tables and indexes forever. archive_modlists() moves those older
+than `modlist_archive_after_days` into modlist_archives as one
+zlib-compressed JSON document each, and load_archived() lets reads fall
+back to it transparently.
+"""
+
+import logging
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.models.modlist_archive import ModlistArchive
+from app.schemas.modlist import ModlistResponse
+from app.serialization import dumpb, loads
+
+logger = logging.getLogger(__name__)
+
+
+def _to_response(modlist: Modlist) -> ModlistResponse:
+    """The modlist exactly as GET /api/modlist/{id} serves it."""
+    # Imported here: the API module imports load_archived from this one
+    from app.api.modlist import _entry_to_schema, _flag_to_schema
+
+    return ModlistResponse(
+        id=modlist.id,
+        game_id=modlist.game_id,
+        playstyle_id=modlist.playstyle_id,
+        entries=[_entry_to_schema(e) for e in modlist.entries],
+        llm_provider=modlist.llm_provider,
+        user_knowledge_flags=[_flag_to_schema(f) for f in modlist.knowledge_flags],
+        used_fallback=modlist.llm_provider == "fallback",
+    )
+
+
+def _compress(response: ModlistResponse) -> bytes:
+    return zlib.compress(dumpb(response.model_dump(mode="json")))
+
+
+def _decompress(payload: bytes) -> ModlistResponse:
+    return ModlistResponse.model_validate(loads(zlib.decompress(payload)))
+
+
+async def load_archived(db: AsyncSession, modlist_id: uuid.UUID) -> ModlistResponse | None:
+    """The archived copy of a modlist, or None if it was never archived."""
+    archive = await db.get(ModlistArchive, modlist_id)
+    return _decompress(archive.payload) if archive else None
+
+
+async def archive_modlists(
+    db: AsyncSession,
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+) -> int:
+    """Move one batch of old anonymous modlists to the archive.
+
+    Returns the number archived; call repeatedly until it returns 0. The
+    archive rows are written and the originals deleted in one transaction.
+    """
+    settings = get_settings()
+    days = older_than_days if older_than_days is not None else settings.modlist_archive_after_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    result = await db.execute(
+        select(Modlist)
+        .where(Modlist.user_id.is_(None), Modlist.created_at < cutoff)
+        .order_by(Modlist.created_at)
+        .limit(batch_size or settings.modlist_archive_batch_size)
+        .options(selectinload(Modlist.entries), selectinload(Modlist.knowledge_flags))
+    )
+    modlists = result.scalars().all()
+    if not modlists:
+        return 0
+
+    await db.execute(insert(ModlistArchive), [
+        {
+            "id": ml.id,
+            "game_id": ml.game_id,
+            "playstyle_id": ml.playstyle_id,
+            "llm_provider": ml.llm_provider,
+            "entry_count": len(ml.entries),
+            "payload": _compress(_to_response(ml)),
+            "created_at": ml.created_at,
+        }
+        for ml in modlists
+    ])
+
+    ids = [ml.id for ml in modlists]
+    await db.execute(delete(ModlistKnowledgeFlag).where(ModlistKnowledgeFlag.modlist_id.in_(ids)))
+    await db.execute(delete(ModlistEntry).where(ModlistEntry.modlist_id.in_(ids)))
+    await db.execute(delete(Modlist).where(Modlist.id.in_(ids)))
+    await db.commit()
+    db.expunge_all()
+    return len(ids)
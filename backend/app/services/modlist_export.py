@@ -0,0 +1,209 @@
+"""Materialized MO2 export payloads.
+
+Modlists don't change after generation, so the export served to the MO2
+plugin is built once and stored on the Modlist row together with its ETag.
+Primary Nexus file IDs are resolved once and persisted on
+ModlistEntry.nexus_file_id; Modlist.export_refreshed_at records when that
+last happened. When a caller supplies a Nexus key and the last resolution
+is older than `export_refresh_interval_hours`, it is re-run in the
+background so newer primary files, and IDs Nexus failed to return, are
+picked up. At most one refresh per modlist runs at a time.
+
+Archived modlists (services/modlist_archive.py) have no row to store a
+payload on; their export is rebuilt from the archived document, with the
+file IDs the entries had when they were archived.
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app.api.http_cache import compute_etag
+from app.config import get_settings
+from app.database import async_session
+from app.models.game import Game
+from app.models.modlist import Modlist, ModlistEntry
+from app.schemas.modlist import ExportModEntry, ModlistExportResponse, ModlistResponse
+from app.services.nexus_client import NexusModsClient
+
+logger = logging.getLogger(__name__)
+
+# Modlists with a background refresh in flight
+_refreshing: set[uuid.UUID] = set()
+
+
+async def _resolve_primary_file_ids(
+    game_domain: str, nexus_mod_ids: list[int], nexus_api_key: str,
+) -> dict[int, int | None]:
+    """Look up the primary file of each mod on Nexus."""
+    async with NexusModsClient(nexus_api_key) as client:
+
+        async def resolve(nexus_mod_id: int) -> tuple[int, int | None]:
+            try:
+                files = await client.get_mod_files(game_domain, nexus_mod_id)
+                if files:
+                    primary = next((f for f in files if f.get("isPrimary")), files[0])
+                    return nexus_mod_id, primary.get("fileId")
+            except Exception:
+                logger.warning(f"Failed to resolve file_id for mod {nexus_mod_id}")
+            return nexus_mod_id, None
+
+        results = await asyncio.gather(*(resolve(mid) for mid in nexus_mod_ids))
+    return dict(results)
+
+
+def _missing_file_ids(payload: dict) -> bool:
+    return any(e["nexus_mod_id"] and e["file_id"] is None for e in payload["entries"])
+
+
+def export_is_stale(modlist: Modlist) -> bool:
+    interval = timedelta(hours=get_settings().export_refresh_interval_hours)
+    refreshed_at = modlist.export_refreshed_at
+    return refreshed_at is None or datetime.utcnow() - refreshed_at > interval
+
+
+async def load_modlist_for_export(db: AsyncSession, modlist_id: uuid.UUID) -> Modlist | None:
+    return await db.get(
+        Modlist, modlist_id,
+        options=[undefer(Modlist.export_payload)],
+        populate_existing=True,
+    )
+
+
+def _export_payload(modlist_id: uuid.UUID, game: Game, entries: list[ExportModEntry]) -> dict:
+    return ModlistExportResponse(
+        id=modlist_id,
+        game_domain=game.nexus_domain,
+        game_name=game.name,
+        mod_count=len(entries),
+        entries=entries,
+    ).model_dump(mode="json")
+
+
+async def archived_export(db: AsyncSession, archived: ModlistResponse) -> tuple[dict, str]:
+    """Export payload and ETag for an archived modlist.
+
+    Read-only: nothing is resolved against Nexus or persisted.
+    Raises ValueError if the modlist's game no longer exists.
+    """
+    game = await db.get(Game, archived.game_id)
+    if not game:
+        raise ValueError("Game not found")
+    payload = _export_payload(archived.id, game, [
+        ExportModEntry(
+            nexus_mod_id=e.nexus_mod_id,
+            file_id=e.nexus_file_id,
+            name=e.name,
+            author=e.author,
+            load_order=e.load_order,
+            is_patch=e.is_patch,
+            patches_mods=e.patches_mods,
+        )
+        for e in archived.entries
+    ])
+    return payload, compute_etag(payload)
+
+
+async def materialize_export(
+    db: AsyncSession,
+    modlist: Modlist,
+    nexus_api_key: str | None = None,
+    refresh: bool = False,
+) -> tuple[dict, str]:
+    """Build the export payload, persist it on the modlist and return it with its ETag.
+
+    Only entries without a stored file ID are resolved, unless `refresh`
+    is set, in which case every entry is re-checked against Nexus.
+    export_refreshed_at is only advanced when a key was supplied, so it
+    marks the last resolution attempt rather than the last rebuild.
+    Raises ValueError if the modlist's game no longer exists.
+    """
+    game = await db.get(Game, modlist.game_id)
+    if not game:
+        raise ValueError("Game not found")
+
+    entry_result = await db.execute(
+        select(ModlistEntry)
+        .where(ModlistEntry.modlist_id == modlist.id)
+        .order_by(ModlistEntry.load_order, ModlistEntry.id)
+    )
+    db_entries = entry_result.scalars().all()
+
+    if nexus_api_key:
+        targets = [
+            e for e in db_entries
+            if e.nexus_mod_id and (refresh or e.nexus_file_id is None)
+        ]
+        if targets:
+            resolved = await _resolve_primary_file_ids(
+                game.nexus_domain, [e.nexus_mod_id for e in targets], nexus_api_key,
+            )
+            for e in targets:
+                file_id = resolved.get(e.nexus_mod_id)
+                if file_id:
+                    e.nexus_file_id = file_id
+
+    payload = _export_payload(modlist.id, game, [
+        ExportModEntry(
+            nexus_mod_id=e.nexus_mod_id,
+            file_id=e.nexus_file_id,
+            name=e.name or "Unknown",
+            author=e.author,
+            load_order=e.load_order,
+            is_patch=e.is_patch,
+            patches_mods=e.patches_mods,
+        )
+        for e in db_entries
+    ])
+    etag = compute_etag(payload)
+
+    modlist.export_payload = payload
+    modlist.export_etag = etag
+    if nexus_api_key:
+        modlist.export_refreshed_at = datetime.utcnow()
+    await db.commit()
+    return payload, etag
+
+
+async def get_export(
+    db: AsyncSession, modlist: Modlist, nexus_api_key: str | None = None,
+) -> tuple[dict, str]:
+    """Return the stored export, building it first if needed.
+
+    A stored payload is rebuilt in-request only when a Nexus key is
+    supplied, some entries lack a file ID and no keyed resolution has been
+    tried yet. IDs Nexus couldn't return are retried by the periodic
+    background refresh, not on every request.
+    """
+    payload = modlist.export_payload
+    if payload and modlist.export_etag:
+        never_resolved = nexus_api_key and modlist.export_refreshed_at is None
+        if not (never_resolved and _missing_file_ids(payload)):
+            return payload, modlist.export_etag
+    return await materialize_export(db, modlist, nexus_api_key)
+
+
+async def refresh_export(modlist_id: uuid.UUID, nexus_api_key: str) -> None:
+    """Background task: re-resolve primary files and rebuild the payload.
+
+    Returns immediately if a refresh of the same modlist is already running.
+    """
+    if modlist_id in _refreshing:
+        return
+    _refreshing.add(modlist_id)
+    try:
+        async with async_session() as db:
+            modlist = await load_modlist_for_export(db, modlist_id)
+            if not modlist:
+                return
+            _, etag = await materialize_export(db, modlist, nexus_api_key, refresh=True)
+            logger.info(f"Refreshed export for modlist {modlist_id} (etag {etag})")
+    except Exception:
+        logger.exception(f"Export refresh failed for modlist {modlist_id}")
+    finally:
+        _refreshing.discard(modlist_id)
@@ -8,14 +8,15 @@ Events are emitted through an optional callback for real-time SSE streaming.
 """
 
 import asyncio
-import json
 import logging
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Callable
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.llm.provider import LLMProvider, LLMProviderFactory
 from app.models.game import Game
@@ -25,7 +26,12 @@ from app.models.playstyle import Playstyle
 from app.models.playstyle_mod import PlaystyleMod
 from app.models.compatibility import CompatibilityRule
 from app.schemas.modlist import ModlistGenerateRequest
-from app.knowledge import get_methodology_context
+from app.serialization import dumps
+from app.knowledge import (
+    get_methodology_context, load_order_categories, lookup_methodology, methodology_source,
+    related_methodology,
+)
+from app.services.load_order import normalize_mod_name, solve_load_order
 from app.services.nexus_client import NexusModsClient, NexusAPIError
 from app.services.tier_classifier import classify_hardware_tier
 
@@ -106,6 +112,20 @@ def _emit(callback: Callable[[dict], None] | None, event_type: str, data: dict)
         callback({"type": event_type, **data})
 
 
+async def _close_clients(nexus: NexusModsClient, providers: list[LLMProvider]) -> None:
+    """Release pooled HTTP connections held by a generation.
+
+    Runs in a `finally`, so it also executes when the generation task is
+    cancelled; close errors are logged and swallowed so they never mask the
+    original outcome.
+    """
+    for close in (nexus.aclose, *(llm.close for llm in providers)):
+        try:
+            await close()
+        except Exception as e:
+            logger.debug(f"Error closing client: {e}")
+
+
 # ──────────────────────────────────────────────
 # Nexus API retry wrapper
 # ──────────────────────────────────────────────
@@ -177,6 +197,24 @@ async def _retry_nexus(
 # Tool definitions for the LLM
 # ──────────────────────────────────────────────
 
+LOOKUP_METHODOLOGY_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "lookup_methodology",
+        "description": (
+            "Search the modding methodology reference (load order, conflicts, "
+            "tools, version requirements) for guidance on a specific question."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "What you need to know (e.g. 'ESL flagging limits')"},
+            },
+            "required": ["query"],
+        },
+    },
+}
+
 PHASE1_TOOLS = [
     {
         "type": "function",
@@ -219,7 +257,13 @@ PHASE1_TOOLS = [
         "type": "function",
         "function": {
             "name": "add_to_modlist",
-            "description": "Add a mod to the modlist. Only add mods you've reviewed and believe fit the user's playstyle and hardware.",
+            "description": (
+                "Add a mod to the modlist. Only add mods you've reviewed and believe fit the user's playstyle and hardware. "
+                "The mod's real download size is checked against the storage and VRAM budgets: "
+                "a mod that doesn't fit is rejected, and every response reports the budget left. "
+                "Duplicates and mods that conflict with one already added are rejected; the response "
+                "lists missing requirements and needed patches from known compatibility rules."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -228,10 +272,16 @@ PHASE1_TOOLS = [
                     "author": {"type": "string"},
                     "summary": {"type": "string", "description": "Short summary of the mod"},
                     "reason": {"type": "string", "description": "Why this mod fits the user's playstyle"},
-                    "load_order": {"type": "integer", "description": "Position in load order"},
-                    "estimated_size_mb": {"type": "integer", "description": "Estimated download size in MB"},
+                    "load_order": {
+                        "type": "integer",
+                        "description": "Optional position hint; the final load order is computed after generation",
+                    },
+                    "estimated_size_mb": {
+                        "type": "integer",
+                        "description": "Estimated download size in MB, used only if Nexus doesn't report the file size",
+                    },
                 },
-                "required": ["mod_id", "name", "reason", "load_order"],
+                "required": ["mod_id", "name", "reason"],
             },
         },
     },
@@ -243,6 +293,7 @@ PHASE1_TOOLS = [
             "parameters": {"type": "object", "properties": {}},
         },
     },
+    LOOKUP_METHODOLOGY_TOOL,
 ]
 
 PHASE2_TOOLS = [
@@ -281,7 +332,10 @@ PHASE2_TOOLS = [
         "type": "function",
         "function": {
             "name": "add_patch",
-            "description": "Add a compatibility patch mod to the modlist.",
+            "description": (
+                "Add a compatibility patch mod to the modlist. Its download size counts against "
+                "the storage budget; a patch that doesn't fit is rejected."
+            ),
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -291,12 +345,16 @@ PHASE2_TOOLS = [
                     "patches_mods": {
                         "type": "array",
                         "items": {"type": "string"},
-                        "description": "Names of the mods this patches",
+                        "description": "Exact modlist names of the mods this patches; it is loaded after them",
                     },
                     "reason": {"type": "string"},
-                    "load_order": {"type": "integer"},
+                    "load_order": {"type": "integer", "description": "Optional position hint"},
+                    "estimated_size_mb": {
+                        "type": "integer",
+                        "description": "Estimated download size in MB, used only if Nexus doesn't report the file size",
+                    },
                 },
-                "required": ["mod_id", "name", "patches_mods", "reason", "load_order"],
+                "required": ["mod_id", "name", "patches_mods", "reason"],
             },
         },
     },
@@ -331,6 +389,7 @@ PHASE2_TOOLS = [
             "parameters": {"type": "object", "properties": {}},
         },
     },
+    LOOKUP_METHODOLOGY_TOOL,
 ]
 
 
@@ -338,6 +397,121 @@ PHASE2_TOOLS = [
 # Session state for tool handlers
 # ──────────────────────────────────────────────
 
+_MB = 1024 * 1024
+# Below this share of a budget left, add_to_modlist warns the LLM
+_BUDGET_WARN_FRACTION = 0.10
+
+
+@dataclass
+class ModBudget:
+    """Running disk and VRAM use of the mods added so far, against the user's limits.
+
+    Disk use is the total size of each mod's and patch's primary Nexus
+    file. VRAM use is the largest requirement among the mods added, not the
+    sum: Mod.vram_requirement_mb is the VRAM a mod needs to run (a texture
+    pack's working set), and those needs overlap rather than stack. Only
+    mods whose requirement is known from the curated catalogue count
+    (keyed here by Nexus mod ID). A limit of None means unlimited.
+    """
+    storage_limit_mb: float | None = None
+    vram_limit_mb: int | None = None
+    storage_used_mb: float = 0.0
+    vram_used_mb: int = 0
+    vram_requirements: dict[int, int] = field(default_factory=dict)
+
+    def exceeded_by(self, size_mb: float, vram_mb: int) -> str | None:
+        """Which budget adding a mod of this size would break, or None."""
+        if self.storage_limit_mb is not None and self.storage_used_mb + size_mb > self.storage_limit_mb:
+            return "storage"
+        if self.vram_limit_mb is not None and vram_mb > self.vram_limit_mb:
+            return "vram"
+        return None
+
+    def charge(self, size_mb: float, vram_mb: int) -> None:
+        self.storage_used_mb += size_mb
+        self.vram_used_mb = max(self.vram_used_mb, vram_mb)
+
+    def reset(self) -> None:
+        self.storage_used_mb = 0.0
+        self.vram_used_mb = 0
+
+    def remaining(self) -> dict:
+        """Used and remaining amounts, as reported to the LLM after each add."""
+        report = {
+            "storage_used_mb": round(self.storage_used_mb),
+            "vram_used_mb": self.vram_used_mb,
+        }
+        if self.storage_limit_mb is not None:
+            report["storage_remaining_mb"] = round(self.storage_limit_mb - self.storage_used_mb)
+        if self.vram_limit_mb is not None:
+            report["vram_remaining_mb"] = self.vram_limit_mb - self.vram_used_mb
+        return report
+
+    def running_low(self) -> list[str]:
+        """Budgets with less than _BUDGET_WARN_FRACTION left."""
+        low = []
+        if self.storage_limit_mb and (
+            self.storage_limit_mb - self.storage_used_mb < self.storage_limit_mb * _BUDGET_WARN_FRACTION
+        ):
+            low.append("storage")
+        if self.vram_limit_mb and (
+            self.vram_limit_mb - self.vram_used_mb < self.vram_limit_mb * _BUDGET_WARN_FRACTION
+        ):
+            low.append("vram")
+        return low
+
+
+def _primary_file(files: list[dict]) -> dict | None:
+    """The file a user would install: the one flagged primary, else the first."""
+    if not files:
+        return None
+    return next((f for f in files if f.get("isPrimary")), files[0])
+
+
+async def _download_size(
+    session: "GenerationSession",
+    mod_id: int,
+    estimated_size_mb: int,
+    event_callback: Callable[[dict], None] | None,
+) -> tuple[dict | None, float]:
+    """The primary file of a mod and its size in MB.
+
+    Uses the real size of the file the user will download, falling back to
+    the LLM's estimate when Nexus can't tell us.
+    """
+    primary = None
+    try:
+        files = await _retry_nexus(
+            lambda: session.nexus.get_mod_files(session.game_domain, mod_id),
+            event_callback=event_callback,
+        )
+        primary = _primary_file(files)
+    except Exception as e:
+        logger.warning(f"Nexus get_mod_files failed for mod {mod_id}: {e}")
+    if primary and primary.get("sizeInBytes"):
+        return primary, int(primary["sizeInBytes"]) / _MB
+    return primary, float(estimated_size_mb or 0)
+
+
+def _over_budget_response(
+    session: "GenerationSession", name: str, size_mb: float, vram_mb: int,
+) -> str | None:
+    """Rejection response if adding this mod would break a budget, else None."""
+    exceeded = session.budget.exceeded_by(size_mb, vram_mb)
+    if not exceeded:
+        return None
+    needed = f"{round(size_mb)}MB download" if exceeded == "storage" else f"{vram_mb}MB VRAM"
+    return dumps({
+        "status": "rejected",
+        "name": name,
+        "error": (
+            f"{name} needs {needed}, which exceeds the remaining {exceeded} budget. "
+            "Choose a lighter alternative or skip it."
+        ),
+        **session.budget.remaining(),
+    })
+
+
 @dataclass
 class GenerationSession:
     """Mutable state shared across tool handler calls within one generation."""
@@ -349,6 +523,42 @@ class GenerationSession:
     description_cache: dict[int, str] = field(default_factory=dict)
     finalized: bool = False
     completed_phases: list[int] = field(default_factory=list)
+    # Tool-loop history of the phase in progress, refreshed after every
+    # completed tool turn: {"phase_number", "iterations", "messages"}
+    checkpoint: dict | None = None
+    budget: ModBudget = field(default_factory=ModBudget)
+    # Seeded compatibility rules by Nexus mod ID, see _load_compatibility_index
+    compat_rules: dict[int, list[dict]] = field(default_factory=dict)
+    # Every added mod and patch by Nexus ID and by normalized name
+    _by_nexus_id: dict[int, dict] = field(default_factory=dict, init=False, repr=False)
+    _by_name: dict[str, dict] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for entry in self.modlist + self.patches:
+            self._index(entry)
+
+    def _index(self, entry: dict) -> None:
+        if entry.get("nexus_mod_id") is not None:
+            self._by_nexus_id[entry["nexus_mod_id"]] = entry
+        self._by_name[normalize_mod_name(entry["name"])] = entry
+
+    def find_entry(self, nexus_mod_id: int | None = None, name: str | None = None) -> dict | None:
+        """The mod or patch already added with this Nexus ID or name, if any."""
+        if nexus_mod_id is not None and nexus_mod_id in self._by_nexus_id:
+            return self._by_nexus_id[nexus_mod_id]
+        if name:
+            return self._by_name.get(normalize_mod_name(name))
+        return None
+
+    def add_entry(self, entry: dict) -> None:
+        (self.patches if entry.get("is_patch") else self.modlist).append(entry)
+        self._index(entry)
+
+    def clear_entries(self) -> None:
+        self.modlist.clear()
+        self.patches.clear()
+        self._by_nexus_id.clear()
+        self._by_name.clear()
 
     def to_snapshot(self) -> dict:
         """Serialize session state for pause/resume."""
@@ -359,6 +569,11 @@ class GenerationSession:
             "knowledge_flags": list(self.knowledge_flags),
             "description_cache": {str(k): v for k, v in self.description_cache.items()},
             "completed_phases": list(self.completed_phases),
+            "checkpoint": self.checkpoint,
+            "budget_used": {
+                "storage_mb": self.budget.storage_used_mb,
+                "vram_mb": self.budget.vram_used_mb,
+            },
         }
 
     @classmethod
@@ -372,9 +587,34 @@ class GenerationSession:
             knowledge_flags=snapshot.get("knowledge_flags", []),
             description_cache={int(k): v for k, v in snapshot.get("description_cache", {}).items()},
             completed_phases=snapshot.get("completed_phases", []),
+            checkpoint=snapshot.get("checkpoint"),
         )
+        used = snapshot.get("budget_used") or {}
+        session.budget.charge(used.get("storage_mb", 0.0), used.get("vram_mb", 0))
         return session
 
+    def save_checkpoint(self, phase_number: int, messages: list[dict]) -> None:
+        """Record the tool-loop history after a completed tool turn."""
+        self.checkpoint = {
+            "phase_number": phase_number,
+            "iterations": sum(1 for m in messages if m["role"] == "assistant"),
+            "messages": messages,
+        }
+
+
+@dataclass
+class GenerationControl:
+    """Client-issued control flags, checked by the pipeline between phases.
+
+    Set through the WebSocket control channel while a generation runs.
+    `can_pause` is kept up to date by the pipeline: it is False while the
+    current phase is the last one, or for the legacy pipeline, which has no
+    phase boundary to pause at.
+    """
+    pause_after_phase: bool = False
+    skip_phases: set[int] = field(default_factory=set)
+    can_pause: bool = True
+
 
 def _strip_html(html: str) -> str:
     """Strip HTML tags, keeping text content."""
@@ -386,13 +626,63 @@ def _strip_html(html: str) -> str:
     return text
 
 
+def _check_compatibility(session: GenerationSession, nexus_mod_id: int) -> dict:
+    """Seeded rules that bear on adding this mod, given what's already added.
+
+    Returns any of "conflicts" (conflicting mods already in the list),
+    "missing_requirements" (required mods not yet added) and
+    "patches_needed" (added mods that need a known patch with this one).
+    """
+    report: dict[str, list[dict]] = {}
+    for rule in session.compat_rules.get(nexus_mod_id, ()):
+        present = session.find_entry(rule["nexus_mod_id"]) is not None
+        if rule["rule"] == "conflicts" and present:
+            key = "conflicts"
+        elif rule["rule"] == "requires" and not present:
+            key = "missing_requirements"
+        elif rule["rule"] == "patch_available" and present and (
+            rule["patch_mod_id"] is None or session.find_entry(rule["patch_mod_id"]) is None
+        ):
+            key = "patches_needed"
+        else:
+            continue
+        item = {"mod": rule["mod"], "nexus_mod_id": rule["nexus_mod_id"], "notes": rule["notes"]}
+        if rule["patch_mod_id"] is not None:
+            item["patch_mod_id"] = rule["patch_mod_id"]
+        report.setdefault(key, []).append(item)
+    return report
+
+
+def _duplicate_response(name: str, existing: dict) -> str:
+    return dumps({
+        "status": "duplicate",
+        "name": name,
+        "error": (
+            f"{existing['name']} (Nexus ID: {existing['nexus_mod_id']}) is already in the "
+            "modlist. Do not add it again."
+        ),
+    })
+
+
 # ──────────────────────────────────────────────
 # Tool handler builders with event callbacks
 # ──────────────────────────────────────────────
 
+def _build_lookup_handler(game_slug: str | None):
+    """The lookup_methodology tool, shared by every phase."""
+
+    async def lookup(query: str) -> str:
+        results = lookup_methodology(game_slug, query)
+        return dumps({"results": results, "count": len(results)})
+
+    return lookup
+
+
 def _build_phase1_handlers(
     session: GenerationSession,
     event_callback: Callable[[dict], None] | None = None,
+    game_slug: str | None = None,
+    phase_number: int | None = None,
 ) -> dict:
     """Build tool handler functions for discovery phases (search + add mods)."""
 
@@ -405,7 +695,7 @@ def _build_phase1_handlers(
             )
         except Exception as e:
             logger.warning(f"Nexus search failed after retries: {e}")
-            return json.dumps({"error": "Search temporarily unavailable. Try a different query."})
+            return dumps({"error": "Search temporarily unavailable. Try a different query."})
 
         mods = []
         for m in results[:15]:
@@ -423,7 +713,7 @@ def _build_phase1_handlers(
             "count": len(mods),
             "sample_names": sample_names,
         })
-        return json.dumps({"results": mods, "count": len(mods)})
+        return dumps({"results": mods, "count": len(mods)})
 
     async def get_mod_details(mod_id: int) -> str:
         _emit(event_callback, "reading_mod", {"mod_id": mod_id})
@@ -434,14 +724,14 @@ def _build_phase1_handlers(
             )
         except Exception as e:
             logger.warning(f"Nexus get_mod_details failed after retries: {e}")
-            return json.dumps({"error": f"Could not fetch mod {mod_id}. Try another mod."})
+            return dumps({"error": f"Could not fetch mod {mod_id}. Try another mod."})
 
         if not details:
-            return json.dumps({"error": f"Mod {mod_id} not found"})
+            return dumps({"error": f"Mod {mod_id} not found"})
         desc_html = details.get("description") or ""
         desc_text = _strip_html(desc_html)
         session.description_cache[mod_id] = desc_text
-        return json.dumps({
+        return dumps({
             "mod_id": details["modId"],
             "name": details["name"],
             "author": details.get("author", "Unknown"),
@@ -452,35 +742,70 @@ def _build_phase1_handlers(
         })
 
     async def add_to_modlist(
-        mod_id: int, name: str, reason: str, load_order: int,
+        mod_id: int, name: str, reason: str, load_order: int | None = None,
         author: str = "", summary: str = "", estimated_size_mb: int = 0,
     ) -> str:
+        existing = session.find_entry(mod_id, name)
+        if existing:
+            return _duplicate_response(name, existing)
+        compatibility = _check_compatibility(session, mod_id)
+        if "conflicts" in compatibility:
+            return dumps({
+                "status": "rejected",
+                "name": name,
+                "error": (
+                    f"{name} conflicts with "
+                    f"{', '.join(c['mod'] for c in compatibility['conflicts'])}, already in the modlist."
+                ),
+                "conflicts": compatibility["conflicts"],
+            })
+
+        primary, size_mb = await _download_size(session, mod_id, estimated_size_mb, event_callback)
+        vram_mb = session.budget.vram_requirements.get(mod_id, 0)
+        rejected = _over_budget_response(session, name, size_mb, vram_mb)
+        if rejected:
+            return rejected
+
+        session.budget.charge(size_mb, vram_mb)
         entry = {
             "nexus_mod_id": mod_id,
+            "nexus_file_id": primary.get("fileId") if primary else None,
             "name": name,
             "author": author,
             "summary": summary,
             "reason": reason,
             "load_order": load_order,
-            "estimated_size_mb": estimated_size_mb,
+            "phase": phase_number,
+            "estimated_size_mb": round(size_mb),
             "is_patch": False,
         }
-        session.modlist.append(entry)
+        session.add_entry(entry)
         _emit(event_callback, "mod_added", {
             "mod_id": mod_id,
             "name": name,
             "reason": reason,
             "load_order": load_order,
+            "size_mb": round(size_mb),
         })
-        return json.dumps({
+        response = {
             "status": "added",
             "name": name,
             "current_count": len(session.modlist),
-        })
+            "size_mb": round(size_mb),
+            **session.budget.remaining(),
+            **compatibility,
+        }
+        low = session.budget.running_low()
+        if low:
+            response["warning"] = (
+                f"Less than {_BUDGET_WARN_FRACTION:.0%} of the {' and '.join(low)} budget left; "
+                "prefer small mods from here on."
+            )
+        return dumps(response)
 
     async def finalize() -> str:
         session.finalized = True
-        return json.dumps({
+        return dumps({
             "status": "finalized",
             "total_mods": len(session.modlist),
         })
@@ -490,19 +815,22 @@ def _build_phase1_handlers(
         "get_mod_details": get_mod_details,
         "add_to_modlist": add_to_modlist,
         "finalize": finalize,
+        "lookup_methodology": _build_lookup_handler(game_slug),
     }
 
 
 def _build_phase2_handlers(
     session: GenerationSession,
     event_callback: Callable[[dict], None] | None = None,
+    game_slug: str | None = None,
+    phase_number: int | None = None,
 ) -> dict:
     """Build tool handler functions for the compatibility patches phase."""
 
     async def get_mod_description(mod_id: int) -> str:
         _emit(event_callback, "reading_mod", {"mod_id": mod_id})
         if mod_id in session.description_cache:
-            return json.dumps({"mod_id": mod_id, "description": session.description_cache[mod_id]})
+            return dumps({"mod_id": mod_id, "description": session.description_cache[mod_id]})
         try:
             details = await _retry_nexus(
                 lambda: session.nexus.get_mod_details(session.game_domain, mod_id),
@@ -510,13 +838,13 @@ def _build_phase2_handlers(
             )
         except Exception as e:
             logger.warning(f"Nexus get_mod_details failed after retries: {e}")
-            return json.dumps({"error": f"Could not fetch mod {mod_id}"})
+            return dumps({"error": f"Could not fetch mod {mod_id}"})
 
         if not details:
-            return json.dumps({"error": f"Mod {mod_id} not found"})
+            return dumps({"error": f"Mod {mod_id} not found"})
         desc_text = _strip_html(details.get("description") or "")
         session.description_cache[mod_id] = desc_text
-        return json.dumps({"mod_id": mod_id, "description": desc_text})
+        return dumps({"mod_id": mod_id, "description": desc_text})
 
     async def search_patches(query: str) -> str:
         _emit(event_callback, "searching", {"query": query})
@@ -527,7 +855,7 @@ def _build_phase2_handlers(
             )
         except Exception as e:
             logger.warning(f"Nexus search_patches failed after retries: {e}")
-            return json.dumps({"error": "Patch search temporarily unavailable."})
+            return dumps({"error": "Patch search temporarily unavailable."})
 
         patches = []
         for m in results[:10]:
@@ -542,28 +870,48 @@ def _build_phase2_handlers(
             "count": len(patches),
             "sample_names": [p["name"] for p in patches[:5]],
         })
-        return json.dumps({"results": patches, "count": len(patches)})
+        return dumps({"results": patches, "count": len(patches)})
 
     async def add_patch(
         mod_id: int, name: str, patches_mods: list[str], reason: str,
-        load_order: int, author: str = "",
+        load_order: int | None = None, author: str = "", estimated_size_mb: int = 0,
     ) -> str:
+        existing = session.find_entry(mod_id, name)
+        if existing:
+            return _duplicate_response(name, existing)
+
+        primary, size_mb = await _download_size(session, mod_id, estimated_size_mb, event_callback)
+        vram_mb = session.budget.vram_requirements.get(mod_id, 0)
+        rejected = _over_budget_response(session, name, size_mb, vram_mb)
+        if rejected:
+            return rejected
+
+        session.budget.charge(size_mb, vram_mb)
         entry = {
             "nexus_mod_id": mod_id,
+            "nexus_file_id": primary.get("fileId") if primary else None,
             "name": name,
             "author": author,
             "reason": reason,
             "load_order": load_order,
+            "phase": phase_number,
+            "estimated_size_mb": round(size_mb),
             "is_patch": True,
             "patches_mods": patches_mods,
         }
-        session.patches.append(entry)
+        session.add_entry(entry)
         _emit(event_callback, "patch_added", {
             "mod_id": mod_id,
             "name": name,
             "patches_mods": patches_mods,
+            "size_mb": round(size_mb),
+        })
+        return dumps({
+            "status": "patch_added",
+            "name": name,
+            "size_mb": round(size_mb),
+            **session.budget.remaining(),
         })
-        return json.dumps({"status": "patch_added", "name": name})
 
     async def flag_user_knowledge(
         mod_a: str, mod_b: str, issue: str, severity: str = "warning",
@@ -581,11 +929,11 @@ def _build_phase2_handlers(
             "issue": issue,
             "severity": severity,
         })
-        return json.dumps({"status": "flagged", "mod_a": mod_a, "mod_b": mod_b})
+        return dumps({"status": "flagged", "mod_a": mod_a, "mod_b": mod_b})
 
     async def finalize_review() -> str:
         session.finalized = True
-        return json.dumps({
+        return dumps({
             "status": "review_complete",
             "patches_added": len(session.patches),
             "flags_raised": len(session.knowledge_flags),
@@ -597,6 +945,7 @@ def _build_phase2_handlers(
         "add_patch": add_patch,
         "flag_user_knowledge": flag_user_knowledge,
         "finalize_review": finalize_review,
+        "lookup_methodology": _build_lookup_handler(game_slug),
     }
 
 
@@ -624,6 +973,14 @@ def _build_phase_prompt(
             f"  {i+1}. {m['name']} (Nexus ID: {m['nexus_mod_id']})"
             for i, m in enumerate(session.modlist)
         )
+        remaining = session.budget.remaining()
+        left = [
+            f"{remaining[key]}MB {label}"
+            for key, label in (("storage_remaining_mb", "disk"), ("vram_remaining_mb", "VRAM"))
+            if key in remaining
+        ]
+        if left:
+            mods_so_far += f"\n\nBUDGET LEFT: {', '.join(left)}"
 
     playstyle_context = ""
     if phase.is_playstyle_driven:
@@ -637,6 +994,9 @@ PLAYSTYLE: {playstyle.name} (for context — this phase is not heavily playstyle
 but keep the overall experience in mind)."""
 
     methodology_context = get_methodology_context(game.slug, phase.phase_number)
+    related_context = related_methodology(
+        game.slug, f"{phase.name} {phase.description}", methodology_source(game.slug),
+    )
 
     return f"""You are an expert {game.name} mod curator working on Phase {phase.phase_number}/{total_phases}: "{phase.name}".
 
@@ -647,6 +1007,7 @@ GAME: {game.name} ({game_version or "Unknown"} edition)
 
 {playstyle_context}
 {methodology_context}
+{related_context}
 
 ── PHASE {phase.phase_number}: {phase.name} ──
 {phase.description}
@@ -667,7 +1028,8 @@ INSTRUCTIONS:
    - Performance impact relative to the user's hardware
    - Whether it actually fits this phase's purpose
 3. Add up to {phase.max_mods} mods for this phase (fewer is fine if quality is high).
-4. Set load_order based on the mod's position within this phase.
+4. Don't spend turns on load order: it is computed after generation from load-order
+   categories, requirements and patch targets.
 5. Call finalize() when you are done with this phase."""
 
 
@@ -685,11 +1047,16 @@ def _build_patch_phase_prompt(
     )
 
     methodology_context = get_methodology_context(game.slug, phase.phase_number)
+    related_context = related_methodology(
+        game.slug, f"{phase.name} compatibility patches conflict resolution",
+        methodology_source(game.slug),
+    )
 
     return f"""You are reviewing a {game.name} ({game_version or "Unknown"} edition) modlist for compatibility.
 
 This is Phase {phase.phase_number}/{total_phases}: "{phase.name}".
 {methodology_context}
+{related_context}
 
 THE MODLIST TO REVIEW:
 {modlist_summary}
@@ -703,7 +1070,8 @@ PROCESS:
 1. For each potential conflict pair, FIRST use get_mod_description to check if the
    mod page mentions patches or compatibility notes.
 2. If the description doesn't mention a patch, use search_patches to search Nexus.
-3. If you find a patch, use add_patch with correct load_order (patches load AFTER the mods they patch).
+3. If you find a patch, use add_patch, listing the exact modlist names of the mods it patches
+   in patches_mods (it is loaded after them automatically).
 4. If a patch is NEEDED but doesn't exist, use flag_user_knowledge to alert the user.
 
 IMPORTANT:
@@ -791,6 +1159,123 @@ class GenerationResult:
     llm_provider: str
 
 
+def _order_entries(
+    session: GenerationSession,
+    game_slug: str,
+    phase_names: dict[int, str],
+    event_callback: Callable[[dict], None] | None = None,
+) -> list[dict]:
+    """Every mod and patch in final load order (see services/load_order).
+
+    Cycles among the ordering constraints are raised as knowledge flags so
+    the user can check the mods involved.
+    """
+    # "requires" and "load_after" both mean: this mod loads after the other
+    load_after = [
+        (rule["nexus_mod_id"], nexus_mod_id)
+        for nexus_mod_id, rules in session.compat_rules.items()
+        for rule in rules
+        if rule["rule"] in ("requires", "load_after")
+    ]
+    result = solve_load_order(
+        session.modlist + session.patches,
+        load_after=load_after,
+        categories=load_order_categories(game_slug),
+        phase_names=phase_names,
+    )
+    for cycle in result.cycles:
+        session.knowledge_flags.append({
+            "mod_a": cycle[0],
+            "mod_b": cycle[1],
+            "issue": (
+                f"Load-order cycle: {' → '.join([*cycle, cycle[0]])}. "
+                f"{cycle[0]} was placed first; check this order manually."
+            ),
+            "severity": "warning",
+        })
+    _emit(event_callback, "load_order_resolved", {
+        "mod_count": len(result.entries),
+        "cycles": len(result.cycles),
+    })
+    return result.entries
+
+
+async def _apply_budget(
+    db: AsyncSession, session: GenerationSession, storage_budget_gb: int, vram_budget: int,
+) -> None:
+    """Set the session's budget limits and load known VRAM requirements."""
+    session.budget.storage_limit_mb = storage_budget_gb * 1024
+    session.budget.vram_limit_mb = vram_budget
+    result = await db.execute(
+        select(Mod.nexus_mod_id, Mod.vram_requirement_mb).where(
+            Mod.nexus_game_domain == session.game_domain,
+            Mod.nexus_mod_id.is_not(None),
+            Mod.vram_requirement_mb.is_not(None),
+        )
+    )
+    session.budget.vram_requirements = dict(result.all())
+
+
+async def _load_compatibility_index(db: AsyncSession, game_domain: str) -> dict[int, list[dict]]:
+    """Seeded compatibility rules of a game, by the Nexus ID they apply to.
+
+    "requires" is filed under the requiring mod and "load_after" under the
+    mod that loads later, so for both the other mod loads first.
+    "conflicts" and "patch_available" are filed under both mods.
+    """
+    mod, related, patch = aliased(Mod), aliased(Mod), aliased(Mod)
+    result = await db.execute(
+        select(
+            CompatibilityRule.rule_type, CompatibilityRule.notes,
+            mod.nexus_mod_id, mod.name, related.nexus_mod_id, related.name, patch.nexus_mod_id,
+        )
+        .join(mod, CompatibilityRule.mod_id == mod.id)
+        .join(related, CompatibilityRule.related_mod_id == related.id)
+        .outerjoin(patch, CompatibilityRule.patch_mod_id == patch.id)
+        .where(
+            mod.nexus_game_domain == game_domain,
+            mod.nexus_mod_id.is_not(None),
+            related.nexus_mod_id.is_not(None),
+        )
+    )
+    index: dict[int, list[dict]] = defaultdict(list)
+    for rule_type, notes, mod_id, mod_name, related_id, related_name, patch_id in result.all():
+        if rule_type == "requires":
+            sides = [(mod_id, related_id, related_name)]
+        elif rule_type == "load_after":
+            # The seed reads "load the related mod after this one"
+            sides = [(related_id, mod_id, mod_name)]
+        elif rule_type in ("conflicts", "patch_available"):
+            sides = [(mod_id, related_id, related_name), (related_id, mod_id, mod_name)]
+        else:
+            continue
+        for own_id, other_id, other_name in sides:
+            index[own_id].append({
+                "rule": rule_type,
+                "nexus_mod_id": other_id,
+                "mod": other_name,
+                "patch_mod_id": patch_id,
+                "notes": notes,
+            })
+    return dict(index)
+
+
+_TIER_VRAM_FRACTION = {"low": 0.60, "mid": 0.70, "high": 0.80, "ultra": 0.85}
+
+
+def generation_budgets(request: ModlistGenerateRequest, tier: str) -> tuple[int, int]:
+    """VRAM budget (MB) and storage budget (whole GB) for a request's hardware.
+
+    The VRAM budget is a tier-dependent share of the GPU's memory; the
+    storage budget leaves 20% of the free space untouched.
+    """
+    user_vram = request.vram_mb or 6144
+    vram_budget = int(user_vram * _TIER_VRAM_FRACTION.get(tier, 0.75))
+    available_storage = request.available_storage_gb or 50
+    storage_budget_gb = max(10, int(available_storage * 0.80))
+    return vram_budget, storage_budget_gb
+
+
 async def generate_modlist(
     db: AsyncSession,
     request: ModlistGenerateRequest,
@@ -798,6 +1283,7 @@ async def generate_modlist(
     nexus_api_key: str | None = None,
     resume_from_phase: int | None = None,
     resume_session: GenerationSession | None = None,
+    control: GenerationControl | None = None,
 ) -> GenerationResult:
     """Generate a modlist using the phased agentic pipeline.
 
@@ -811,13 +1297,14 @@ async def generate_modlist(
         event_callback: Optional callback for real-time event streaming
         resume_from_phase: If resuming, which phase number to start from
         resume_session: If resuming, the restored GenerationSession
+        control: Optional control flags (skip a phase, pause after the
+                 current phase) that the caller may flip while running
     """
     game = await db.get(Game, request.game_id)
     playstyle = await db.get(Playstyle, request.playstyle_id)
     if not game or not playstyle:
         raise ValueError("Invalid game or playstyle ID")
 
-    user_vram = request.vram_mb or 6144
     game_version = request.game_version
 
     # Classify hardware tier for VRAM budget
@@ -826,12 +1313,7 @@ async def generate_modlist(
         cpu=request.cpu, ram_gb=request.ram_gb,
         cpu_cores=request.cpu_cores, cpu_speed_ghz=request.cpu_speed_ghz,
     )
-
-    tier_vram_pct = {"low": 0.60, "mid": 0.70, "high": 0.80, "ultra": 0.85}
-    vram_budget = int(user_vram * tier_vram_pct.get(tier_info["tier"], 0.75))
-
-    available_storage = request.available_storage_gb or 50
-    storage_budget_gb = max(10, int(available_storage * 0.80))
+    vram_budget, storage_budget_gb = generation_budgets(request, tier_info["tier"])
 
     version_notes = _VERSION_NOTES.get(game_version or "", "No specific version selected.")
     hardware_context = _build_hardware_context(request, tier_info, vram_budget, storage_budget_gb)
@@ -846,6 +1328,8 @@ async def generate_modlist(
 
     # If no phases in DB, fall back to legacy two-phase pipeline
     if not phase_list:
+        if control:
+            control.can_pause = False
         return await _generate_legacy(db, request, event_callback, nexus_api_key=nexus_api_key)
 
     # Build ordered list of LLM providers to try
@@ -867,150 +1351,204 @@ async def generate_modlist(
     # Create or restore session
     nexus = NexusModsClient(api_key=nexus_api_key)
 
-    # Validate Nexus API key before running 9 phases of empty searches
     try:
-        nexus_user = await nexus.validate_key()
-        logger.info("Nexus API key validated: user=%s premium=%s",
-                     nexus_user.get("name"), nexus_user.get("is_premium"))
-        _emit(event_callback, "nexus_validated", {
-            "username": nexus_user.get("name", ""),
-            "is_premium": nexus_user.get("is_premium", False),
-        })
-    except Exception as e:
-        logger.error("Nexus API key validation failed: %s", e)
-        _emit(event_callback, "error", {
-            "message": f"Nexus API key is invalid or expired: {e}",
-        })
-        raise ValueError(f"Nexus API key validation failed: {e}")
-
-    if resume_session:
-        session = resume_session
-        session.nexus = nexus  # Reconnect Nexus client
-    else:
-        session = GenerationSession(game_domain=game.nexus_domain, nexus=nexus)
+        # Validate Nexus API key before running 9 phases of empty searches
+        try:
+            nexus_user = await nexus.validate_key()
+            logger.info("Nexus API key validated: user=%s premium=%s",
+                         nexus_user.get("name"), nexus_user.get("is_premium"))
+            _emit(event_callback, "nexus_validated", {
+                "username": nexus_user.get("name", ""),
+                "is_premium": nexus_user.get("is_premium", False),
+            })
+        except Exception as e:
+            logger.error("Nexus API key validation failed: %s", e)
+            _emit(event_callback, "error", {
+                "message": f"Nexus API key is invalid or expired: {e}",
+            })
+            raise ValueError(f"Nexus API key validation failed: {e}")
+
+        if resume_session:
+            session = resume_session
+            session.nexus = nexus  # Reconnect Nexus client
+        else:
+            session = GenerationSession(game_domain=game.nexus_domain, nexus=nexus)
+        await _apply_budget(db, session, storage_budget_gb, vram_budget)
+        session.compat_rules = await _load_compatibility_index(db, session.game_domain)
+
+        total_phases = len(phase_list)
+        last_successful_provider = providers_to_try[0]
+
+        # ── Phased generation loop ──
+        for phase in phase_list:
+            # Skip already-completed phases (for resume)
+            if resume_from_phase and phase.phase_number < resume_from_phase:
+                continue
 
-    total_phases = len(phase_list)
-    last_successful_provider = providers_to_try[0]
+            is_patch_phase = (phase.phase_number == phase_list[-1].phase_number)
 
-    # ── Phased generation loop ──
-    for phase in phase_list:
-        # Skip already-completed phases (for resume)
-        if resume_from_phase and phase.phase_number < resume_from_phase:
-            continue
+            if control and phase.phase_number in control.skip_phases:
+                session.completed_phases.append(phase.phase_number)
+                _emit(event_callback, "phase_skipped", {
+                    "phase": phase.name,
+                    "number": phase.phase_number,
+                    "total_phases": total_phases,
+                })
+                continue
 
-        is_patch_phase = (phase.phase_number == phase_list[-1].phase_number)
+            if control:
+                control.can_pause = not is_patch_phase
+            _emit(event_callback, "phase_start", {
+                "phase": phase.name,
+                "number": phase.phase_number,
+                "total_phases": total_phases,
+                "is_patch_phase": is_patch_phase,
+            })
 
-        _emit(event_callback, "phase_start", {
-            "phase": phase.name,
-            "number": phase.phase_number,
-            "total_phases": total_phases,
-            "is_patch_phase": is_patch_phase,
-        })
+            # Try each provider for this phase
+            phase_succeeded = False
+            provider_errors: list[str] = []
+
+            for i, llm in enumerate(providers_to_try):
+                try:
+                    session.finalized = False
+
+                    if is_patch_phase:
+                        # Final phase: compatibility patches
+                        system_prompt = _build_patch_phase_prompt(
+                            phase, game, game_version, session, total_phases,
+                        )
+                        user_msg = "Review the modlist above for compatibility patches."
+                        tools = PHASE2_TOOLS
+                        handlers = _build_phase2_handlers(
+                            session, event_callback, game.slug, phase.phase_number,
+                        )
+                    else:
+                        # Regular discovery phase
+                        system_prompt = _build_phase_prompt(
+                            phase, game, playstyle, game_version, version_notes,
+                            hardware_context, session, total_phases,
+                        )
+                        user_msg = _build_phase_user_msg(phase, playstyle, game, game_version)
+                        tools = PHASE1_TOOLS
+                        handlers = _build_phase1_handlers(
+                            session, event_callback, game.slug, phase.phase_number,
+                        )
+
+                    max_iterations = phase.max_mods + 5
+                    checkpoint = session.checkpoint
+                    if checkpoint and checkpoint["phase_number"] == phase.phase_number:
+                        # Continue from the last completed tool turn instead of
+                        # repeating every search and LLM turn of this phase
+                        messages = checkpoint["messages"]
+                        max_iterations = max(1, max_iterations - checkpoint["iterations"])
+                        _emit(event_callback, "checkpoint_restored", {
+                            "phase": phase.name,
+                            "number": phase.phase_number,
+                            "iterations": checkpoint["iterations"],
+                        })
+                    else:
+                        messages = [
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": user_msg},
+                        ]
+
+                    logger.info(
+                        f"Phase {phase.phase_number}/{total_phases}: {phase.name} "
+                        f"(provider: {llm.get_model_name()})"
+                    )
 
-        # Try each provider for this phase
-        phase_succeeded = False
-        provider_errors: list[str] = []
+                    await llm.generate_with_tools(
+                        messages=messages,
+                        tools=tools,
+                        tool_handlers=handlers,
+                        max_iterations=max_iterations,
+                        on_text=lambda text: _emit(
+                            event_callback, "thinking", {"text": text[:200]}
+                        ),
+                        on_checkpoint=lambda history, n=phase.phase_number: (
+                            session.save_checkpoint(n, history)
+                        ),
+                    )
 
-        for i, llm in enumerate(providers_to_try):
-            try:
-                session.finalized = False
+                    phase_succeeded = True
+                    last_successful_provider = llm
+                    session.completed_phases.append(phase.phase_number)
+                    session.checkpoint = None
+
+                    _emit(event_callback, "phase_complete", {
+                        "phase": phase.name,
+                        "number": phase.phase_number,
+                        "mod_count": len(session.modlist),
+                        "patch_count": len(session.patches),
+                        "storage_used_mb": round(session.budget.storage_used_mb),
+                    })
 
-                if is_patch_phase:
-                    # Final phase: compatibility patches
-                    system_prompt = _build_patch_phase_prompt(
-                        phase, game, game_version, session, total_phases,
+                    logger.info(
+                        f"Phase {phase.phase_number} complete: "
+                        f"{len(session.modlist)} mods, {len(session.patches)} patches"
                     )
-                    user_msg = "Review the modlist above for compatibility patches."
-                    tools = PHASE2_TOOLS
-                    handlers = _build_phase2_handlers(session, event_callback)
-                else:
-                    # Regular discovery phase
-                    system_prompt = _build_phase_prompt(
-                        phase, game, playstyle, game_version, version_notes,
-                        hardware_context, session, total_phases,
-                    )
-                    user_msg = _build_phase_user_msg(phase, playstyle, game, game_version)
-                    tools = PHASE1_TOOLS
-                    handlers = _build_phase1_handlers(session, event_callback)
-
-                messages = [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_msg},
-                ]
+                    break  # Phase succeeded, move to next
 
-                logger.info(
-                    f"Phase {phase.phase_number}/{total_phases}: {phase.name} "
-                    f"(provider: {llm.get_model_name()})"
-                )
+                except Exception as e:
+                    error_type, friendly = _classify_error(llm, e)
+                    logger.warning(
+                        f"Provider {llm.get_model_name()} failed on phase "
+                        f"{phase.phase_number} ({error_type}): {e}"
+                    )
+                    provider_errors.append(friendly)
 
-                await llm.generate_with_tools(
-                    messages=messages,
-                    tools=tools,
-                    tool_handlers=handlers,
-                    max_iterations=phase.max_mods + 5,
-                    on_text=lambda text: _emit(
-                        event_callback, "thinking", {"text": text[:200]}
-                    ),
-                )
+                    _emit(event_callback, "provider_error", {
+                        "provider": llm.get_model_name(),
+                        "type": error_type,
+                        "message": friendly,
+                    })
 
-                phase_succeeded = True
-                last_successful_provider = llm
-                session.completed_phases.append(phase.phase_number)
+                    # If there's a next provider, emit a switch event
+                    if i + 1 < len(providers_to_try):
+                        next_provider = providers_to_try[i + 1]
+                        _emit(event_callback, "provider_switch", {
+                            "from_provider": llm.get_model_name(),
+                            "to_provider": next_provider.get_model_name(),
+                        })
 
-                _emit(event_callback, "phase_complete", {
-                    "phase": phase.name,
-                    "number": phase.phase_number,
-                    "mod_count": len(session.modlist),
-                    "patch_count": len(session.patches),
-                })
+                    continue
 
-                logger.info(
-                    f"Phase {phase.phase_number} complete: "
-                    f"{len(session.modlist)} mods, {len(session.patches)} patches"
+            if not phase_succeeded:
+                # All providers failed for this phase → PAUSE
+                error_summary = "; ".join(provider_errors)
+                raise PauseGeneration(
+                    reason=error_summary,
+                    phase_number=phase.phase_number,
+                    phase_name=phase.name,
+                    session_snapshot=session.to_snapshot(),
                 )
-                break  # Phase succeeded, move to next
 
-            except Exception as e:
-                error_type, friendly = _classify_error(llm, e)
-                logger.warning(
-                    f"Provider {llm.get_model_name()} failed on phase "
-                    f"{phase.phase_number} ({error_type}): {e}"
+            # User asked to pause once this phase finished
+            if control and control.pause_after_phase:
+                next_phase = next(
+                    (p for p in phase_list if p.phase_number > phase.phase_number), None
                 )
-                provider_errors.append(friendly)
-
-                _emit(event_callback, "provider_error", {
-                    "provider": llm.get_model_name(),
-                    "type": error_type,
-                    "message": friendly,
-                })
-
-                # If there's a next provider, emit a switch event
-                if i + 1 < len(providers_to_try):
-                    next_provider = providers_to_try[i + 1]
-                    _emit(event_callback, "provider_switch", {
-                        "from_provider": llm.get_model_name(),
-                        "to_provider": next_provider.get_model_name(),
-                    })
-
-                continue
-
-        if not phase_succeeded:
-            # All providers failed for this phase → PAUSE
-            error_summary = "; ".join(provider_errors)
-            raise PauseGeneration(
-                reason=error_summary,
-                phase_number=phase.phase_number,
-                phase_name=phase.name,
-                session_snapshot=session.to_snapshot(),
-            )
+                if next_phase:
+                    control.pause_after_phase = False
+                    raise PauseGeneration(
+                        reason="Paused by user",
+                        phase_number=next_phase.phase_number,
+                        phase_name=next_phase.name,
+                        session_snapshot=session.to_snapshot(),
+                    )
 
-    # ── All phases complete ──
-    all_entries = session.modlist + session.patches
-    return GenerationResult(
-        entries=all_entries,
-        knowledge_flags=session.knowledge_flags,
-        llm_provider=last_successful_provider.get_model_name(),
-    )
+        # ── All phases complete ──
+        all_entries = _order_entries(
+            session, game.slug, {p.phase_number: p.name for p in phase_list}, event_callback,
+        )
+        return GenerationResult(
+            entries=all_entries,
+            knowledge_flags=session.knowledge_flags,
+            llm_provider=last_successful_provider.get_model_name(),
+        )
+    finally:
+        await _close_clients(nexus, providers_to_try)
 
 
 # ──────────────────────────────────────────────
@@ -1047,7 +1585,7 @@ YOUR TASK: Build a high-quality modlist by searching Nexus Mods. Follow these ru
 4. Stay within the storage budget ({storage_budget_gb}GB) and VRAM budget ({vram_budget}MB).
    Estimate sizes: texture packs 1-4GB, gameplay mods <100MB, overhauls 500MB-2GB.
 
-5. Set load_order correctly — essential framework mods first (SKSE, USSEP, etc.), then overhauls, then patches/tweaks last.
+5. Don't spend turns on load order: it is computed after generation from load-order categories, requirements and patch targets.
 
 6. Call finalize() when you're satisfied with the list. Aim for 15-30 mods depending on the playstyle."""
 
@@ -1063,7 +1601,8 @@ PROCESS (follow this order for each potential conflict):
    Mod authors often list required patches or link to them directly.
 2. SECOND: If the description doesn't mention a patch, use search_patches to search Nexus.
    Search with terms like "ModA ModB patch" or "ModA compatibility".
-3. If you find a patch mod, use add_patch to add it with the correct load_order (patches load AFTER the mods they patch).
+3. If you find a patch mod, use add_patch to add it, listing the exact modlist names of the mods it patches
+   in patches_mods (it is loaded after them automatically).
 4. If a patch is NEEDED but doesn't exist, use flag_user_knowledge to alert the user.
    This is important for future AI patch generation.
 
@@ -1095,139 +1634,142 @@ async def _generate_legacy(
         cpu_cores=request.cpu_cores, cpu_speed_ghz=request.cpu_speed_ghz,
     )
 
-    tier_vram_pct = {"low": 0.60, "mid": 0.70, "high": 0.80, "ultra": 0.85}
-    vram_budget = int(user_vram * tier_vram_pct.get(tier_info["tier"], 0.75))
-
+    vram_budget, storage_budget_gb = generation_budgets(request, tier_info["tier"])
     available_storage = request.available_storage_gb or 50
-    storage_budget_gb = max(10, int(available_storage * 0.80))
 
     version_notes = _VERSION_NOTES.get(game_version or "", "No specific version selected.")
 
     nexus = NexusModsClient(api_key=nexus_api_key)
     session = GenerationSession(game_domain=game.nexus_domain, nexus=nexus)
-
     providers_to_try: list[LLMProvider] = []
-    for cred in request.llm_credentials:
-        try:
-            providers_to_try.append(
-                LLMProviderFactory.create_from_request(
-                    cred.provider, cred.api_key,
-                    base_url=cred.base_url, model=cred.model,
-                )
-            )
-        except ValueError:
-            logger.warning(f"Skipping unknown provider: {cred.provider}")
-
-    if not providers_to_try:
-        providers_to_try.append(LLMProviderFactory.create())
-
-    discovery_prompt = DISCOVERY_SYSTEM_PROMPT.format(
-        game_name=game.name,
-        game_version=game_version or "Unknown",
-        gpu=request.gpu or "Unknown",
-        cpu=request.cpu or "Unknown",
-        ram_gb=request.ram_gb or "Unknown",
-        vram_mb=user_vram,
-        available_storage_gb=available_storage,
-        storage_budget_gb=storage_budget_gb,
-        vram_budget=vram_budget,
-        playstyle=playstyle.name,
-        version_notes=version_notes,
-    )
-
-    provider_errors: list[str] = []
-    for i, llm in enumerate(providers_to_try):
-        try:
-            session.modlist.clear()
-            session.patches.clear()
-            session.knowledge_flags.clear()
-            session.description_cache.clear()
-            session.finalized = False
 
-            logger.info(f"Trying provider {i+1}/{len(providers_to_try)}: {llm.get_model_name()}")
-
-            _emit(event_callback, "phase_start", {
-                "phase": "Discovery",
-                "number": 1,
-                "total_phases": 2,
-            })
-
-            messages = [
-                {"role": "system", "content": discovery_prompt},
-                {"role": "user", "content": f"Build a {playstyle.name} modlist for {game.name} ({game_version or 'any version'})."},
-            ]
-
-            await llm.generate_with_tools(
-                messages=messages,
-                tools=PHASE1_TOOLS,
-                tool_handlers=_build_phase1_handlers(session, event_callback),
-                max_iterations=20,
-                on_text=lambda text: _emit(
-                    event_callback, "thinking", {"text": text[:200]}
-                ),
-            )
-
-            _emit(event_callback, "phase_complete", {
-                "phase": "Discovery",
-                "number": 1,
-                "mod_count": len(session.modlist),
-            })
-
-            if session.modlist:
-                modlist_summary = "\n".join(
-                    f"{i+1}. {m['name']} (Nexus ID: {m['nexus_mod_id']}) — {m.get('reason', '')}"
-                    for i, m in enumerate(session.modlist)
-                )
+    try:
+        await _apply_budget(db, session, storage_budget_gb, vram_budget)
+        session.compat_rules = await _load_compatibility_index(db, session.game_domain)
 
-                patch_prompt = PATCH_REVIEW_SYSTEM_PROMPT.format(
-                    game_name=game.name,
-                    game_version=game_version or "Unknown",
-                    modlist_summary=modlist_summary,
+        for cred in request.llm_credentials:
+            try:
+                providers_to_try.append(
+                    LLMProviderFactory.create_from_request(
+                        cred.provider, cred.api_key,
+                        base_url=cred.base_url, model=cred.model,
+                    )
                 )
+            except ValueError:
+                logger.warning(f"Skipping unknown provider: {cred.provider}")
+
+        if not providers_to_try:
+            providers_to_try.append(LLMProviderFactory.create())
+
+        discovery_prompt = DISCOVERY_SYSTEM_PROMPT.format(
+            game_name=game.name,
+            game_version=game_version or "Unknown",
+            gpu=request.gpu or "Unknown",
+            cpu=request.cpu or "Unknown",
+            ram_gb=request.ram_gb or "Unknown",
+            vram_mb=user_vram,
+            available_storage_gb=available_storage,
+            storage_budget_gb=storage_budget_gb,
+            vram_budget=vram_budget,
+            playstyle=playstyle.name,
+            version_notes=version_notes,
+        )
 
+        provider_errors: list[str] = []
+        for i, llm in enumerate(providers_to_try):
+            try:
+                session.clear_entries()
+                session.knowledge_flags.clear()
+                session.description_cache.clear()
+                session.budget.reset()
                 session.finalized = False
 
+                logger.info(f"Trying provider {i+1}/{len(providers_to_try)}: {llm.get_model_name()}")
+
                 _emit(event_callback, "phase_start", {
-                    "phase": "Patch Review",
-                    "number": 2,
+                    "phase": "Discovery",
+                    "number": 1,
                     "total_phases": 2,
                 })
 
+                messages = [
+                    {"role": "system", "content": discovery_prompt},
+                    {"role": "user", "content": f"Build a {playstyle.name} modlist for {game.name} ({game_version or 'any version'})."},
+                ]
+
                 await llm.generate_with_tools(
-                    messages=[
-                        {"role": "system", "content": patch_prompt},
-                        {"role": "user", "content": "Review the modlist above for compatibility patches."},
-                    ],
-                    tools=PHASE2_TOOLS,
-                    tool_handlers=_build_phase2_handlers(session, event_callback),
-                    max_iterations=15,
+                    messages=messages,
+                    tools=PHASE1_TOOLS,
+                    tool_handlers=_build_phase1_handlers(session, event_callback, game.slug),
+                    max_iterations=20,
                     on_text=lambda text: _emit(
                         event_callback, "thinking", {"text": text[:200]}
                     ),
                 )
 
                 _emit(event_callback, "phase_complete", {
-                    "phase": "Patch Review",
-                    "number": 2,
+                    "phase": "Discovery",
+                    "number": 1,
                     "mod_count": len(session.modlist),
-                    "patch_count": len(session.patches),
                 })
 
-            all_entries = session.modlist + session.patches
-            return GenerationResult(
-                entries=all_entries,
-                knowledge_flags=session.knowledge_flags,
-                llm_provider=llm.get_model_name(),
-            )
+                if session.modlist:
+                    modlist_summary = "\n".join(
+                        f"{i+1}. {m['name']} (Nexus ID: {m['nexus_mod_id']}) — {m.get('reason', '')}"
+                        for i, m in enumerate(session.modlist)
+                    )
 
-        except Exception as e:
-            _, friendly = _classify_error(llm, e)
-            logger.warning(f"Provider {llm.get_model_name()} failed: {e}")
-            provider_errors.append(friendly)
-            continue
+                    patch_prompt = PATCH_REVIEW_SYSTEM_PROMPT.format(
+                        game_name=game.name,
+                        game_version=game_version or "Unknown",
+                        modlist_summary=modlist_summary,
+                    )
+
+                    session.finalized = False
+
+                    _emit(event_callback, "phase_start", {
+                        "phase": "Patch Review",
+                        "number": 2,
+                        "total_phases": 2,
+                    })
+
+                    await llm.generate_with_tools(
+                        messages=[
+                            {"role": "system", "content": patch_prompt},
+                            {"role": "user", "content": "Review the modlist above for compatibility patches."},
+                        ],
+                        tools=PHASE2_TOOLS,
+                        tool_handlers=_build_phase2_handlers(session, event_callback, game.slug),
+                        max_iterations=15,
+                        on_text=lambda text: _emit(
+                            event_callback, "thinking", {"text": text[:200]}
+                        ),
+                    )
+
+                    _emit(event_callback, "phase_complete", {
+                        "phase": "Patch Review",
+                        "number": 2,
+                        "mod_count": len(session.modlist),
+                        "patch_count": len(session.patches),
+                    })
+
+                all_entries = _order_entries(session, game.slug, {}, event_callback)
+                return GenerationResult(
+                    entries=all_entries,
+                    knowledge_flags=session.knowledge_flags,
+                    llm_provider=llm.get_model_name(),
+                )
+
+            except Exception as e:
+                _, friendly = _classify_error(llm, e)
+                logger.warning(f"Provider {llm.get_model_name()} failed: {e}")
+                provider_errors.append(friendly)
+                continue
 
-    error_summary = "; ".join(provider_errors) if provider_errors else "No LLM provider available"
-    raise RuntimeError(error_summary)
+        error_summary = "; ".join(provider_errors) if provider_errors else "No LLM provider available"
+        raise RuntimeError(error_summary)
+    finally:
+        await _close_clients(nexus, providers_to_try)
 
 
 # ──────────────────────────────────────────────
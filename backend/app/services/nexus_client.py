@@ -15,7 +15,12 @@ class NexusAPIError(Exception):
 
 
 class NexusModsClient:
-    """Client for the Nexus Mods v2 GraphQL API."""
+    """Client for the Nexus Mods v2 GraphQL API.
+
+    Requests share one pooled httpx.AsyncClient, created on first use.
+    Call aclose() (or use the client as an async context manager) to
+    release its connections.
+    """
 
     BASE_URL = "https://api.nexusmods.com/v2/graphql"
 
@@ -29,6 +34,27 @@ class NexusModsClient:
     def __init__(self, api_key: str | None = None):
         self.api_key = api_key or ""
         self._semaphore = asyncio.Semaphore(10)  # Max concurrent requests
+        self._client: httpx.AsyncClient | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it lazily."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close pooled connections. Safe to call more than once."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "NexusModsClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
 
     def _headers(self) -> dict:
         return {
@@ -43,36 +69,35 @@ class NexusModsClient:
         Raises httpx.HTTPStatusError for HTTP-level errors.
         """
         async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                payload = {"query": query, "variables": variables or {}}
-                response = await client.post(
-                    self.BASE_URL,
-                    headers=self._headers(),
-                    json=payload,
-                    timeout=30.0,
+            payload = {"query": query, "variables": variables or {}}
+            response = await self._http().post(
+                self.BASE_URL,
+                headers=self._headers(),
+                json=payload,
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            result = response.json()
+
+            # Check for GraphQL-level errors
+            if result.get("errors"):
+                logger.error(
+                    "Nexus GraphQL errors: %s | query: %s | variables: %s",
+                    result["errors"],
+                    query.strip()[:200],
+                    variables,
                 )
-                response.raise_for_status()
-                result = response.json()
-
-                # Check for GraphQL-level errors
-                if result.get("errors"):
-                    logger.error(
-                        "Nexus GraphQL errors: %s | query: %s | variables: %s",
-                        result["errors"],
-                        query.strip()[:200],
-                        variables,
-                    )
-                    raise NexusAPIError(result["errors"])
-
-                # Warn if data is None (unexpected for a successful query)
-                if result.get("data") is None:
-                    logger.warning(
-                        "Nexus returned null data without errors | query: %s | variables: %s",
-                        query.strip()[:200],
-                        variables,
-                    )
-
-                return result
+                raise NexusAPIError(result["errors"])
+
+            # Warn if data is None (unexpected for a successful query)
+            if result.get("data") is None:
+                logger.warning(
+                    "Nexus returned null data without errors | query: %s | variables: %s",
+                    query.strip()[:200],
+                    variables,
+                )
+
+            return result
 
     async def validate_key(self) -> dict:
         """Validate the API key against the Nexus v1 endpoint.
@@ -80,14 +105,13 @@ class NexusModsClient:
         Returns user info dict on success, raises on failure.
         """
         async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.nexusmods.com/v1/users/validate.json",
-                    headers={"apikey": self.api_key},
-                    timeout=15.0,
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self._http().get(
+                "https://api.nexusmods.com/v1/users/validate.json",
+                headers={"apikey": self.api_key},
+                timeout=15.0,
+            )
+            response.raise_for_status()
+            return response.json()
 
     # Verified working query — uses typed variables ($filter: ModsFilter)
     # instead of interpolating scalar variables into inline filter objects.
@@ -227,20 +251,19 @@ class NexusModsClient:
         # For v2 GraphQL, download links may need the v1 endpoint as fallback
         v1_url = f"https://api.nexusmods.com/v1/games/{game_domain}/mods/{mod_id}/files/{file_id}/download_link.json"
         async with self._semaphore:
-            async with httpx.AsyncClient() as client:
-                try:
-                    response = await client.get(
-                        v1_url,
-                        headers={"apikey": self.api_key},
-                        timeout=30.0,
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        if data:
-                            return data[0].get("URI")
-                    elif response.status_code == 403:
-                        # Free user - return manual download URL
-                        return f"https://www.nexusmods.com/{game_domain}/mods/{mod_id}?tab=files&file_id={file_id}"
-                except httpx.HTTPError:
-                    pass
+            try:
+                response = await self._http().get(
+                    v1_url,
+                    headers={"apikey": self.api_key},
+                    timeout=30.0,
+                )
+                if response.status_code == 200:
+                    data = response.json()
+                    if data:
+                        return data[0].get("URI")
+                elif response.status_code == 403:
+                    # Free user - return manual download URL
+                    return f"https://www.nexusmods.com/{game_domain}/mods/{mod_id}?tab=files&file_id={file_id}"
+            except httpx.HTTPError:
+                pass
         return None
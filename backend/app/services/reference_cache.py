@@ -0,0 +1,109 @@
+"""In-process cache for reference data (games, playstyles, stats).
+
+Reference data only changes when seeds or migrations run, which happens in
+a separate process. Those bump the `reference_data_version` counter in the
+database; API processes serve cached payloads and, once an entry is older
+than `reference_cache_ttl_seconds`, re-read the version (a primary-key
+lookup) and rebuild only if it changed.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.http_cache import compute_etag
+from app.config import get_settings
+from app.models.app_counter import AppCounter
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_DATA_VERSION = "reference_data_version"
+MODLISTS_GENERATED = "modlists_generated"
+
+# Dialects with INSERT ... ON CONFLICT support
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+async def get_counter(db: AsyncSession, name: str) -> int:
+    result = await db.execute(select(AppCounter.value).where(AppCounter.name == name))
+    return result.scalar_one_or_none() or 0
+
+
+async def increment_counter(db: AsyncSession, name: str, amount: int = 1) -> None:
+    """Add to a counter in the caller's transaction, creating it if missing.
+
+    A single upsert, so two transactions creating the same counter can't
+    both take the insert path and fail on the primary key.
+    """
+    insert = _UPSERT_INSERTS[db.get_bind().dialect.name]
+    await db.execute(
+        insert(AppCounter)
+        .values(name=name, value=amount)
+        .on_conflict_do_update(
+            index_elements=["name"],
+            set_={"value": AppCounter.value + amount},
+        )
+    )
+
+
+async def bump_reference_version(db: AsyncSession) -> None:
+    """Invalidate every process's reference-data cache."""
+    await increment_counter(db, REFERENCE_DATA_VERSION)
+
+
+@dataclass
+class _Entry:
+    version: int
+    payload: Any
+    etag: str
+    checked_at: float
+
+
+class ReferenceDataCache:
+    """Singleton map of cache key → (payload, ETag) tagged with a data version."""
+
+    _instance: "ReferenceDataCache | None" = None
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, _Entry] = {}
+
+    @classmethod
+    def get_instance(cls) -> "ReferenceDataCache":
+        if cls._instance is None:
+            cls._instance = cls(ttl_seconds=get_settings().reference_cache_ttl_seconds)
+        return cls._instance
+
+    async def get(
+        self,
+        db: AsyncSession,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> tuple[Any, str]:
+        """Return (payload, etag) for `key`, calling `loader` on a miss.
+
+        `loader` must return a JSON-serializable payload.
+        """
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry and now - entry.checked_at <= self.ttl_seconds:
+            return entry.payload, entry.etag
+
+        version = await get_counter(db, REFERENCE_DATA_VERSION)
+        if entry and entry.version == version:
+            entry.checked_at = now
+            return entry.payload, entry.etag
+
+        payload = await loader()
+        entry = _Entry(version=version, payload=payload, etag=compute_etag(payload), checked_at=now)
+        self._entries[key] = entry
+        logger.debug(f"Reference cache rebuilt {key!r} at version {version}")
+        return entry.payload, entry.etag
+
+    def clear(self) -> None:
+        self._entries.clear()
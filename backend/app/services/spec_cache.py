@@ -0,0 +1,140 @@
+"""Cache and de-duplication of LLM spec parses.
+
+When the regex parser can't find a GPU or CPU, parse_specs falls back to an
+LLM call. Users paste the same DxDiag text repeatedly (retries, page
+reloads), so LLM results are cached by the SHA-256 of the text with its
+whitespace normalized: first in a bounded in-process LRU, then in the
+`spec_parse_results` table shared by every API process. Concurrent
+requests for the same text await one in-flight LLM call instead of each
+starting their own.
+
+The regex parse itself is cheap and always runs on the raw text; only the
+LLM refinement is cached.
+"""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import get_settings
+from app.database import async_session
+from app.models.spec_parse_result import SpecParseResult
+from app.schemas.specs import HardwareSpecs
+from app.services import spec_parser
+
+logger = logging.getLogger(__name__)
+
+
+def spec_text_hash(raw_text: str) -> str:
+    """Cache key for a pasted text: whitespace runs collapsed, ends trimmed."""
+    return hashlib.sha256(" ".join(raw_text.split()).encode()).hexdigest()
+
+
+class SpecParseCache:
+    """Singleton LRU of text hash → LLM-parsed specs, backed by the database."""
+
+    _instance: "SpecParseCache | None" = None
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, HardwareSpecs] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @classmethod
+    def get_instance(cls) -> "SpecParseCache":
+        if cls._instance is None:
+            cls._instance = cls(max_entries=get_settings().spec_parse_cache_max_entries)
+        return cls._instance
+
+    def _remember(self, text_hash: str, specs: HardwareSpecs) -> None:
+        self._entries[text_hash] = specs
+        self._entries.move_to_end(text_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def lookup(self, text_hash: str) -> HardwareSpecs | None:
+        """Cached LLM result for a text hash, from memory or the database."""
+        specs = self._entries.get(text_hash)
+        if specs is not None:
+            self._entries.move_to_end(text_hash)
+            self.hits += 1
+            return specs
+        try:
+            async with async_session() as db:
+                row = await db.get(SpecParseResult, text_hash)
+        except Exception:
+            logger.exception("Spec parse cache read failed; treating as a miss")
+            return None
+        if row is None:
+            return None
+        specs = HardwareSpecs(**row.specs)
+        self._remember(text_hash, specs)
+        self.db_hits += 1
+        return specs
+
+    async def _store(self, text_hash: str, specs: HardwareSpecs) -> None:
+        """Remember a result in memory and persist it.
+
+        Refinements often run as tasks nobody awaits (deferred parses), so a
+        failed write is logged here instead of escaping; the result is
+        already cached in memory and returned to any waiters.
+        """
+        self._remember(text_hash, specs)
+        try:
+            async with async_session() as db:
+                db.add(SpecParseResult(text_hash=text_hash, specs=specs.model_dump()))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    await db.rollback()  # another process stored it first
+        except Exception:
+            logger.exception("Failed to persist spec parse result")
+
+    async def _refine(self, text_hash: str, raw_text: str) -> HardwareSpecs | None:
+        specs = await self.lookup(text_hash)
+        if specs is not None:
+            return specs
+        self.misses += 1
+        specs = await spec_parser.parse_specs_llm(raw_text)
+        # None means the call itself failed; don't cache transient errors
+        if specs is not None:
+            await self._store(text_hash, specs)
+        return specs
+
+    def start(self, raw_text: str) -> tuple[str, asyncio.Task]:
+        """Start (or join) the LLM refinement of a text. Returns (hash, task)."""
+        text_hash = spec_text_hash(raw_text)
+        task = self._inflight.get(text_hash)
+        if task is not None:
+            self.coalesced += 1
+            return text_hash, task
+        task = asyncio.create_task(self._refine(text_hash, raw_text))
+        self._inflight[text_hash] = task
+        task.add_done_callback(lambda _: self._inflight.pop(text_hash, None))
+        return text_hash, task
+
+    def pending(self, text_hash: str) -> asyncio.Task | None:
+        return self._inflight.get(text_hash)
+
+    async def refine(self, raw_text: str) -> HardwareSpecs | None:
+        """LLM-parsed specs for a text, cached or coalesced where possible."""
+        _, task = self.start(raw_text)
+        # shield: a cancelled caller must not cancel the call others await
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "inflight": len(self._inflight),
+        }
@@ -3,79 +3,154 @@ import re
 import logging
 
 from app.schemas.specs import HardwareSpecs
+from app.services.hardware_catalog import HardwareCatalog
 
 logger = logging.getLogger(__name__)
 
+# Anchors let a pattern skip full-text searches (see _Scan). Every keyword
+# is a lowercase literal: `starts` means a match can only begin where one of
+# them occurs; `requires` means the text must contain at least one of them.
+# Patterns without an anchor always search the whole text.
+_ANCHORS: dict[re.Pattern, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+
+
+def _pattern(
+    regex: str,
+    starts: tuple[str, ...] = (),
+    requires: tuple[str, ...] = (),
+    flags: int = re.IGNORECASE,
+) -> re.Pattern:
+    pattern = re.compile(regex, flags)
+    if starts or requires:
+        _ANCHORS[pattern] = (starts, requires)
+    return pattern
+
+
 # GPU patterns
 GPU_PATTERNS = [
-    re.compile(r"(NVIDIA\s+GeForce\s+[A-Z]{2,3}\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER|XT)?)", re.IGNORECASE),
-    re.compile(r"(GeForce\s+[A-Z]{2,3}\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER|XT)?)", re.IGNORECASE),
-    re.compile(r"(AMD\s+Radeon\s+RX\s+\d{3,4}\s*(?:XTX|XT)?)", re.IGNORECASE),
-    re.compile(r"(Radeon\s+RX\s+\d{3,4}\s*(?:XTX|XT)?)", re.IGNORECASE),
-    re.compile(r"(Intel\s+Arc\s+[A-Z]\d{3,4}[A-Z]?)", re.IGNORECASE),
+    _pattern(r"(NVIDIA\s+GeForce\s+[A-Z]{2,3}\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER|XT)?)", starts=("nvidia",)),
+    _pattern(r"(GeForce\s+[A-Z]{2,3}\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER|XT)?)", starts=("geforce",)),
+    _pattern(r"(AMD\s+Radeon\s+RX\s+\d{3,4}\s*(?:XTX|XT)?)", starts=("amd",)),
+    _pattern(r"(Radeon\s+RX\s+\d{3,4}\s*(?:XTX|XT)?)", starts=("radeon",)),
+    _pattern(r"(Intel\s+Arc\s+[A-Z]\d{3,4}[A-Z]?)", starts=("intel",)),
     # Catch NVIDIA RTX/GTX without GeForce prefix
-    re.compile(r"((?:RTX|GTX)\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER)?)", re.IGNORECASE),
+    _pattern(r"((?:RTX|GTX)\s+\d{3,4}\s*(?:Ti\s*(?:SUPER)?|SUPER)?)", starts=("rtx", "gtx")),
 ]
 
 # VRAM patterns
 VRAM_PATTERNS = [
-    re.compile(r"(\d+)(?:\.\d+)?\s*GB\s*(?:GDDR\d[A-Z]?|VRAM|Video\s*(?:RAM|Memory))", re.IGNORECASE),
-    re.compile(r"(?:VRAM|Video\s*(?:RAM|Memory)|Dedicated\s*(?:GPU|Video)\s*Memory|Total\s*Available\s*Graphics\s*Memory)\s*[:=]?\s*(\d+)(?:\.\d+)?\s*(?:GB|MB)", re.IGNORECASE),
-    re.compile(r"(\d{4,})\s*MB\s*(?:GDDR|VRAM|Video|Dedicated)", re.IGNORECASE),
-    re.compile(r"(?:GDDR\d[A-Z]?)\s*[:=]?\s*(\d+)(?:\.\d+)?\s*(?:GB|MB)", re.IGNORECASE),
+    _pattern(r"(\d+)(?:\.\d+)?\s*GB\s*(?:GDDR\d[A-Z]?|VRAM|Video\s*(?:RAM|Memory))", requires=("gddr", "vram", "video")),
+    _pattern(r"(?:VRAM|Video\s*(?:RAM|Memory)|Dedicated\s*(?:GPU|Video)\s*Memory|Total\s*Available\s*Graphics\s*Memory)\s*[:=]?\s*(\d+)(?:\.\d+)?\s*(?:GB|MB)", starts=("vram", "video", "dedicated", "total")),
+    _pattern(r"(\d{4,})\s*MB\s*(?:GDDR|VRAM|Video|Dedicated)", requires=("gddr", "vram", "video", "dedicated")),
+    _pattern(r"(?:GDDR\d[A-Z]?)\s*[:=]?\s*(\d+)(?:\.\d+)?\s*(?:GB|MB)", starts=("gddr",)),
 ]
 
 # CPU patterns
 CPU_PATTERNS = [
-    re.compile(r"(Intel\s+Core\s+(?:Ultra\s+)?\d?\s*i\d[- ]\d{4,5}[A-Z]{0,3})", re.IGNORECASE),
-    re.compile(r"(Intel\s+Core\s+i\d[- ]\d{4,5}[A-Z]{0,3})", re.IGNORECASE),
-    re.compile(r"(AMD\s+Ryzen\s+\d\s+\d{4}X?\d?[A-Z]*(?:\s*3D)?)", re.IGNORECASE),
-    re.compile(r"(Intel\s+Core\s+Ultra\s+\d\s+\d{3}[A-Z]?)", re.IGNORECASE),
-    re.compile(r"(AMD\s+Ryzen\s+\d\s+\d{3,4}[A-Z]*)", re.IGNORECASE),
+    _pattern(r"(Intel\s+Core\s+(?:Ultra\s+)?\d?\s*i\d[- ]\d{4,5}[A-Z]{0,3})", starts=("intel",)),
+    _pattern(r"(Intel\s+Core\s+i\d[- ]\d{4,5}[A-Z]{0,3})", starts=("intel",)),
+    _pattern(r"(AMD\s+Ryzen\s+\d\s+\d{4}X?\d?[A-Z]*(?:\s*3D)?)", starts=("amd",)),
+    _pattern(r"(Intel\s+Core\s+Ultra\s+\d\s+\d{3}[A-Z]?)", starts=("intel",)),
+    _pattern(r"(AMD\s+Ryzen\s+\d\s+\d{3,4}[A-Z]*)", starts=("amd",)),
     # Catch processor lines from system info
-    re.compile(r"(?:Processor|CPU)\s*[:=]?\s*(.+?)(?:\s*@|\s*\d+\.\d+\s*GHz|\n|$)", re.IGNORECASE),
+    _pattern(r"(?:Processor|CPU)\s*[:=]?\s*(.+?)(?:\s*@|\s*\d+\.\d+\s*GHz|\n|$)", starts=("processor", "cpu")),
 ]
 
 # RAM patterns (ordered from most specific to least; avoid matching VRAM/GDDR lines)
 RAM_PATTERNS = [
     # "System Memory: 32 GB", "Available System Memory: 31.9 GB"
-    re.compile(r"(?:System\s*Memory|System\s*RAM)\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", re.IGNORECASE),
+    _pattern(r"(?:System\s*Memory|System\s*RAM)\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", starts=("system",)),
     # "RAM: 32 GB DDR5", "32 GB DDR5 RAM"
-    re.compile(r"(\d{1,3})\s*GB\s*DDR\d", re.IGNORECASE),
-    re.compile(r"(?<!V)(?:RAM)\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", re.IGNORECASE),
+    _pattern(r"(\d{1,3})\s*GB\s*DDR\d", requires=("ddr",)),
+    _pattern(r"(?<!V)(?:RAM)\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", starts=("ram",)),
     # "Installed Physical Memory (RAM): 32 GB", "Total Physical Memory: 32,651 MB"
-    re.compile(r"(?:Installed\s*(?:Physical\s*)?Memory|Total\s*Physical\s*Memory)\s*(?:\(RAM\))?\s*[:=]?\s*(\d{1,3})(?:[.,]\d+)?\s*GB", re.IGNORECASE),
+    _pattern(r"(?:Installed\s*(?:Physical\s*)?Memory|Total\s*Physical\s*Memory)\s*(?:\(RAM\))?\s*[:=]?\s*(\d{1,3})(?:[.,]\d+)?\s*GB", starts=("installed", "total")),
     # "Memory: 32768 MB" or "32,651 MB" (but NOT "Video Memory" or "GDDR")
-    re.compile(r"(?<!Video\s)(?<!GPU\s)(?<!Dedicated\s)Memory\s*(?:\(RAM\))?\s*[:=]?\s*(\d[\d,]{3,6})\s*MB", re.IGNORECASE),
+    _pattern(r"(?<!Video\s)(?<!GPU\s)(?<!Dedicated\s)Memory\s*(?:\(RAM\))?\s*[:=]?\s*(\d[\d,]{3,6})\s*MB", starts=("memory",)),
     # "Memory: 32 GB" (but NOT "Video Memory" or lines containing GDDR)
-    re.compile(r"(?<!Video\s)(?<!GPU\s)(?<!Dedicated\s)Memory\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", re.IGNORECASE),
+    _pattern(r"(?<!Video\s)(?<!GPU\s)(?<!Dedicated\s)Memory\s*[:=]?\s*(\d{1,3})(?:\.\d+)?\s*GB", starts=("memory",)),
     # "32 GB installed", "32 GB total", "32 GB physical", "32 GB usable"
-    re.compile(r"(\d{1,3})\s*GB\s*(?:installed|total|physical|usable)", re.IGNORECASE),
+    _pattern(r"(\d{1,3})\s*GB\s*(?:installed|total|physical|usable)", requires=("installed", "total", "physical", "usable")),
 ]
 
 # CPU core count patterns
 CPU_CORE_PATTERNS = [
-    re.compile(r"(\d{1,2})\s*-?\s*[Cc]ore", re.IGNORECASE),
-    re.compile(r"(\d{1,2})\s*[Cc]ores", re.IGNORECASE),
-    re.compile(r"(\d{1,2})\s*C\s*/\s*\d{1,2}\s*T", re.IGNORECASE),  # "8C/16T"
-    re.compile(r"[Cc]ores?\s*[:=]?\s*(\d{1,2})", re.IGNORECASE),
-    re.compile(r"(\d{1,2})\s*(?:physical\s+)?(?:cores|processors)", re.IGNORECASE),
+    _pattern(r"(\d{1,2})\s*-?\s*[Cc]ore", requires=("core",)),
+    _pattern(r"(\d{1,2})\s*[Cc]ores", requires=("core",)),
+    _pattern(r"(\d{1,2})\s*C\s*/\s*\d{1,2}\s*T"),  # "8C/16T"
+    _pattern(r"[Cc]ores?\s*[:=]?\s*(\d{1,2})", starts=("core",)),
+    _pattern(r"(\d{1,2})\s*(?:physical\s+)?(?:cores|processors)", requires=("core", "processor")),
 ]
 
 # CPU speed patterns
 CPU_SPEED_PATTERNS = [
-    re.compile(r"(\d+\.\d+)\s*GHz", re.IGNORECASE),
-    re.compile(r"(?:Base|Boost|Clock|Speed|Frequency)\s*[:=]?\s*(\d+\.\d+)\s*GHz", re.IGNORECASE),
-    re.compile(r"@\s*(\d+\.\d+)\s*GHz", re.IGNORECASE),
+    _pattern(r"(\d+\.\d+)\s*GHz", requires=("ghz",)),
+    _pattern(r"(?:Base|Boost|Clock|Speed|Frequency)\s*[:=]?\s*(\d+\.\d+)\s*GHz", starts=("base", "boost", "clock", "speed", "frequency")),
+    _pattern(r"@\s*(\d+\.\d+)\s*GHz", starts=("@",)),
 ]
 
 
 # Storage drive patterns - matches "Drives: C: 110GB free / 931GB, D: 412GB free / 1863GB"
-DRIVE_PATTERN = re.compile(
+DRIVE_PATTERN = _pattern(
     r"[Dd]rives?\s*[:=]?\s*(.+)",
+    starts=("drive",),
+    flags=0,
 )
 
 
+class _Scan:
+    """Pattern searches over one text, restricted by keyword anchors.
+
+    The text is lowercased once; keyword positions are found with str.find
+    on first use and shared by every pattern anchored on that keyword. An
+    anchored pattern is only tried with match() at those positions, which
+    returns the same match as search() would, since search() reports the
+    leftmost one. Most patterns in a long paste never match, and this is
+    what saves their full-text scans.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        lowered = text.lower()
+        # Non-ASCII case mappings can change length; positions would drift
+        self._lowered = lowered if len(lowered) == len(text) else None
+        self._positions: dict[str, list[int]] = {}
+
+    def _find_all(self, keyword: str) -> list[int]:
+        positions = self._positions.get(keyword)
+        if positions is None:
+            positions = []
+            index = self._lowered.find(keyword)
+            while index != -1:
+                positions.append(index)
+                index = self._lowered.find(keyword, index + 1)
+            self._positions[keyword] = positions
+        return positions
+
+    def search(self, pattern: re.Pattern) -> re.Match | None:
+        anchor = _ANCHORS.get(pattern)
+        if anchor is None or self._lowered is None:
+            return pattern.search(self.text)
+        starts, requires = anchor
+        if starts:
+            candidates = sorted({pos for keyword in starts for pos in self._find_all(keyword)})
+            for pos in candidates:
+                match = pattern.match(self.text, pos)
+                if match:
+                    return match
+            return None
+        if not any(keyword in self._lowered for keyword in requires):
+            return None
+        return pattern.search(self.text)
+
+
+class _FullScan(_Scan):
+    """Every pattern searches the whole text (reference for parity checks)."""
+
+    def search(self, pattern: re.Pattern) -> re.Match | None:
+        return pattern.search(self.text)
+
+
 LLM_PARSE_PROMPT = """Extract hardware specifications from the following text.
 Return ONLY a JSON object with these fields (use null if not found):
 {
@@ -91,17 +166,17 @@ Text to parse:
 """
 
 
-def _extract_first_match(text: str, patterns: list[re.Pattern]) -> str | None:
+def _extract_first_match(scan: _Scan, patterns: list[re.Pattern]) -> str | None:
     for pattern in patterns:
-        match = pattern.search(text)
+        match = scan.search(pattern)
         if match:
             return match.group(1).strip()
     return None
 
 
-def _parse_vram(text: str) -> int | None:
+def _parse_vram(scan: _Scan) -> int | None:
     for pattern in VRAM_PATTERNS:
-        match = pattern.search(text)
+        match = scan.search(pattern)
         if match:
             value = int(match.group(1))
             if value >= 1024:
@@ -110,9 +185,9 @@ def _parse_vram(text: str) -> int | None:
     return None
 
 
-def _parse_ram(text: str) -> int | None:
+def _parse_ram(scan: _Scan) -> int | None:
     for pattern in RAM_PATTERNS:
-        match = pattern.search(text)
+        match = scan.search(pattern)
         if match:
             raw = match.group(1).replace(",", "")
             value = int(raw)
@@ -123,10 +198,10 @@ def _parse_ram(text: str) -> int | None:
     return None
 
 
-def _parse_cpu_cores(text: str) -> int | None:
+def _parse_cpu_cores(scan: _Scan) -> int | None:
     """Extract CPU core count from text."""
     for pattern in CPU_CORE_PATTERNS:
-        match = pattern.search(text)
+        match = scan.search(pattern)
         if match:
             cores = int(match.group(1))
             if 1 <= cores <= 128:
@@ -134,10 +209,10 @@ def _parse_cpu_cores(text: str) -> int | None:
     return None
 
 
-def _parse_cpu_speed(text: str) -> float | None:
+def _parse_cpu_speed(scan: _Scan) -> float | None:
     """Extract CPU clock speed in GHz from text."""
     for pattern in CPU_SPEED_PATTERNS:
-        match = pattern.search(text)
+        match = scan.search(pattern)
         if match:
             speed = float(match.group(1))
             if 0.5 <= speed <= 8.0:
@@ -145,115 +220,20 @@ def _parse_cpu_speed(text: str) -> float | None:
     return None
 
 
-# GPU model → VRAM in MB lookup table.
-# Used to infer VRAM when the text contains a GPU name but no explicit VRAM value
-# (e.g., browser auto-detection via WebGL only returns the GPU model).
-# Ordered from most specific to least specific so longer names match first.
-GPU_VRAM_TABLE: dict[str, int] = {
-    # NVIDIA RTX 50 series
-    "rtx 5090": 32 * 1024,
-    "rtx 5080": 16 * 1024,
-    "rtx 5070 ti": 16 * 1024,
-    "rtx 5070": 12 * 1024,
-    "rtx 5060 ti": 16 * 1024,
-    "rtx 5060": 8 * 1024,
-    # NVIDIA RTX 40 series
-    "rtx 4090": 24 * 1024,
-    "rtx 4080 super": 16 * 1024,
-    "rtx 4080": 16 * 1024,
-    "rtx 4070 ti super": 16 * 1024,
-    "rtx 4070 ti": 12 * 1024,
-    "rtx 4070 super": 12 * 1024,
-    "rtx 4070": 12 * 1024,
-    "rtx 4060 ti": 8 * 1024,
-    "rtx 4060": 8 * 1024,
-    # NVIDIA RTX 30 series
-    "rtx 3090 ti": 24 * 1024,
-    "rtx 3090": 24 * 1024,
-    "rtx 3080 ti": 12 * 1024,
-    "rtx 3080": 10 * 1024,
-    "rtx 3070 ti": 8 * 1024,
-    "rtx 3070": 8 * 1024,
-    "rtx 3060 ti": 8 * 1024,
-    "rtx 3060": 12 * 1024,
-    "rtx 3050": 8 * 1024,
-    # NVIDIA RTX 20 series
-    "rtx 2080 ti": 11 * 1024,
-    "rtx 2080 super": 8 * 1024,
-    "rtx 2080": 8 * 1024,
-    "rtx 2070 super": 8 * 1024,
-    "rtx 2070": 8 * 1024,
-    "rtx 2060 super": 8 * 1024,
-    "rtx 2060": 6 * 1024,
-    # NVIDIA GTX 16 series
-    "gtx 1660 ti": 6 * 1024,
-    "gtx 1660 super": 6 * 1024,
-    "gtx 1660": 6 * 1024,
-    "gtx 1650 super": 4 * 1024,
-    "gtx 1650": 4 * 1024,
-    # NVIDIA GTX 10 series
-    "gtx 1080 ti": 11 * 1024,
-    "gtx 1080": 8 * 1024,
-    "gtx 1070 ti": 8 * 1024,
-    "gtx 1070": 8 * 1024,
-    "gtx 1060": 6 * 1024,
-    "gtx 1050 ti": 4 * 1024,
-    "gtx 1050": 2 * 1024,
-    # AMD RX 9000 series
-    "rx 9070 xt": 16 * 1024,
-    "rx 9070": 16 * 1024,
-    # AMD RX 7000 series
-    "rx 7900 xtx": 24 * 1024,
-    "rx 7900 xt": 20 * 1024,
-    "rx 7900 gre": 16 * 1024,
-    "rx 7800 xt": 16 * 1024,
-    "rx 7700 xt": 12 * 1024,
-    "rx 7600 xt": 16 * 1024,
-    "rx 7600": 8 * 1024,
-    # AMD RX 6000 series
-    "rx 6950 xt": 16 * 1024,
-    "rx 6900 xt": 16 * 1024,
-    "rx 6800 xt": 16 * 1024,
-    "rx 6800": 16 * 1024,
-    "rx 6750 xt": 12 * 1024,
-    "rx 6700 xt": 12 * 1024,
-    "rx 6650 xt": 8 * 1024,
-    "rx 6600 xt": 8 * 1024,
-    "rx 6600": 8 * 1024,
-    "rx 6500 xt": 4 * 1024,
-    # AMD RX 5000 series
-    "rx 5700 xt": 8 * 1024,
-    "rx 5700": 8 * 1024,
-    "rx 5600 xt": 6 * 1024,
-    "rx 5500 xt": 8 * 1024,
-    # Intel Arc
-    "arc b580": 12 * 1024,
-    "arc a770": 16 * 1024,
-    "arc a750": 8 * 1024,
-    "arc a580": 8 * 1024,
-    "arc a380": 6 * 1024,
-}
-
-
 def _infer_vram_from_gpu(gpu_name: str) -> int | None:
     """Infer VRAM from a known GPU model name.
 
     This is used when the input text has a GPU name but no explicit VRAM
     value — for example, when the browser auto-detects via WebGL.
     """
-    if not gpu_name:
-        return None
-    gpu_lower = gpu_name.lower()
-    # Check from most specific (longest key) to least specific
-    for key, vram_mb in sorted(GPU_VRAM_TABLE.items(), key=lambda x: -len(x[0])):
-        if key in gpu_lower:
-            return vram_mb
-    return None
+    # No fuzzy matching: a near-miss name could carry a different VRAM size
+    model = HardwareCatalog.get_instance().lookup_gpu(gpu_name, fuzzy=False)
+    return model.vram_mb if model else None
 
 
-def _parse_drives(text: str) -> str | None:
+def _parse_drives(scan: _Scan) -> str | None:
     """Extract storage drive info from text."""
-    match = DRIVE_PATTERN.search(text)
+    match = scan.search(DRIVE_PATTERN)
     if match:
         return match.group(1).strip()
     return None
@@ -261,8 +241,12 @@ def _parse_drives(text: str) -> str | None:
 
 def parse_specs_regex(raw_text: str) -> HardwareSpecs:
     """Parse hardware specs using regex patterns."""
-    gpu = _extract_first_match(raw_text, GPU_PATTERNS)
-    vram_mb = _parse_vram(raw_text)
+    return _parse_scan(_Scan(raw_text))
+
+
+def _parse_scan(scan: _Scan) -> HardwareSpecs:
+    gpu = _extract_first_match(scan, GPU_PATTERNS)
+    vram_mb = _parse_vram(scan)
 
     # If we found a GPU but no VRAM in the text, try to infer VRAM from the GPU model
     if gpu and not vram_mb:
@@ -271,11 +255,11 @@ def parse_specs_regex(raw_text: str) -> HardwareSpecs:
     return HardwareSpecs(
         gpu=gpu,
         vram_mb=vram_mb,
-        cpu=_extract_first_match(raw_text, CPU_PATTERNS),
-        ram_gb=_parse_ram(raw_text),
-        cpu_cores=_parse_cpu_cores(raw_text),
-        cpu_speed_ghz=_parse_cpu_speed(raw_text),
-        storage_drives=_parse_drives(raw_text),
+        cpu=_extract_first_match(scan, CPU_PATTERNS),
+        ram_gb=_parse_ram(scan),
+        cpu_cores=_parse_cpu_cores(scan),
+        cpu_speed_ghz=_parse_cpu_speed(scan),
+        storage_drives=_parse_drives(scan),
     )
 
 
@@ -319,16 +303,57 @@ async def parse_specs(raw_text: str) -> tuple[HardwareSpecs, str]:
     Uses regex first, falls back to LLM if regex can't find GPU or CPU.
     Returns (specs, method) where method is 'regex', 'llm', or 'regex_partial'.
     """
+    from app.services.spec_cache import SpecParseCache
+
     specs = parse_specs_regex(raw_text)
 
     # If regex found at least GPU or CPU, we're good
     if specs.gpu or specs.cpu:
         return specs, "regex"
 
-    # Fallback to LLM
-    llm_specs = await parse_specs_llm(raw_text)
+    # Fallback to LLM (cached per text; identical concurrent texts share a call)
+    llm_specs = await SpecParseCache.get_instance().refine(raw_text)
     if llm_specs and (llm_specs.gpu or llm_specs.cpu):
         return llm_specs, "llm"
 
     # Return partial regex results
     return specs, "regex_partial"
+
+
+def parse_specs_batch(raw_texts: list[str]) -> list[tuple[HardwareSpecs, str]]:
+    """Regex-parse many spec blobs. Returns (specs, method) per text, where
+    method is 'regex' or 'regex_partial'.
+
+    There is no LLM fallback: a batch can hold thousands of records, and
+    one completion each would cost far more than the parse itself.
+    """
+    results = []
+    for raw_text in raw_texts:
+        specs = parse_specs_regex(raw_text)
+        results.append((specs, "regex" if specs.gpu or specs.cpu else "regex_partial"))
+    return results
+
+
+async def parse_specs_deferred(raw_text: str) -> tuple[HardwareSpecs, str, str | None]:
+    """Like parse_specs, but never waits for the LLM.
+
+    Returns (specs, method, refine_id). When regex comes up short and no
+    cached LLM result exists, the partial regex result is returned at once
+    with the LLM call running in the background; its result can be fetched
+    with the returned refine_id (see GET /api/specs/refine/{refine_id}).
+    """
+    from app.services.spec_cache import SpecParseCache, spec_text_hash
+
+    specs = parse_specs_regex(raw_text)
+    if specs.gpu or specs.cpu:
+        return specs, "regex", None
+
+    cache = SpecParseCache.get_instance()
+    cached = await cache.lookup(spec_text_hash(raw_text))
+    if cached is not None:
+        if cached.gpu or cached.cpu:
+            return cached, "llm", None
+        return specs, "regex_partial", None
+
+    refine_id, _ = cache.start(raw_text)
+    return specs, "regex_partial", refine_id
@@ -1,168 +1,166 @@
-"""Multi-factor hardware tier classification.
-
-Scores hardware across four dimensions (VRAM, GPU generation, CPU, RAM)
-and maps the combined score to a tier: low / mid / high / ultra.
-"""
-
-import re
-
-# ---------------------------------------------------------------------------
-# GPU generation lookup — maps regex patterns to generation scores (0-25)
-# ---------------------------------------------------------------------------
-_NVIDIA_GENERATIONS: list[tuple[re.Pattern, int]] = [
-    (re.compile(r"(?:RTX\s*)?50\d{2}", re.I), 25),   # RTX 5000 series
-    (re.compile(r"(?:RTX\s*)?40\d{2}", re.I), 23),   # RTX 4000 series
-    (re.compile(r"(?:RTX\s*)?30\d{2}", re.I), 20),   # RTX 3000 series
-    (re.compile(r"(?:RTX\s*)?20\d{2}", re.I), 15),   # RTX 2000 series
-    (re.compile(r"GTX\s*16\d{2}", re.I), 12),         # GTX 1600 series
-    (re.compile(r"GTX\s*10\d{2}", re.I), 10),         # GTX 1000 series
-    (re.compile(r"GTX\s*9\d{2}", re.I), 5),           # GTX 900 series
-]
-
-_AMD_GENERATIONS: list[tuple[re.Pattern, int]] = [
-    (re.compile(r"RX\s*9\d{3}", re.I), 25),           # RX 9000 series
-    (re.compile(r"RX\s*7\d{3}", re.I), 23),           # RX 7000 series
-    (re.compile(r"RX\s*6\d{3}", re.I), 20),           # RX 6000 series
-    (re.compile(r"RX\s*5\d{3}", re.I), 15),           # RX 5000 series
-    (re.compile(r"RX\s*[45]\d{2}", re.I), 8),         # RX 400/500 series
-]
-
-_INTEL_ARC_GENERATIONS: list[tuple[re.Pattern, int]] = [
-    (re.compile(r"Arc\s*B\d{3}", re.I), 20),          # Battlemage
-    (re.compile(r"Arc\s*A\d{3}", re.I), 15),          # Alchemist
-]
-
-
-def _score_gpu_generation(gpu: str | None) -> int:
-    """Score the GPU based on its architecture generation (0-25)."""
-    if not gpu:
-        return 0
-    for patterns in (_NVIDIA_GENERATIONS, _AMD_GENERATIONS, _INTEL_ARC_GENERATIONS):
-        for pattern, score in patterns:
-            if pattern.search(gpu):
-                return score
-    return 5  # Unknown GPU gets a low baseline
-
-
-def _score_vram(vram_mb: int | None) -> int:
-    """Score VRAM capacity (0-30)."""
-    if not vram_mb:
-        return 0
-    gb = vram_mb / 1024
-    if gb >= 16:
-        return 30
-    if gb >= 12:
-        return 27
-    if gb >= 8:
-        return 23
-    if gb >= 6:
-        return 18
-    if gb >= 4:
-        return 12
-    return 5
-
-
-def _score_cpu(cpu: str | None, cores: int | None, speed_ghz: float | None) -> int:
-    """Score CPU based on cores, clock speed, and known high-perf models (0-25)."""
-    score = 0
-
-    # Core count scoring (0-18)
-    if cores:
-        if cores >= 16:
-            score = 18
-        elif cores >= 12:
-            score = 15
-        elif cores >= 8:
-            score = 12
-        elif cores >= 6:
-            score = 8
-        elif cores >= 4:
-            score = 5
-        else:
-            score = 2
-
-    # Clock speed bonus (0-4)
-    if speed_ghz:
-        if speed_ghz >= 5.0:
-            score += 4
-        elif speed_ghz >= 4.5:
-            score += 3
-        elif speed_ghz >= 4.0:
-            score += 2
-        elif speed_ghz >= 3.5:
-            score += 1
-
-    # Known high-performance model bonus (+3)
-    if cpu:
-        high_perf = [
-            "7800X3D", "9800X3D", "7950X", "9950X", "9900X",
-            "14900K", "13900K", "12900K", "14700K", "13700K",
-            "Ultra 9", "Ultra 7",
-        ]
-        for model in high_perf:
-            if model.lower() in cpu.lower():
-                score += 3
-                break
-
-    return min(score, 25)
-
-
-def _score_ram(ram_gb: int | None) -> int:
-    """Score system RAM (0-20)."""
-    if not ram_gb:
-        return 0
-    if ram_gb >= 64:
-        return 20
-    if ram_gb >= 32:
-        return 17
-    if ram_gb >= 16:
-        return 12
-    if ram_gb >= 8:
-        return 5
-    return 2
-
-
-def _tier_from_score(overall: int) -> str:
-    """Map overall score (0-100) to tier name."""
-    if overall >= 76:
-        return "ultra"
-    if overall >= 56:
-        return "high"
-    if overall >= 31:
-        return "mid"
-    return "low"
-
-
-def classify_hardware_tier(
-    gpu: str | None = None,
-    vram_mb: int | None = None,
-    cpu: str | None = None,
-    ram_gb: int | None = None,
-    cpu_cores: int | None = None,
-    cpu_speed_ghz: float | None = None,
-) -> dict:
-    """Classify hardware into a tier using multi-factor scoring.
-
-    Returns a dict with:
-        tier: str           — "low", "mid", "high", or "ultra"
-        vram_score: int     — VRAM capacity score (0-30)
-        gpu_gen_score: int  — GPU architecture generation score (0-25)
-        cpu_score: int      — CPU performance score (0-25)
-        ram_score: int      — System RAM score (0-20)
-        overall_score: int  — Combined score (0-100)
-    """
-    vram_score = _score_vram(vram_mb)
-    gpu_gen_score = _score_gpu_generation(gpu)
-    cpu_score = _score_cpu(cpu, cpu_cores, cpu_speed_ghz)
-    ram_score = _score_ram(ram_gb)
-
-    overall = vram_score + gpu_gen_score + cpu_score + ram_score
-
-    return {
-        "tier": _tier_from_score(overall),
-        "vram_score": vram_score,
-        "gpu_gen_score": gpu_gen_score,
-        "cpu_score": cpu_score,
-        "ram_score": ram_score,
-        "overall_score": overall,
-    }
+"""Multi-factor hardware tier classification.
+
+Scores hardware across four dimensions (VRAM, GPU performance, CPU, RAM)
+and maps the combined score to a tier: low / mid / high / ultra. GPU
+performance and the high-end CPU bonus come from the packaged hardware
+catalog (see hardware_catalog.py), so new models are a data update.
+
+Numeric scores come from band tables — ascending thresholds and the score
+for each band — looked up with bisect, so classify_hardware_tier and the
+batch classify_hardware_tiers share one definition of every cut-off.
+Scores that depend on model names are memoized per distinct name; a batch
+of stored profiles repeats the same few GPUs and CPUs many times.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from app.services.hardware_catalog import HardwareCatalog
+
+# ---------------------------------------------------------------------------
+# Score bands — (ascending thresholds, score per band). A value below the
+# first threshold gets the first score; at or above threshold i, score i+1.
+# ---------------------------------------------------------------------------
+_VRAM_GB_BANDS = ((4, 6, 8, 12, 16), (5, 12, 18, 23, 27, 30))
+_CPU_CORE_BANDS = ((4, 6, 8, 12, 16), (2, 5, 8, 12, 15, 18))
+_CPU_SPEED_BANDS = ((3.5, 4.0, 4.5, 5.0), (0, 1, 2, 3, 4))
+_RAM_GB_BANDS = ((8, 16, 32, 64), (2, 5, 12, 17, 20))
+# Catalog performance index (RTX 4090 = 100) → GPU score
+_GPU_PERF_BANDS = ((6, 9, 14, 20, 28, 40, 60, 90), (3, 5, 8, 11, 14, 17, 20, 23, 25))
+_TIER_BANDS = ((31, 56, 76), ("low", "mid", "high", "ultra"))
+
+_UNKNOWN_GPU_SCORE = 5
+
+
+def _band(bands: tuple[tuple, tuple], value: float):
+    thresholds, scores = bands
+    return scores[bisect_right(thresholds, value)]
+
+
+def _score_vram(vram_mb: int | None) -> int:
+    """Score VRAM capacity (0-30)."""
+    if not vram_mb:
+        return 0
+    return _band(_VRAM_GB_BANDS, vram_mb / 1024)
+
+
+@lru_cache(maxsize=1024)
+def _score_gpu_performance(gpu: str | None) -> int:
+    """Score the GPU by its catalog performance index (0-25).
+
+    Uncatalogued cards are estimated from their series, and no card scores
+    below its series' floor — the score its generation had before the
+    catalog — so re-tiering stored profiles never demotes them.
+    """
+    if not gpu:
+        return 0
+    catalog = HardwareCatalog.get_instance()
+    model = catalog.estimate_gpu(gpu)
+    score = _UNKNOWN_GPU_SCORE if model is None else _band(_GPU_PERF_BANDS, model.perf)
+    series = catalog.lookup_gpu_series(gpu)
+    return max(score, series.score_floor) if series else score
+
+
+@lru_cache(maxsize=1024)
+def _is_high_perf_cpu(cpu: str) -> bool:
+    model = HardwareCatalog.get_instance().lookup_cpu(cpu, fuzzy=False)
+    return bool(model and model.high_perf)
+
+
+def _score_cpu(cpu: str | None, cores: int | None, speed_ghz: float | None) -> int:
+    """Score CPU based on cores, clock speed, and known high-perf models (0-25)."""
+    score = 0
+
+    # Core count scoring (0-18)
+    if cores:
+        score = _band(_CPU_CORE_BANDS, cores)
+
+    # Clock speed bonus (0-4)
+    if speed_ghz:
+        score += _band(_CPU_SPEED_BANDS, speed_ghz)
+
+    # Known high-performance model bonus (+3)
+    if cpu and _is_high_perf_cpu(cpu):
+        score += 3
+
+    return min(score, 25)
+
+
+def _score_ram(ram_gb: int | None) -> int:
+    """Score system RAM (0-20)."""
+    if not ram_gb:
+        return 0
+    return _band(_RAM_GB_BANDS, ram_gb)
+
+
+def _tier_from_score(overall: int) -> str:
+    """Map overall score (0-100) to tier name."""
+    return _band(_TIER_BANDS, overall)
+
+
+def classify_hardware_tier(
+    gpu: str | None = None,
+    vram_mb: int | None = None,
+    cpu: str | None = None,
+    ram_gb: int | None = None,
+    cpu_cores: int | None = None,
+    cpu_speed_ghz: float | None = None,
+) -> dict:
+    """Classify hardware into a tier using multi-factor scoring.
+
+    Returns a dict with:
+        tier: str           — "low", "mid", "high", or "ultra"
+        vram_score: int     — VRAM capacity score (0-30)
+        gpu_gen_score: int  — GPU performance score (0-25); the key predates
+                              performance scoring and is kept for clients
+        cpu_score: int      — CPU performance score (0-25)
+        ram_score: int      — System RAM score (0-20)
+        overall_score: int  — Combined score (0-100)
+    """
+    vram_score = _score_vram(vram_mb)
+    gpu_gen_score = _score_gpu_performance(gpu)
+    cpu_score = _score_cpu(cpu, cpu_cores, cpu_speed_ghz)
+    ram_score = _score_ram(ram_gb)
+
+    overall = vram_score + gpu_gen_score + cpu_score + ram_score
+
+    return {
+        "tier": _tier_from_score(overall),
+        "vram_score": vram_score,
+        "gpu_gen_score": gpu_gen_score,
+        "cpu_score": cpu_score,
+        "ram_score": ram_score,
+        "overall_score": overall,
+    }
+
+
+def _field(record: Any, *names: str):
+    """First non-empty of `names` on a mapping or an object."""
+    for name in names:
+        value = record.get(name) if isinstance(record, Mapping) else getattr(record, name, None)
+        if value:
+            return value
+    return None
+
+
+def classify_hardware_tiers(records: Iterable[Any]) -> list[dict]:
+    """Classify many machines at once; each result equals what
+    classify_hardware_tier returns for that record.
+
+    A record is a mapping or an object (HardwareSpecs, User, ...) with the
+    classify_hardware_tier fields; User's `gpu_model`/`cpu_model` are
+    accepted for `gpu`/`cpu`. Missing fields count as unknown.
+    """
+    return [
+        classify_hardware_tier(
+            gpu=_field(record, "gpu", "gpu_model"),
+            vram_mb=_field(record, "vram_mb"),
+            cpu=_field(record, "cpu", "cpu_model"),
+            ram_gb=_field(record, "ram_gb"),
+            cpu_cores=_field(record, "cpu_cores"),
+            cpu_speed_ghz=_field(record, "cpu_speed_ghz"),
+        )
+        for record in records
+    ]
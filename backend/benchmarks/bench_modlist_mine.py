@@ -0,0 +1,148 @@
+"""Benchmark GET /api/modlist/mine against a seeded SQLite database.
+
+Seeds N modlists (default 10,000) spread over users so the benchmarked user
+owns `--per-user` of them, then times:
+
+- the previous N+1 implementation (two queries per modlist)
+- /mine with selectinload, full result
+- /mine with keyset pagination (first page and a deep page)
+- /mine/summary
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_modlist_mine.py [--modlists 10000]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.modlist import get_my_modlist_summaries, get_my_modlists
+from app.database import Base
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.models.user import User
+
+
+# Plain JSON request (no NDJSON Accept header)
+_REQUEST = Request({"type": "http", "headers": []})
+
+
+async def seed(session: AsyncSession, modlists: int, per_user: int, entries: int) -> User:
+    users = [User(email=f"bench{i}@example.com") for i in range(max(1, modlists // per_user))]
+    session.add_all(users)
+    await session.flush()
+
+    base = datetime(2025, 1, 1)
+    modlist_rows, entry_rows, flag_rows = [], [], []
+    for i in range(modlists):
+        ml_id = uuid.uuid4()
+        modlist_rows.append({
+            "id": ml_id, "game_id": 1, "playstyle_id": 1,
+            "user_id": users[i % len(users)].id,
+            "llm_provider": "bench", "created_at": base + timedelta(minutes=i),
+        })
+        entry_rows.extend(
+            {"modlist_id": ml_id, "name": f"Mod {n}", "load_order": n, "enabled": True,
+             "download_status": "pending", "is_patch": False}
+            for n in range(entries)
+        )
+        flag_rows.append({
+            "modlist_id": ml_id, "mod_a_name": "A", "mod_b_name": "B",
+            "issue": "bench", "severity": "warning",
+        })
+
+    await session.execute(insert(Modlist), modlist_rows)
+    await session.execute(insert(ModlistEntry), entry_rows)
+    await session.execute(insert(ModlistKnowledgeFlag), flag_rows)
+    await session.commit()
+    return users[0]
+
+
+async def legacy_mine(session: AsyncSession, user: User) -> int:
+    """The pre-optimization loop: one query for modlists, two per modlist."""
+    result = await session.execute(
+        select(Modlist).where(Modlist.user_id == user.id).order_by(Modlist.created_at.desc())
+    )
+    total = 0
+    for ml in result.scalars().all():
+        entries = await session.execute(
+            select(ModlistEntry).where(ModlistEntry.modlist_id == ml.id)
+            .order_by(ModlistEntry.load_order)
+        )
+        flags = await session.execute(
+            select(ModlistKnowledgeFlag).where(ModlistKnowledgeFlag.modlist_id == ml.id)
+        )
+        total += len(entries.scalars().all()) + len(flags.scalars().all())
+    return total
+
+
+async def timed(label: str, make_coro, sessions, queries: list[int], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        async with sessions() as session:
+            queries[0] = 0
+            start = time.perf_counter()
+            await make_coro(session)
+            best = min(best, time.perf_counter() - start)
+    print(f"{label:<36} {best * 1000:9.1f} ms  {queries[0]:5d} queries")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modlists", type=int, default=10_000)
+    parser.add_argument("--per-user", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    queries = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(*_):
+        queries[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    start = time.perf_counter()
+    async with sessions() as session:
+        user = await seed(session, args.modlists, args.per_user, args.entries)
+    print(f"Seeded {args.modlists} modlists x {args.entries} entries "
+          f"in {time.perf_counter() - start:.1f}s\n")
+
+    async def deep_page(session):
+        # Walk to the last page to show keyset cost stays flat
+        cursor = None
+        while True:
+            response = Response()
+            await get_my_modlists(_REQUEST, response, limit=20, cursor=cursor, current_user=user, db=session)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                return
+
+    await timed("legacy N+1 (all lists)", lambda s: legacy_mine(s, user), sessions, queries, args.repeat)
+    await timed("/mine selectinload (all lists)", lambda s: get_my_modlists(
+        _REQUEST, Response(), limit=None, cursor=None, current_user=user, db=s), sessions, queries, args.repeat)
+    await timed("/mine?limit=20 (first page)", lambda s: get_my_modlists(
+        _REQUEST, Response(), limit=20, cursor=None, current_user=user, db=s), sessions, queries, args.repeat)
+    await timed("/mine?limit=20 (every page)", deep_page, sessions, queries, args.repeat)
+    await timed("/mine/summary (all lists)", lambda s: get_my_modlist_summaries(
+        Response(), limit=None, cursor=None, current_user=user, db=s), sessions, queries, args.repeat)
+
+    await engine.dispose()
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Benchmark save_modlist_to_db: per-row ORM adds vs bulk INSERT.
+
+Saves `--modlists` generated results of `--entries` entries each into a
+fresh SQLite database and reports rows/sec for both strategies.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_save_modlist.py [--entries 80]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.modlist import save_modlist_to_db
+from app.database import Base
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.modlist_generator import GenerationResult
+
+
+async def orm_save(
+    db: AsyncSession, request: ModlistGenerateRequest, result: GenerationResult,
+) -> Modlist:
+    """The previous implementation: one tracked ORM object per row."""
+    modlist = Modlist(
+        game_id=request.game_id, playstyle_id=request.playstyle_id,
+        llm_provider=result.llm_provider,
+    )
+    db.add(modlist)
+    await db.flush()
+    for i, mod_data in enumerate(result.entries):
+        db.add(ModlistEntry(
+            modlist_id=modlist.id,
+            nexus_mod_id=mod_data.get("nexus_mod_id"),
+            name=mod_data.get("name", "Unknown"),
+            author=mod_data.get("author"),
+            summary=mod_data.get("summary"),
+            reason=mod_data.get("reason"),
+            load_order=mod_data.get("load_order", i + 1),
+            enabled=True,
+            download_status="pending",
+            is_patch=mod_data.get("is_patch", False),
+            patches_mods=mod_data.get("patches_mods"),
+        ))
+    for flag_data in result.knowledge_flags:
+        db.add(ModlistKnowledgeFlag(
+            modlist_id=modlist.id,
+            mod_a_name=flag_data["mod_a"],
+            mod_b_name=flag_data["mod_b"],
+            issue=flag_data["issue"],
+            severity=flag_data.get("severity", "warning"),
+        ))
+    await db.commit()
+    return modlist
+
+
+def make_result(entries: int) -> GenerationResult:
+    return GenerationResult(
+        entries=[
+            {
+                "nexus_mod_id": 1000 + n, "name": f"Mod {n}", "author": "bench",
+                "summary": "A benchmark mod " * 8, "reason": "Fits the playstyle",
+                "load_order": n + 1, "is_patch": n % 10 == 0,
+                "patches_mods": ["Mod 1"] if n % 10 == 0 else None,
+            }
+            for n in range(entries)
+        ],
+        knowledge_flags=[
+            {"mod_a": "Mod 1", "mod_b": "Mod 2", "issue": "bench", "severity": "warning"}
+            for _ in range(max(1, entries // 20))
+        ],
+        llm_provider="bench",
+    )
+
+
+async def run(label: str, save, modlists: int, entries: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    request = ModlistGenerateRequest(game_id=1, playstyle_id=1)
+    result = make_result(entries)
+    rows_per_save = 1 + len(result.entries) + len(result.knowledge_flags)
+
+    start = time.perf_counter()
+    for _ in range(modlists):
+        async with sessions() as db:
+            await save(db, request, result)
+    elapsed = time.perf_counter() - start
+
+    total = rows_per_save * modlists
+    print(f"{label:<24} {total:7d} rows in {elapsed:6.2f}s  {total / elapsed:9.0f} rows/sec")
+    await engine.dispose()
+    os.remove(path)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modlists", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=80)
+    args = parser.parse_args()
+
+    await run("ORM add per row", orm_save, args.modlists, args.entries)
+    await run("bulk insert", save_modlist_to_db, args.modlists, args.entries)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Benchmark JSON serialization cost of one generation: stdlib json vs orjson.
+
+Builds a synthetic but representative generation workload — tool results
+returned to the LLM, progress events framed for SSE (replayed to
+`--subscribers` clients), per-turn checkpoint snapshots and the final
+ETag hash — and reports total serialization time for both encoders.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_serialization.py [--mods 80] [--runs 20]
+"""
+
+import argparse
+import hashlib
+import json
+import time
+
+from app.serialization import dumps, dumps_canonical, sse_frame
+
+
+def build_workload(mods: int, subscribers: int) -> dict:
+    search_result = {
+        "results": [
+            {
+                "mod_id": 1000 + i,
+                "name": f"Example Mod {i}",
+                "author": "Modder",
+                "summary": "A representative summary of reasonable length. " * 4,
+                "endorsements": 12345 + i,
+                "category": "User Interface",
+                "updated": "2025-01-01T00:00:00Z",
+            }
+            for i in range(15)
+        ],
+        "count": 15,
+    }
+    entries = [
+        {
+            "nexus_mod_id": 1000 + i, "name": f"Example Mod {i}", "author": "Modder",
+            "summary": "Summary " * 20, "reason": "Reason " * 10, "load_order": i + 1,
+        }
+        for i in range(mods)
+    ]
+    # Roughly: a search + details lookup per added mod, plus bookkeeping events
+    tool_results = [search_result] * (mods * 2)
+    events = (
+        [{"type": "searching", "query": "ui overhaul"}] * mods
+        + [{"type": "search_results", "count": 15, "sample_names": ["A", "B", "C"]}] * mods
+        + [{"type": "mod_added", "name": f"Example Mod {i}", "reason": "r" * 80} for i in range(mods)]
+    ) * subscribers
+    history = [{"role": "tool", "tool_call_id": "call", "content": json.dumps(search_result)}] * 20
+    checkpoints = [
+        {"phase_number": 3, "iterations": n, "messages": history, "modlist": entries[:n]}
+        for n in range(0, mods, 4)
+    ]
+    return {
+        "tool_results": tool_results, "events": events,
+        "checkpoints": checkpoints, "final": {"entries": entries},
+    }
+
+
+def run_stdlib(work: dict) -> None:
+    for result in work["tool_results"]:
+        json.dumps(result)
+    for event in work["events"]:
+        f"data: {json.dumps(event)}\n\n".encode()
+    for checkpoint in work["checkpoints"]:
+        json.dumps(checkpoint)
+    canonical = json.dumps(work["final"], sort_keys=True, separators=(",", ":"), default=str)
+    hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def run_orjson(work: dict) -> None:
+    for result in work["tool_results"]:
+        dumps(result)
+    for event in work["events"]:
+        sse_frame(event)
+    for checkpoint in work["checkpoints"]:
+        dumps(checkpoint)
+    hashlib.sha256(dumps_canonical(work["final"])).hexdigest()
+
+
+def timed(label: str, fn, work: dict, runs: int) -> float:
+    fn(work)  # warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(work)
+    per_generation = (time.perf_counter() - start) / runs * 1000
+    print(f"{label:<10} {per_generation:8.2f} ms / generation")
+    return per_generation
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mods", type=int, default=80)
+    parser.add_argument("--subscribers", type=int, default=2)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    work = build_workload(args.mods, args.subscribers)
+    stdlib = timed("json", run_stdlib, work, args.runs)
+    fast = timed("orjson", run_orjson, work, args.runs)
+    print(f"speedup    {stdlib / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
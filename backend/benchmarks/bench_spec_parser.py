@@ -0,0 +1,44 @@
+"""Benchmark regex spec parsing over the pasted-dump corpus.
+
+Compares the keyword-anchored scan used by parse_specs_regex against the
+previous behaviour of searching the whole text with every pattern, on each
+fixture in tests/fixtures/spec_dumps and on all of them concatenated.
+
+Usage (from backend/):
+    PYTHONPATH=. python benchmarks/bench_spec_parser.py [--runs 200]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.services.spec_parser import _FullScan, _parse_scan, _Scan
+
+DUMPS = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "spec_dumps"
+
+
+def timed(scan_cls, text: str, runs: int) -> float:
+    _parse_scan(scan_cls(text))  # warm up
+    start = time.perf_counter()
+    for _ in range(runs):
+        _parse_scan(scan_cls(text))
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    corpus = {path.stem: path.read_text(encoding="utf-8") for path in sorted(DUMPS.glob("*.txt"))}
+    corpus["all (concatenated)"] = "\n".join(corpus.values())
+
+    print(f"{'dump':<20} {'chars':>7} {'full ms':>9} {'scan ms':>9} {'speedup':>8}")
+    for name, text in corpus.items():
+        full = timed(_FullScan, text, args.runs)
+        scan = timed(_Scan, text, args.runs)
+        print(f"{name:<20} {len(text):>7} {full:>9.3f} {scan:>9.3f} {full / scan:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,19 @@
 import asyncio
 
+import orjson
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.database import Base, get_db
+from app.database import Base, get_db, get_read_db
 from app.main import app
+from app.services.modlist_generator import GenerationSession, _build_phase1_handlers
 
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+DOMAIN = "skyrimspecialedition"
 
 engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 TestSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -44,6 +47,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -52,3 +56,28 @@ async def client(db_session):
         yield ac
 
     app.dependency_overrides.clear()
+
+
+class FakeNexus:
+    """Serves get_mod_files from a dict of mod ID → file list, recording each call."""
+
+    def __init__(self, files: dict[int, list[dict]] | None = None):
+        self.files = files or {}
+        self.file_calls: list[int] = []
+
+    async def get_mod_files(self, game_domain, mod_id):
+        self.file_calls.append(mod_id)
+        return self.files.get(mod_id, [])
+
+
+def generation_session(files: dict[int, list[dict]] | None = None, **kwargs) -> GenerationSession:
+    """A GenerationSession over a FakeNexus; kwargs go to GenerationSession."""
+    return GenerationSession(game_domain=DOMAIN, nexus=FakeNexus(files), **kwargs)
+
+
+async def add_mod(session: GenerationSession, mod_id: int, name: str | None = None, **kwargs) -> dict:
+    """Call the add_to_modlist tool and decode its response."""
+    add = _build_phase1_handlers(session)["add_to_modlist"]
+    return orjson.loads(await add(
+        mod_id=mod_id, name=name or f"Mod {mod_id}", reason="test", load_order=1, **kwargs,
+    ))
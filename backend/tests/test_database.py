@@ -0,0 +1,21 @@
+from app.config import Settings
+from app.database import _engine_kwargs, pool_status
+
+
+def test_sqlite_keeps_default_pool():
+    assert _engine_kwargs("sqlite+aiosqlite:///./x.db", Settings()) == {"echo": False}
+
+
+def test_asyncpg_gets_pool_and_statement_cache_settings():
+    settings = Settings(database_pool_size=5, database_statement_cache_size=0)
+    kwargs = _engine_kwargs("postgresql+asyncpg://u:p@db/app", settings)
+    assert kwargs["pool_size"] == 5
+    assert kwargs["pool_pre_ping"] is True
+    assert kwargs["connect_args"]["statement_cache_size"] == 0
+    assert kwargs["connect_args"]["prepared_statement_cache_size"] == 0
+
+
+def test_pool_status_reports_primary():
+    status = pool_status()
+    assert "primary" in status
+    assert "replica" not in status
@@ -0,0 +1,55 @@
+import pytest
+
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.generation_cache import GenerationResultCache, request_fingerprint
+
+
+def test_lookup_hits_and_expires(monkeypatch):
+    cache = GenerationResultCache(ttl_seconds=60, max_entries=10)
+    now = [1000.0]
+    monkeypatch.setattr("app.services.generation_cache.time.time", lambda: now[0])
+
+    cache.store("fp", "modlist-1")
+    assert cache.lookup("fp") == "modlist-1"
+
+    now[0] += 61
+    assert cache.lookup("fp") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_evicts_least_recently_used():
+    cache = GenerationResultCache(ttl_seconds=60, max_entries=2)
+    cache.store("a", "1")
+    cache.store("b", "2")
+    cache.lookup("a")
+    cache.store("c", "3")
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == "1"
+
+
+def test_invalidate_modlist_drops_all_fingerprints():
+    cache = GenerationResultCache(ttl_seconds=60, max_entries=10)
+    cache.store("a", "1")
+    cache.store("b", "1")
+    cache.store("c", "2")
+    cache.invalidate_modlist("1")
+    assert cache.stats()["entries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_separates_budgets(db_session):
+    base = dict(game_id=1, playstyle_id=1, gpu="RTX 3070", vram_mb=8192, ram_gb=32)
+
+    async def fingerprint(**overrides):
+        return await request_fingerprint(db_session, ModlistGenerateRequest(**{**base, **overrides}))
+
+    cache = GenerationResultCache(ttl_seconds=60, max_entries=10)
+    cache.store(await fingerprint(available_storage_gb=500), "big-drive")
+
+    assert cache.lookup(await fingerprint(available_storage_gb=500)) == "big-drive"
+    # Same tier and budget bucket: the 80% share of both rounds to 400 GB
+    assert await fingerprint(available_storage_gb=500) == await fingerprint(available_storage_gb=501)
+    assert cache.lookup(await fingerprint(available_storage_gb=60)) is None
+    assert cache.lookup(await fingerprint(available_storage_gb=500, vram_mb=10240)) is None
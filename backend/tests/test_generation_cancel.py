@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.services.generation_manager import GenerationManager
+
+
+async def _run_forever():
+    await asyncio.sleep(3600)
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_task_emits_cancelled():
+    manager = GenerationManager()
+    gid = manager.create_generation()
+
+    async def task_body():
+        try:
+            await _run_forever()
+        except asyncio.CancelledError:
+            manager.set_cancelled(gid)
+            raise
+
+    task = asyncio.create_task(task_body())
+    manager.attach_task(gid, task)
+    await asyncio.sleep(0)
+
+    assert manager.cancel(gid) is True
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert manager.get_state(gid).status == "cancelled"
+    assert manager.get_state(gid).events[-1]["type"] == "cancelled"
+    assert manager.cancel(gid) is False
+
+
+@pytest.mark.asyncio
+async def test_orphaned_generation_is_cancelled_after_grace():
+    manager = GenerationManager(orphan_grace_seconds=0.05)
+    gid = manager.create_generation()
+    task = asyncio.create_task(_run_forever())
+    manager.attach_task(gid, task)
+
+    queue = await manager.subscribe(gid)
+    manager.unsubscribe(gid, queue)
+    await asyncio.sleep(0.1)
+
+    assert task.cancelled() or task.cancelling()
+
+
+@pytest.mark.asyncio
+async def test_resubscribing_disarms_orphan_timer():
+    manager = GenerationManager(orphan_grace_seconds=0.05)
+    gid = manager.create_generation()
+    task = asyncio.create_task(_run_forever())
+    manager.attach_task(gid, task)
+
+    queue = await manager.subscribe(gid)
+    manager.unsubscribe(gid, queue)
+    await manager.subscribe(gid)
+    await asyncio.sleep(0.1)
+
+    assert not task.done()
+    task.cancel()
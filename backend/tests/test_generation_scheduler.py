@@ -0,0 +1,170 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.services.generation_manager import GenerationManager
+from app.services.generation_scheduler import GenerationScheduler, SchedulerFullError
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = GenerationManager()
+    monkeypatch.setattr(GenerationManager, "_instance", manager)
+    return manager
+
+
+class _Jobs:
+    """Generation jobs that block until released, recording their start order."""
+
+    def __init__(self, manager: GenerationManager):
+        self.manager = manager
+        self.started: list[str] = []
+        self._release: dict[str, asyncio.Event] = {}
+
+    def submit(self, scheduler: GenerationScheduler, user_id: str) -> str:
+        gid = self.manager.create_generation(user_id=user_id)
+        release = self._release[gid] = asyncio.Event()
+
+        async def run():
+            self.started.append(gid)
+            await release.wait()
+            self.manager.set_complete(gid, "modlist")
+
+        scheduler.submit(gid, user_id, run)
+        return gid
+
+    async def finish(self, gid: str) -> None:
+        self._release[gid].set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    async def finish_all(self) -> None:
+        for release in self._release.values():
+            release.set()
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+
+@pytest_asyncio.fixture
+async def jobs(manager):
+    jobs = _Jobs(manager)
+    yield jobs
+    await jobs.finish_all()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_and_per_user_limits(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=2, max_per_user=1, max_queued=10)
+
+    a1 = jobs.submit(scheduler, "alice")
+    a2 = jobs.submit(scheduler, "alice")
+    b1 = jobs.submit(scheduler, "bob")
+    c1 = jobs.submit(scheduler, "carol")
+    await asyncio.sleep(0)
+
+    # a2 waits on alice's per-user limit even though a slot was free for it
+    assert jobs.started == [a1, b1]
+    assert scheduler.stats()["running"] == 2
+    assert scheduler.queued_count() == 2
+
+    await jobs.finish(a1)
+    # a2 was queued before carol; carol then waits on the concurrency limit
+    assert jobs.started == [a1, b1, a2]
+    assert c1 not in jobs.started
+
+    await jobs.finish(b1)
+    assert jobs.started == [a1, b1, a2, c1]
+
+
+@pytest.mark.asyncio
+async def test_dispatch_is_round_robin_across_users(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=1, max_per_user=1, max_queued=10)
+
+    first = jobs.submit(scheduler, "alice")
+    a2 = jobs.submit(scheduler, "alice")
+    a3 = jobs.submit(scheduler, "alice")
+    b1 = jobs.submit(scheduler, "bob")
+    b2 = jobs.submit(scheduler, "bob")
+    await asyncio.sleep(0)
+
+    for gid in (first, a2, b1, a3, b2):
+        await jobs.finish(gid)
+    assert jobs.started == [first, a2, b1, a3, b2]
+
+
+@pytest.mark.asyncio
+async def test_queued_jobs_get_position_events(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=1, max_per_user=1, max_queued=10)
+
+    running = jobs.submit(scheduler, "alice")
+    second = jobs.submit(scheduler, "bob")
+    third = jobs.submit(scheduler, "carol")
+    await asyncio.sleep(0)
+
+    def queued(gid):
+        return [
+            (e["position"], e["queue_length"])
+            for e in manager.get_state(gid).events if e["type"] == "queued"
+        ]
+
+    assert queued(running) == []
+    # A job's position is only re-sent when it changes
+    assert queued(second) == [(1, 1)]
+    assert queued(third) == [(2, 2)]
+    assert manager.get_state(third).status == "queued"
+
+    await jobs.finish(running)
+    assert manager.get_state(second).status == "running"
+    assert manager.get_state(second).events[-1]["type"] == "started"
+    assert queued(third) == [(2, 2), (1, 1)]
+
+
+@pytest.mark.asyncio
+async def test_submit_raises_when_queue_is_full(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=1, max_per_user=1, max_queued=1)
+
+    jobs.submit(scheduler, "alice")
+    jobs.submit(scheduler, "bob")
+    assert not scheduler.has_capacity()
+    with pytest.raises(SchedulerFullError):
+        jobs.submit(scheduler, "carol")
+
+
+@pytest.mark.asyncio
+async def test_drain_errors_queued_jobs_and_cancels_stragglers(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=1, max_per_user=1, max_queued=10)
+
+    running = jobs.submit(scheduler, "alice")
+    queued = jobs.submit(scheduler, "bob")
+    await asyncio.sleep(0)
+
+    await scheduler.drain(timeout=0.01)
+
+    assert manager.get_state(queued).status == "error"
+    assert queued not in jobs.started
+    assert manager.get_state(running).status == "cancelled"
+    assert scheduler.stats()["running"] == 0
+    with pytest.raises(SchedulerFullError):
+        jobs.submit(scheduler, "carol")
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_first_step_frees_the_slot(manager, jobs):
+    scheduler = GenerationScheduler(max_concurrent=1, max_per_user=1, max_queued=10)
+
+    cancelled = jobs.submit(scheduler, "alice")
+    waiting = jobs.submit(scheduler, "bob")
+    # The task exists but hasn't run yet, so none of its code sees the cancel
+    assert manager.cancel(cancelled) is True
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert cancelled not in jobs.started
+    assert manager.get_state(cancelled).status == "cancelled"
+    assert manager.get_state(cancelled).events[-1]["type"] == "cancelled"
+    assert jobs.started == [waiting]
+    assert scheduler.stats()["running"] == 1
+
+    await jobs.finish(waiting)
+    assert scheduler.stats()["running"] == 0
@@ -0,0 +1,86 @@
+"""Tests for duplicate rejection and compatibility checks on generated mods."""
+
+import orjson
+import pytest
+
+from app.models.compatibility import CompatibilityRule
+from app.models.mod import Mod
+from app.services.modlist_generator import (
+    GenerationSession,
+    _build_phase2_handlers,
+    _load_compatibility_index,
+    normalize_mod_name,
+)
+from tests.conftest import DOMAIN, add_mod, generation_session
+
+
+def test_normalize_mod_name():
+    assert normalize_mod_name("SkyUI - SE") == normalize_mod_name("  skyui se") == "skyui se"
+
+
+@pytest.mark.asyncio
+async def test_duplicates_rejected_by_id_or_name_without_nexus_call():
+    session = generation_session()
+    assert (await add_mod(session, 12604, "SkyUI"))["status"] == "added"
+
+    assert (await add_mod(session, 12604, "Sky UI 5.2"))["status"] == "duplicate"
+    assert (await add_mod(session, 99999, "skyui"))["status"] == "duplicate"
+    add_patch = _build_phase2_handlers(session)["add_patch"]
+    patch = orjson.loads(await add_patch(
+        mod_id=12604, name="SkyUI", patches_mods=[], reason="", load_order=2,
+    ))
+    assert patch["status"] == "duplicate"
+
+    assert len(session.modlist) == 1 and not session.patches
+    assert session.nexus.file_calls == [12604]
+
+
+def test_index_is_rebuilt_from_snapshot():
+    session = generation_session()
+    session.add_entry({"nexus_mod_id": 1, "name": "Mod One"})
+    session.add_entry({"nexus_mod_id": 2, "name": "A Patch", "is_patch": True})
+
+    restored = GenerationSession.from_snapshot(session.to_snapshot(), nexus=None)
+    assert restored.find_entry(2)["name"] == "A Patch"
+    assert restored.find_entry(name="MOD-ONE")["nexus_mod_id"] == 1
+
+    restored.clear_entries()
+    assert restored.find_entry(1) is None
+
+
+@pytest.mark.asyncio
+async def test_seeded_rules_checked_on_add(db_session):
+    mods = {
+        nexus_id: Mod(nexus_mod_id=nexus_id, nexus_game_domain=DOMAIN, name=name)
+        for nexus_id, name in [
+            (1, "Wildcat"), (2, "Valhalla Combat"), (3, "Frostfall"), (4, "SkyUI"),
+            (5, "Apocalypse"), (6, "Ordinator"), (7, "Apocalypse-Ordinator Patch"),
+        ]
+    }
+    db_session.add_all(mods.values())
+    await db_session.flush()
+    db_session.add_all([
+        CompatibilityRule(mod_id=mods[1].id, related_mod_id=mods[2].id, rule_type="conflicts"),
+        CompatibilityRule(mod_id=mods[3].id, related_mod_id=mods[4].id, rule_type="requires",
+                          notes="MCM menu"),
+        CompatibilityRule(mod_id=mods[5].id, related_mod_id=mods[6].id, rule_type="patch_available",
+                          patch_mod_id=mods[7].id),
+    ])
+    await db_session.commit()
+
+    session = generation_session(compat_rules=await _load_compatibility_index(db_session, DOMAIN))
+    assert await _load_compatibility_index(db_session, "fallout4") == {}
+
+    await add_mod(session, 2, "Valhalla Combat")
+    rejected = await add_mod(session, 1, "Wildcat")
+    assert rejected["status"] == "rejected"
+    assert rejected["conflicts"][0]["mod"] == "Valhalla Combat"
+
+    frostfall = await add_mod(session, 3, "Frostfall")
+    assert frostfall["missing_requirements"] == [{"mod": "SkyUI", "nexus_mod_id": 4, "notes": "MCM menu"}]
+    # "requires" is one-way: adding SkyUI asks for nothing
+    assert "missing_requirements" not in await add_mod(session, 4, "SkyUI")
+
+    await add_mod(session, 6, "Ordinator")
+    apocalypse = await add_mod(session, 5, "Apocalypse")
+    assert apocalypse["patches_needed"][0]["patch_mod_id"] == 7
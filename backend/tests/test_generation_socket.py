@@ -0,0 +1,286 @@
+import msgpack
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.api import generation as generation_api
+from app.main import app
+from app.models.user import User
+from app.services.auth import create_access_token
+from app.services.generation_manager import GenerationManager
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = GenerationManager()
+    monkeypatch.setattr(GenerationManager, "_instance", manager)
+    return manager
+
+
+@pytest.fixture(autouse=True)
+def socket_db(monkeypatch):
+    # The test client runs the socket on its own event loop, so it can't
+    # share pooled connections with the pytest loop
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=NullPool)
+    monkeypatch.setattr(
+        generation_api, "async_session",
+        sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+    )
+
+
+@pytest_asyncio.fixture
+async def user(db_session):
+    user = User(email="socket@example.com")
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+def _token(user: User) -> str:
+    token, _ = create_access_token(user.id, user.email, True)
+    return token
+
+
+def _receive_until(receive, predicate, limit: int = 20) -> list[dict]:
+    """Frames up to and including the first one matching `predicate`."""
+    frames = []
+    for _ in range(limit):
+        frames.append(receive())
+        if predicate(frames[-1]):
+            return frames
+    raise AssertionError(f"No matching frame in {frames}")
+
+
+def _receive_all(receive, *predicates, limit: int = 20) -> list[dict]:
+    """Frames up to the point where every predicate has matched one, in any order."""
+    pending = list(predicates)
+    frames = []
+    for _ in range(limit):
+        frames.append(receive())
+        pending = [p for p in pending if not p(frames[-1])]
+        if not pending:
+            return frames
+    raise AssertionError(f"No matching frames in {frames}")
+
+
+def _is_ack(action: str, gid: str | None = None):
+    return lambda f: f["type"] == "ack" and f["action"] == action and (
+        gid is None or f["generation_id"] == gid
+    )
+
+
+def _is_event(event_type: str, gid: str):
+    return lambda f: (
+        f["type"] == "event" and f["generation_id"] == gid
+        and f["event"]["type"] == event_type
+    )
+
+
+def _is_error(action: str):
+    return lambda f: f["type"] == "error" and f.get("action") == action
+
+
+# ── Authentication ──
+
+
+def test_first_frame_must_authenticate(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        ws.send_json({"type": "subscribe"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 4401
+
+
+def test_invalid_token_is_rejected(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        ws.send_json({"type": "auth", "token": "not-a-jwt"})
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 4401
+
+
+def test_silent_client_is_closed_after_auth_timeout(user, manager, monkeypatch):
+    monkeypatch.setattr(generation_api, "_WS_AUTH_TIMEOUT", 0.05)
+    gid = manager.create_generation(user_id=str(user.id))
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            ws.receive_json()
+    assert closed.value.code == 4401
+
+
+# ── Transport negotiation ──
+
+
+def test_json_socket_replays_then_streams_events(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+    manager.emit(gid, {"type": "phase_start", "number": 1})
+
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        assert ws.accepted_subprotocol is None
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_all(ws.receive_json, _is_ack("subscribe", gid), _is_event("phase_start", gid))
+
+        ws.portal.call(manager.emit, gid, {"type": "mod_added", "name": "SkyUI"})
+        frame = ws.receive_json()
+        assert (frame["event"]["type"], frame["event"]["name"]) == ("mod_added", "SkyUI")
+
+
+def test_msgpack_subprotocol_uses_binary_frames(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+    manager.emit(gid, {"type": "phase_start", "number": 1})
+
+    client = TestClient(app)
+    with client.websocket_connect(
+        f"/api/generation/{gid}/ws", subprotocols=["msgpack"],
+    ) as ws:
+        assert ws.accepted_subprotocol == "msgpack"
+        ws.send_bytes(msgpack.packb({"type": "auth", "token": _token(user)}))
+
+        def receive():
+            return msgpack.unpackb(ws.receive_bytes())
+
+        _receive_until(receive, _is_event("phase_start", gid))
+        ws.send_bytes(msgpack.packb({"type": "skip_phase", "phase_number": 3}))
+        _receive_until(receive, _is_ack("skip_phase", gid))
+    assert manager.get_state(gid).control.skip_phases == {3}
+
+
+# ── Multiplexing ──
+
+
+def test_multiple_generations_over_one_socket(user, manager):
+    first = manager.create_generation(user_id=str(user.id))
+    second = manager.create_generation(user_id=str(user.id))
+
+    with TestClient(app).websocket_connect(f"/api/generation/{first}/ws") as ws:
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_until(ws.receive_json, _is_ack("subscribe", first))
+
+        ws.send_json({"type": "subscribe", "generation_id": second})
+        _receive_until(ws.receive_json, _is_ack("subscribe", second))
+
+        ws.portal.call(manager.emit, second, {"type": "phase_start", "number": 2})
+        ws.portal.call(manager.emit, first, {"type": "phase_start", "number": 1})
+        frames = [ws.receive_json(), ws.receive_json()]
+        assert {(f["generation_id"], f["event"]["number"]) for f in frames} == {
+            (second, 2), (first, 1),
+        }
+
+        ws.send_json({"type": "unsubscribe", "generation_id": second})
+        _receive_until(ws.receive_json, _is_ack("unsubscribe", second))
+        ws.portal.call(manager.emit, second, {"type": "thinking", "text": "dropped"})
+        ws.portal.call(manager.emit, first, {"type": "thinking", "text": "kept"})
+        frame = ws.receive_json()
+        assert (frame["generation_id"], frame["event"]["text"]) == (first, "kept")
+
+        # Both generations finish while the socket stays open
+        ws.send_json({"type": "subscribe", "generation_id": second})
+        ws.portal.call(manager.set_complete, second, "modlist-2")
+        _receive_until(ws.receive_json, _is_event("complete", second))
+        ws.portal.call(manager.set_complete, first, "modlist-1")
+        _receive_until(ws.receive_json, _is_event("complete", first))
+
+
+# ── Control messages ──
+
+
+def test_cancel_acks_then_reports_already_cancelled(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_until(ws.receive_json, _is_ack("subscribe", gid))
+
+        ws.send_json({"type": "cancel"})
+        _receive_all(ws.receive_json, _is_ack("cancel", gid), _is_event("cancelled", gid))
+
+        ws.send_json({"type": "cancel"})
+        error = _receive_until(ws.receive_json, _is_error("cancel"))[-1]
+        assert error["message"] == "Generation is cancelled"
+    assert manager.get_state(gid).status == "cancelled"
+
+
+def test_pause_after_phase_is_refused_without_a_next_phase(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+    control = manager.get_state(gid).control
+
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_until(ws.receive_json, _is_ack("subscribe", gid))
+
+        ws.send_json({"type": "pause_after_phase"})
+        _receive_until(ws.receive_json, _is_ack("pause_after_phase", gid))
+        assert control.pause_after_phase is True
+
+        # The pipeline has reached its last phase
+        control.pause_after_phase = False
+        control.can_pause = False
+        ws.send_json({"type": "pause_after_phase"})
+        error = _receive_until(ws.receive_json, _is_error("pause_after_phase"))[-1]
+        assert error["message"] == "No phase follows the current one"
+        assert control.pause_after_phase is False
+
+        control.can_pause = True
+        ws.portal.call(manager.set_complete, gid, "modlist")
+        _receive_until(ws.receive_json, _is_event("complete", gid))
+        ws.send_json({"type": "pause_after_phase"})
+        error = _receive_until(ws.receive_json, _is_error("pause_after_phase"))[-1]
+        assert error["message"] == "Generation is complete"
+
+
+def test_pause_flag_is_cleared_on_completion(manager):
+    gid = manager.create_generation(user_id="someone")
+    manager.get_state(gid).control.pause_after_phase = True
+    manager.set_complete(gid, "modlist")
+    assert manager.get_state(gid).control.pause_after_phase is False
+
+
+def test_skip_phase_requires_an_integer_phase_number(user, manager):
+    gid = manager.create_generation(user_id=str(user.id))
+
+    with TestClient(app).websocket_connect(f"/api/generation/{gid}/ws") as ws:
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_until(ws.receive_json, _is_ack("subscribe", gid))
+
+        ws.send_json({"type": "skip_phase", "phase_number": "three"})
+        _receive_until(ws.receive_json, _is_error("skip_phase"))
+        ws.send_json({"type": "skip_phase", "phase_number": 4})
+        _receive_until(ws.receive_json, _is_ack("skip_phase", gid))
+
+        ws.send_json({"type": "rewind"})
+        error = _receive_until(ws.receive_json, _is_error("rewind"))[-1]
+        assert error["message"] == "Unknown message type: rewind"
+
+        ws.send_text("not json")
+        frame = ws.receive_json()
+        assert frame == {"type": "error", "message": "Malformed frame"}
+    assert manager.get_state(gid).control.skip_phases == {4}
+
+
+# ── Ownership ──
+
+
+@pytest.mark.parametrize("owner", ["someone-else", None])
+def test_control_requires_ownership(user, manager, owner):
+    own = manager.create_generation(user_id=str(user.id))
+    foreign = manager.create_generation(user_id=owner)
+
+    with TestClient(app).websocket_connect(f"/api/generation/{own}/ws") as ws:
+        ws.send_json({"type": "auth", "token": _token(user)})
+        _receive_until(ws.receive_json, _is_ack("subscribe", own))
+
+        for action in ("subscribe", "cancel", "pause_after_phase"):
+            ws.send_json({"type": action, "generation_id": foreign})
+            error = _receive_until(ws.receive_json, _is_error(action))[-1]
+            assert error["message"] == "Generation not found"
+
+    state = manager.get_state(foreign)
+    assert state.status == "running"
+    assert state.control.pause_after_phase is False
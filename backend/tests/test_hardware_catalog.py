@@ -0,0 +1,139 @@
+"""Tests for the packaged hardware catalog and its use in parsing and tiering."""
+
+import itertools
+import json
+import re
+
+import pytest
+
+from app.services.hardware_catalog import CATALOG_PATH, HardwareCatalog, normalize_hardware_name
+from app.services.spec_parser import _infer_vram_from_gpu
+from app.services.tier_classifier import classify_hardware_tier
+
+
+@pytest.fixture
+def catalog():
+    return HardwareCatalog.get_instance()
+
+
+@pytest.mark.parametrize("name,expected", [
+    ("NVIDIA GeForce RTX4070Ti", "rtx 4070 ti"),
+    ("AMD Radeon(TM) RX 7900XTX", "rx 7900 xtx"),
+    ("Intel(R) Core(TM) i7-13700KF", "core i7 13700k"),
+    ("  GeForce GTX 1660 SUPER ", "gtx 1660 super"),
+])
+def test_normalize_hardware_name(name, expected):
+    assert normalize_hardware_name(name) == expected
+
+
+def test_lookup_exact_and_within_longer_names(catalog):
+    assert catalog.lookup_gpu("NVIDIA GeForce RTX 4070 Ti").name == "rtx 4070 ti"
+    assert catalog.lookup_gpu("NVIDIA GeForce RTX 3070 Laptop GPU").name == "rtx 3070"
+    # The longest matching window wins: "4070 ti super", not "4070 ti" or "4070"
+    assert catalog.lookup_gpu("ASUS RTX 4070 Ti SUPER 16GB").name == "rtx 4070 ti super"
+    assert catalog.lookup_cpu("Intel Core i5-12400F @ 2.50GHz").name == "core i5 12400"
+
+
+def test_fuzzy_lookup_is_opt_in(catalog):
+    assert catalog.lookup_gpu("RTX 4O70 Super").name == "rtx 4070 super"
+    assert catalog.lookup_gpu("RTX 4O70 Super", fuzzy=False) is None
+    assert catalog.lookup_gpu("Voodoo 3") is None
+    assert catalog.lookup_gpu(None) is None
+
+
+def test_every_catalog_gpu_infers_its_vram():
+    for gpu in json.loads(CATALOG_PATH.read_text())["gpus"]:
+        assert _infer_vram_from_gpu(gpu["name"].upper()) == gpu["vram_mb"], gpu["name"]
+
+
+def test_gpu_score_follows_catalog_performance():
+    def score(gpu):
+        return classify_hardware_tier(gpu=gpu)["gpu_gen_score"]
+
+    assert score("RTX 4090") > score("RTX 4060") > score("RTX 3080") > score("GTX 1060")
+    assert score("RX 7900 XTX") > score("RX 6600")
+    # Slower cards of a generation keep its series floor
+    assert score("RTX 3050") == score("RTX 3080") == 20
+    assert score("Voodoo 3") == 5
+    assert score(None) == 0
+
+
+def test_uncatalogued_gpu_is_estimated_from_its_series(catalog):
+    assert catalog.lookup_gpu("Radeon RX 7700", fuzzy=False) is None
+    assert catalog.lookup_gpu_series("Radeon RX 7700").name == "rx 7xxx"
+    assert catalog.estimate_gpu("Radeon RX 7700").name == "rx 7700 xt"
+    # Equally near models: the slower one
+    assert catalog.estimate_gpu("RX 6200").name == "rx 6400"
+    assert catalog.lookup_gpu_series("Intel Arc A530M").name == "arc axxx"
+    assert catalog.lookup_gpu_series("RX 580").name == "rx 5xx"
+    assert catalog.lookup_gpu_series("RX 5700").name == "rx 5xxx"
+    assert catalog.lookup_gpu_series("Voodoo 3") is None
+    assert catalog.estimate_gpu("Voodoo 3") is None
+
+
+# Generation scores of the tier classifier before the catalog; first match wins
+_LEGACY_GENERATIONS = [
+    (re.compile(p, re.I), score) for p, score in (
+        (r"(?:RTX\s*)?50\d{2}", 25), (r"(?:RTX\s*)?40\d{2}", 23),
+        (r"(?:RTX\s*)?30\d{2}", 20), (r"(?:RTX\s*)?20\d{2}", 15),
+        (r"GTX\s*16\d{2}", 12), (r"GTX\s*10\d{2}", 10), (r"GTX\s*9\d{2}", 5),
+        (r"RX\s*9\d{3}", 25), (r"RX\s*7\d{3}", 23), (r"RX\s*6\d{3}", 20),
+        (r"RX\s*5\d{3}", 15), (r"RX\s*[45]\d{2}", 8),
+        (r"Arc\s*B\d{3}", 20), (r"Arc\s*A\d{3}", 15),
+    )
+]
+
+
+def _legacy_gpu_score(gpu: str) -> int | None:
+    return next((score for pattern, score in _LEGACY_GENERATIONS if pattern.search(gpu)), None)
+
+
+def _gpu_names():
+    yield from (gpu["name"].upper() for gpu in json.loads(CATALOG_PATH.read_text())["gpus"])
+    suffixes = ("", " Ti", " SUPER", " XT", " XTX", "M", " Laptop GPU")
+    for series, numbers in (
+        ("NVIDIA GeForce RTX ", range(2000, 6000, 10)),
+        ("NVIDIA GeForce GTX ", itertools.chain(range(900, 1000, 10), range(1000, 1700, 10))),
+        # From the RX 5300: the optional-RTX NVIDIA patterns also matched "RX 50xx"
+        ("AMD Radeon RX ", itertools.chain(range(400, 600, 10), range(5300, 10000, 50))),
+    ):
+        for number, suffix in itertools.product(numbers, suffixes):
+            yield f"{series}{number}{suffix}"
+    for letter, number in itertools.product("AB", range(300, 1000, 10)):
+        yield f"Intel Arc {letter}{number}"
+
+
+def test_no_gpu_scores_below_its_legacy_generation():
+    for gpu in _gpu_names():
+        legacy = _legacy_gpu_score(gpu)
+        if legacy is not None:
+            assert classify_hardware_tier(gpu=gpu)["gpu_gen_score"] >= legacy, gpu
+
+
+@pytest.mark.parametrize("gpu,legacy", [
+    ("AMD Radeon RX 6700", 20), ("AMD Radeon RX 6400", 20), ("NVIDIA GeForce RTX 2050", 15),
+    ("NVIDIA GeForce RTX 5050", 25), ("AMD Radeon RX 7700", 23), ("AMD Radeon RX 7900M", 23),
+    ("Intel Arc A310", 15), ("NVIDIA GeForce GTX 1630", 12), ("AMD Radeon RX 5500", 15),
+    ("Radeon RX 550", 8), ("Radeon RX 560", 8),
+])
+def test_previously_demoted_gpus_keep_their_generation_score(gpu, legacy):
+    assert _legacy_gpu_score(gpu) == legacy
+    assert classify_hardware_tier(gpu=gpu)["gpu_gen_score"] >= legacy
+
+
+def test_high_perf_cpu_bonus_comes_from_catalog():
+    base = {"cpu_cores": 8, "cpu_speed_ghz": 4.5}
+    with_bonus = classify_hardware_tier(cpu="AMD Ryzen 7 7800X3D", **base)["cpu_score"]
+    without = classify_hardware_tier(cpu="AMD Ryzen 7 7700", **base)["cpu_score"]
+    assert with_bonus > without
+
+
+@pytest.mark.parametrize("cpu", [
+    "Intel Core i9-14900KS", "Intel Core i9-13900KS", "Intel Core i9-12900KS",
+    "Intel Core i7-14700KF", "AMD Ryzen 9 9900X3D", "Intel Core Ultra 7 155U",
+])
+def test_variants_of_high_perf_cpus_keep_the_bonus(cpu):
+    base = {"cpu_cores": 8, "cpu_speed_ghz": 4.5}
+    assert classify_hardware_tier(cpu=cpu, **base)["cpu_score"] == (
+        classify_hardware_tier(**base)["cpu_score"] + 3
+    )
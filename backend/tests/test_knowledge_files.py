@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from app.knowledge import get_methodology_context, knowledge_version, related_methodology
+from app.knowledge.files import KnowledgeFiles
+
+GAME_FILE = """<system_context>
+game: testgame
+</system_context>
+
+# Test Game Modding Knowledge
+
+<phase_1_essentials>
+
+## Phase 1: Essentials
+
+Install the {tool} first.
+
+</phase_1_essentials>
+"""
+
+SHARED_FILE = """# Shared Notes
+
+## Conflict Resolution
+
+Resolve record conflicts with a {tool} patch.
+"""
+
+
+def _write(path, text, bump=0):
+    path.write_text(text, encoding="utf-8")
+    # mtime resolution can be coarse; push it forward so the edit is seen
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + bump))
+
+
+@pytest.fixture
+def knowledge_dir(tmp_path, monkeypatch):
+    _write(tmp_path / "testgame.md", GAME_FILE.format(tool="script extender"))
+    monkeypatch.setattr(KnowledgeFiles, "_instance", KnowledgeFiles([(tmp_path, "*.md")], 0))
+    return tmp_path
+
+
+def test_game_file_discovered_from_metadata(knowledge_dir):
+    store = KnowledgeFiles.get_instance()
+
+    assert set(store.game_files()) == {"testgame"}
+    assert "script extender" in get_methodology_context("testgame", 1)
+
+
+def test_edit_reloads_context_and_bumps_version(knowledge_dir):
+    before = knowledge_version()
+    assert "script extender" in get_methodology_context("testgame", 1)
+
+    _write(knowledge_dir / "testgame.md", GAME_FILE.format(tool="mod manager"), bump=10)
+
+    assert knowledge_version() != before
+    context = get_methodology_context("testgame", 1)
+    assert "mod manager" in context
+    assert "script extender" not in context
+    assert KnowledgeFiles.get_instance().stats()["reloads"] == 2
+
+
+def test_touch_without_edit_keeps_version(knowledge_dir):
+    before = knowledge_version()
+
+    _write(knowledge_dir / "testgame.md", GAME_FILE.format(tool="script extender"), bump=10)
+
+    assert knowledge_version() == before
+    assert KnowledgeFiles.get_instance().stats()["reloads"] == 1
+
+
+def test_new_and_removed_files_are_tracked(knowledge_dir):
+    before = knowledge_version()
+    assert related_methodology("testgame", "conflict resolution patch") == ""
+
+    _write(knowledge_dir / "shared.md", SHARED_FILE.format(tool="bashed"))
+    added = knowledge_version()
+
+    assert added != before
+    assert "bashed patch" in related_methodology("testgame", "conflict resolution patch")
+
+    (knowledge_dir / "shared.md").unlink()
+
+    assert knowledge_version() == before
+    assert related_methodology("testgame", "conflict resolution patch") == ""
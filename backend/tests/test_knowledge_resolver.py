@@ -0,0 +1,86 @@
+from app.knowledge import get_methodology_context
+from app.knowledge.resolver import (
+    _parse_methodology_text,
+    build_phase_context,
+    estimate_tokens,
+)
+
+SAMPLE = """<system_context>
+game: testgame
+version: 1.0
+</system_context>
+
+# Test Game Modding Knowledge
+
+<version_management priority="2">
+
+## Versions
+
+Use the right script extender.
+
+</version_management>
+
+<nexus_category_mapping>
+
+## Categories
+
+**Phase 1 (Engine):**
+nexus_categories: [Utilities]
+
+**Phase 2 (Frameworks):**
+nexus_categories: [Modders Resources]
+
+**Excluded:**
+Cheats
+
+</nexus_category_mapping>
+
+<phase_1_essentials>
+
+## Phase 1: Essentials
+
+1. **Script Extender** — install first.
+
+</phase_1_essentials>
+"""
+
+
+def test_parse_splits_blocks_by_phase():
+    methodology = _parse_methodology_text(SAMPLE)
+    assert methodology.metadata == {"game": "testgame", "version": "1.0"}
+    assert methodology.universal_principles == ""
+
+    by_id = {s.id: s for s in methodology.sections}
+    assert by_id["version_management"].is_universal
+    assert by_id["version_management"].priority == 2
+    assert by_id["phase_1_essentials"].phases == frozenset({1})
+    assert [sorted(by_id[f"nexus_category_mapping#{n}"].phases) for n in range(4)] == [[], [1], [2], []]
+
+
+def test_phase_context_only_includes_that_phase():
+    context = build_phase_context(_parse_methodology_text(SAMPLE), 2, token_budget=0)
+    assert "Frameworks" in context.text
+    assert "Engine" not in context.text and "Essentials" not in context.text
+    assert "Cheats" in context.text
+    assert "system_context" not in context.text and "version: 1.0" not in context.text
+    assert context.tokens == estimate_tokens(context.text)
+
+
+def test_budget_trims_lowest_priority_first():
+    methodology = _parse_methodology_text(SAMPLE)
+    full = build_phase_context(methodology, 1, token_budget=0)
+    trimmed = build_phase_context(methodology, 1, token_budget=full.tokens - 1)
+
+    assert trimmed.trimmed == ("version_management",)
+    assert trimmed.tokens < full.tokens
+    assert "Essentials" in trimmed.text
+
+
+def test_shipped_contexts_are_phase_specific():
+    phase_1 = get_methodology_context("skyrimse", 1)
+    phase_4 = get_methodology_context("skyrimse", 4)
+    assert "Essential Engine Stack" in phase_1
+    assert "Essential Engine Stack" not in phase_4
+    assert "<system_context>" not in phase_1
+    assert get_methodology_context("skyrimse", 4) is phase_4
+    assert get_methodology_context("unknown", 1) == ""
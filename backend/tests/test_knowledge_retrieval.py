@@ -0,0 +1,67 @@
+import pytest
+
+from app.knowledge.files import KnowledgeFiles
+from app.knowledge.retrieval import KnowledgeIndex, chunk_markdown
+from app.services.modlist_generator import PHASE1_TOOLS, PHASE2_TOOLS, _build_lookup_handler
+from app.serialization import loads
+
+DOC = """<system_context>
+scope: universal
+</system_context>
+
+# Reference
+
+<vram_guidelines>
+
+## Texture Resolution by VRAM
+
+Use 1K textures below 4 GB of VRAM and 2K textures up to 8 GB.
+
+</vram_guidelines>
+
+## Precombines in Fallout 4
+
+Never break precombined meshes without regenerating previs.
+
+### Skyrim skeletons
+
+Only one skeleton mod: XPMSSE.
+"""
+
+
+def test_chunks_split_by_heading_and_scope_games():
+    chunks = chunk_markdown("ref.md", DOC)
+    assert [c.title for c in chunks] == [
+        "Texture Resolution by VRAM",
+        "Precombines in Fallout 4",
+        "Precombines in Fallout 4 › Skyrim skeletons",
+    ]
+    assert "<vram_guidelines>" not in chunks[0].text
+    assert [c.game for c in chunks] == [None, "fallout4", None]
+
+
+def test_search_ranks_relevant_chunk_and_filters_by_game():
+    index = KnowledgeIndex(chunk_markdown("ref.md", DOC))
+    top = index.search("how much VRAM for textures", k=1)
+    assert top[0][0].title == "Texture Resolution by VRAM"
+
+    assert index.search("precombines previs", game="fallout4")[0][0].game == "fallout4"
+    assert all(c.game != "fallout4" for c, _ in index.search("precombines previs", game="skyrimse"))
+    assert index.search("precombines", exclude_sources=frozenset({"ref.md"})) == []
+
+
+def test_shipped_index_includes_shared_documents():
+    names = {f.name for f in KnowledgeFiles.get_instance().files()}
+    assert "modding_common.md" in names
+    sources = {c.source for c in KnowledgeIndex.get_instance().chunks}
+    assert "modding_common.md" in sources
+
+
+@pytest.mark.asyncio
+async def test_lookup_methodology_tool_is_available_in_every_phase():
+    for tools in (PHASE1_TOOLS, PHASE2_TOOLS):
+        assert "lookup_methodology" in [t["function"]["name"] for t in tools]
+
+    result = loads(await _build_lookup_handler("skyrimse")("ESL flagging plugin limit"))
+    assert result["count"] > 0
+    assert {"title", "source", "text", "score"} <= set(result["results"][0])
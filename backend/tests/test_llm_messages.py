@@ -0,0 +1,42 @@
+from app.llm.messages import anthropic_to_openai, openai_to_anthropic
+
+
+HISTORY = [
+    {"role": "system", "content": "You are a mod curator."},
+    {"role": "user", "content": "Build the UI phase."},
+    {
+        "role": "assistant",
+        "content": "Searching first.",
+        "tool_calls": [
+            {"id": "call_1", "type": "function",
+             "function": {"name": "search_nexus", "arguments": '{"query": "SkyUI"}'}},
+            {"id": "call_2", "type": "function",
+             "function": {"name": "get_mod_details", "arguments": '{"mod_id": 12604}'}},
+        ],
+    },
+    {"role": "tool", "tool_call_id": "call_1", "content": '{"results": []}'},
+    {"role": "tool", "tool_call_id": "call_2", "content": '{"mod_id": 12604}'},
+]
+
+
+def test_openai_to_anthropic_groups_tool_results():
+    system, messages = openai_to_anthropic(HISTORY)
+    assert system == "You are a mod curator."
+    assert [m["role"] for m in messages] == ["user", "assistant", "user"]
+
+    assistant = messages[1]["content"]
+    assert assistant[0] == {"type": "text", "text": "Searching first."}
+    assert assistant[1]["type"] == "tool_use"
+    assert assistant[1]["input"] == {"query": "SkyUI"}
+
+    results = messages[2]["content"]
+    assert [r["tool_use_id"] for r in results] == ["call_1", "call_2"]
+
+
+def test_round_trip_preserves_history():
+    system, messages = openai_to_anthropic(HISTORY)
+    restored = anthropic_to_openai(system, messages)
+    assert restored[:2] == HISTORY[:2]
+    assert restored[2]["content"] == "Searching first."
+    assert [tc["id"] for tc in restored[2]["tool_calls"]] == ["call_1", "call_2"]
+    assert restored[3:] == HISTORY[3:]
@@ -0,0 +1,132 @@
+"""Tests for the post-generation load-order solver."""
+
+from app.knowledge import LoadOrderCategory, load_order_categories
+from app.services.load_order import solve_load_order
+from app.services.modlist_generator import GenerationSession, _order_entries
+
+CATEGORIES = (
+    LoadOrderCategory(1, "Utilities and tools", ("SKSE",)),
+    LoadOrderCategory(2, "UI and HUD", ("SkyUI",)),
+    LoadOrderCategory(3, "Weather and lighting", ("Lux",)),
+    LoadOrderCategory(4, "Gameplay overhauls", ("combat",)),
+    LoadOrderCategory(5, "Late loaders and compatibility patches"),
+)
+
+
+def _entry(name, nexus_mod_id=None, phase=None, load_order=None, patches_mods=None):
+    return {
+        "name": name, "nexus_mod_id": nexus_mod_id, "phase": phase,
+        "load_order": load_order, "patches_mods": patches_mods,
+    }
+
+
+def _names(result):
+    return [e["name"] for e in result.entries]
+
+
+def test_categories_order_mods_across_phases():
+    entries = [
+        _entry("Wildcat - Combat of Skyrim", phase=1, load_order=1),
+        _entry("Lux", phase=1, load_order=1),  # collides with Wildcat's load_order
+        _entry("SkyUI", phase=2, load_order=1),
+        _entry("SKSE64", phase=2),
+        _entry("Unknown Mod", phase=2, load_order=2),
+    ]
+    result = solve_load_order(entries, categories=CATEGORIES, phase_names={1: "Gameplay", 2: "Essentials"})
+
+    # "SKSE64" matches the SKSE example; "Essentials" names no category, so
+    # "Unknown Mod" loads after the latest recognized mod of its phase
+    assert _names(result) == ["SKSE64", "SkyUI", "Unknown Mod", "Lux", "Wildcat - Combat of Skyrim"]
+    assert [e["load_order"] for e in result.entries] == [1, 2, 3, 4, 5]
+    assert not result.cycles
+
+
+def test_phase_name_ranks_unmatched_mods():
+    entries = [
+        _entry("Some Patch", phase=2),
+        _entry("Some Weather Mod", phase=1),
+    ]
+    phases = {1: "Lighting & Weather", 2: "Compatibility Patches"}
+    assert _names(solve_load_order(entries, categories=CATEGORIES, phase_names=phases)) == [
+        "Some Weather Mod", "Some Patch",
+    ]
+
+
+def test_unmatched_mods_rank_by_phase_not_neighbour():
+    entries = [
+        _entry("Lux", phase=1, load_order=1),
+        _entry("Mystery Mod", phase=2, load_order=1),
+        _entry("SkyUI", phase=3, load_order=1),
+        _entry("Another Mystery", phase=3, load_order=2),
+    ]
+    phases = {1: "Lighting", 2: "Extras", 3: "Interface"}
+    result = solve_load_order(entries, categories=CATEGORIES, phase_names=phases)
+
+    # Phase 2 has no category and no recognized mods, so it keeps phase 1's
+    # rank; "Another Mystery" takes SkyUI's rank rather than sorting with Lux
+    assert _names(result) == ["SkyUI", "Another Mystery", "Lux", "Mystery Mod"]
+
+
+def test_trailing_digits_are_ignored_when_matching_examples():
+    entries = [_entry("Luxury Suite"), _entry("SkyUI5 SE")]
+    # "SkyUI5" matches SkyUI, but "Luxury" is not the word "Lux": it takes
+    # its group's rank (SkyUI's) and keeps its place ahead of it
+    assert _names(solve_load_order(entries, categories=CATEGORIES)) == [
+        "Luxury Suite", "SkyUI5 SE",
+    ]
+
+
+def test_patches_and_rules_are_hard_constraints():
+    entries = [
+        _entry("SkyUI Patch for Lux", nexus_mod_id=9, patches_mods=["lux", "SKYUI"]),
+        _entry("Lux", nexus_mod_id=3),
+        _entry("SkyUI", nexus_mod_id=2),
+        _entry("Precision", nexus_mod_id=5),
+        _entry("TDM", nexus_mod_id=4),
+    ]
+    result = solve_load_order(entries, load_after=[(4, 5)], categories=CATEGORIES)
+    names = _names(result)
+
+    assert names.index("SkyUI Patch for Lux") > max(names.index("Lux"), names.index("SkyUI"))
+    assert names.index("TDM") < names.index("Precision")
+    # A patch comes right after its last target, not at the end
+    assert names.index("SkyUI Patch for Lux") == names.index("Lux") + 1
+
+
+def test_cycles_are_broken_and_reported():
+    entries = [_entry("A", 1), _entry("B", 2), _entry("C", 3), _entry("D", 4)]
+    result = solve_load_order(entries, load_after=[(1, 2), (2, 3), (3, 1), (3, 4)])
+
+    assert result.cycles == [["A", "B", "C"]]
+    assert _names(result) == ["A", "B", "C", "D"]
+
+
+def test_solver_is_deterministic_and_linear_sized():
+    entries = [_entry(f"Mod {i}", i, load_order=i % 7) for i in range(2000)]
+    chain = [(i, i + 1) for i in range(1999)]
+    first = _names(solve_load_order([dict(e) for e in entries], load_after=chain))
+    assert first == [f"Mod {i}" for i in range(2000)]
+    assert _names(solve_load_order([dict(e) for e in entries], load_after=chain)) == first
+
+
+def test_knowledge_files_provide_category_sequence():
+    categories = load_order_categories("skyrimse")
+    assert len(categories) == 22
+    assert "SkyUI" in categories[4].examples
+    assert load_order_categories("no-such-game") == ()
+
+
+def test_order_entries_flags_cycles():
+    session = GenerationSession(game_domain="skyrimspecialedition", nexus=None)
+    session.add_entry(_entry("Frostfall", 3))
+    session.add_entry(_entry("Campfire", 4))
+    session.compat_rules = {
+        3: [{"rule": "requires", "nexus_mod_id": 4}],
+        4: [{"rule": "load_after", "nexus_mod_id": 3}],
+    }
+    events = []
+    ordered = _order_entries(session, "skyrimse", {}, events.append)
+
+    assert len(ordered) == 2
+    assert "Load-order cycle" in session.knowledge_flags[0]["issue"]
+    assert events == [{"type": "load_order_resolved", "mod_count": 2, "cycles": 1}]
@@ -0,0 +1,142 @@
+"""Tests for storage/VRAM budget enforcement in the add_to_modlist and add_patch tools."""
+
+import orjson
+import pytest
+
+from app.models.game import Game
+from app.models.playstyle import Playstyle
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services import modlist_generator
+from app.services.modlist_generator import (
+    GenerationSession,
+    ModBudget,
+    _build_phase2_handlers,
+)
+from tests.conftest import add_mod, generation_session
+
+MB = 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_add_charges_primary_file_size_and_reports_remaining():
+    session = generation_session(
+        {1: [
+            {"fileId": 10, "sizeInBytes": str(900 * MB), "isPrimary": False},
+            {"fileId": 11, "sizeInBytes": str(300 * MB), "isPrimary": True},
+        ]},
+        budget=ModBudget(storage_limit_mb=1000),
+    )
+    response = await add_mod(session, 1, estimated_size_mb=5)
+
+    assert response["status"] == "added"
+    assert (response["size_mb"], response["storage_remaining_mb"]) == (300, 700)
+    assert "warning" not in response
+    assert session.modlist[0]["nexus_file_id"] == 11
+    assert session.modlist[0]["estimated_size_mb"] == 300
+
+
+@pytest.mark.asyncio
+async def test_add_rejects_mod_over_storage_budget_and_warns_when_low():
+    session = generation_session(
+        {1: [{"fileId": 1, "sizeInBytes": str(950 * MB)}], 2: [{"fileId": 2, "sizeInBytes": str(100 * MB)}]},
+        budget=ModBudget(storage_limit_mb=1000),
+    )
+    assert "storage" in (await add_mod(session, 1))["warning"]
+
+    rejected = await add_mod(session, 2)
+    assert rejected["status"] == "rejected"
+    assert rejected["storage_remaining_mb"] == 50
+    assert [m["nexus_mod_id"] for m in session.modlist] == [1]
+
+
+async def _add_patch(session, mod_id, **kwargs):
+    add = _build_phase2_handlers(session)["add_patch"]
+    return orjson.loads(await add(
+        mod_id=mod_id, name=f"Patch {mod_id}", patches_mods=["Mod 1"], reason="test", **kwargs,
+    ))
+
+
+@pytest.mark.asyncio
+async def test_add_falls_back_to_estimate_and_checks_known_vram():
+    session = generation_session(
+        budget=ModBudget(vram_limit_mb=1000, vram_requirements={5: 800, 6: 1200, 7: 400}),
+    )
+
+    added = await add_mod(session, 5, estimated_size_mb=40)
+    assert (added["size_mb"], added["vram_remaining_mb"]) == (40, 200)
+    assert session.modlist[0]["nexus_file_id"] is None
+
+    assert (await add_mod(session, 6))["status"] == "rejected"
+    assert (await add_mod(session, 8))["status"] == "added"  # VRAM need unknown
+
+
+@pytest.mark.asyncio
+async def test_vram_use_is_the_largest_requirement_not_the_sum():
+    session = generation_session(
+        budget=ModBudget(vram_limit_mb=1000, vram_requirements={5: 800, 6: 700, 7: 900}),
+    )
+
+    assert (await add_mod(session, 5))["vram_remaining_mb"] == 200
+    # 800 + 700 would overflow a sum, but the two needs overlap
+    assert (await add_mod(session, 6))["vram_remaining_mb"] == 200
+    assert (await add_mod(session, 7))["vram_remaining_mb"] == 100
+    assert session.budget.vram_used_mb == 900
+
+
+@pytest.mark.asyncio
+async def test_patches_are_charged_against_the_storage_budget():
+    session = generation_session(
+        {
+            1: [{"fileId": 1, "sizeInBytes": str(900 * MB)}],
+            2: [{"fileId": 20, "sizeInBytes": str(60 * MB)}],
+            3: [{"fileId": 30, "sizeInBytes": str(60 * MB)}],
+        },
+        budget=ModBudget(storage_limit_mb=1000),
+    )
+    await add_mod(session, 1)
+
+    added = await _add_patch(session, 2)
+    assert (added["status"], added["size_mb"], added["storage_remaining_mb"]) == ("patch_added", 60, 40)
+    assert session.patches[0]["nexus_file_id"] == 20
+    assert session.patches[0]["estimated_size_mb"] == 60
+
+    rejected = await _add_patch(session, 3)
+    assert rejected["status"] == "rejected"
+    assert [p["nexus_mod_id"] for p in session.patches] == [2]
+
+
+def test_budget_usage_survives_snapshot():
+    session = generation_session(budget=ModBudget(storage_limit_mb=1000))
+    session.budget.charge(250.0, 128)
+    restored = GenerationSession.from_snapshot(session.to_snapshot(), nexus=None)
+    assert (restored.budget.storage_used_mb, restored.budget.vram_used_mb) == (250.0, 128)
+
+
+@pytest.mark.asyncio
+async def test_legacy_pipeline_closes_clients_when_budget_load_fails(db_session, monkeypatch):
+    game = Game(name="Oblivion", slug="oblivion", nexus_domain="oblivion")
+    db_session.add(game)
+    await db_session.flush()
+    playstyle = Playstyle(game_id=game.id, name="Vanilla+", slug="vanilla-plus")
+    db_session.add(playstyle)
+    await db_session.commit()
+
+    closed = []
+
+    class ClosingNexus:
+        def __init__(self, api_key=None):
+            pass
+
+        async def aclose(self):
+            closed.append("nexus")
+
+    async def failing_budget(*args):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(modlist_generator, "NexusModsClient", ClosingNexus)
+    monkeypatch.setattr(modlist_generator, "_apply_budget", failing_budget)
+
+    request = ModlistGenerateRequest(game_id=game.id, playstyle_id=playstyle.id)
+    with pytest.raises(RuntimeError):
+        await modlist_generator._generate_legacy(db_session, request)
+    assert closed == ["nexus"]
@@ -0,0 +1,91 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from app.api.modlist import save_modlist_to_db
+from app.jobs.backfill_mod_ids import backfill_game
+from app.models.game import Game
+from app.models.mod import Mod
+from app.models.modlist import Modlist, ModlistEntry
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.modlist_generator import GenerationResult
+
+DOMAIN = "skyrimspecialedition"
+
+RESULT = GenerationResult(
+    entries=[
+        {"nexus_mod_id": 266, "name": "USSEP", "author": "Arthmoor", "summary": "Fixes"},
+        {"nexus_mod_id": 12604, "name": "SkyUI", "author": "SkyUI Team"},
+        {"name": "Hand-made patch", "is_patch": True},
+    ],
+    knowledge_flags=[],
+    llm_provider="test",
+)
+
+
+@pytest_asyncio.fixture
+async def game(db_session):
+    game = Game(name="Skyrim SE", slug="skyrimse", nexus_domain=DOMAIN)
+    db_session.add(game)
+    await db_session.commit()
+    return game
+
+
+async def _entries(db_session, modlist_id):
+    return (await db_session.execute(
+        select(ModlistEntry).where(ModlistEntry.modlist_id == modlist_id)
+        .order_by(ModlistEntry.load_order)
+    )).scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_save_upserts_mods_and_links_entries(db_session, game):
+    request = ModlistGenerateRequest(game_id=game.id, playstyle_id=1)
+    first = await save_modlist_to_db(db_session, request, RESULT)
+    second = await save_modlist_to_db(db_session, request, RESULT)
+
+    assert await db_session.scalar(select(func.count()).select_from(Mod)) == 2
+    first_ids = [e.mod_id for e in await _entries(db_session, first.id)]
+    second_ids = [e.mod_id for e in await _entries(db_session, second.id)]
+    assert first_ids == second_ids
+    assert first_ids[0] is not None and first_ids[2] is None
+
+    ussep = await db_session.get(Mod, first_ids[0])
+    assert (ussep.nexus_game_domain, ussep.nexus_mod_id, ussep.author) == (DOMAIN, 266, "Arthmoor")
+
+
+@pytest.mark.asyncio
+async def test_save_keeps_existing_mod_metadata(db_session, game):
+    seeded = Mod(nexus_mod_id=266, nexus_game_domain=DOMAIN, name="USSEP", summary="Curated")
+    db_session.add(seeded)
+    await db_session.commit()
+
+    request = ModlistGenerateRequest(game_id=game.id, playstyle_id=1)
+    modlist = await save_modlist_to_db(db_session, request, RESULT)
+
+    entries = await _entries(db_session, modlist.id)
+    assert entries[0].mod_id == seeded.id
+    await db_session.refresh(seeded)
+    assert seeded.summary == "Curated"
+
+
+@pytest.mark.asyncio
+async def test_backfill_links_legacy_entries(db_session, game):
+    modlist = Modlist(game_id=game.id, playstyle_id=1)
+    db_session.add(modlist)
+    await db_session.flush()
+    for order, nexus_id in enumerate([266, 12604, 266, None], start=1):
+        db_session.add(ModlistEntry(
+            modlist_id=modlist.id, nexus_mod_id=nexus_id, name=f"Mod {nexus_id}", load_order=order,
+        ))
+    await db_session.commit()
+
+    assert await backfill_game(db_session, game, batch_size=1) == 3
+    assert await backfill_game(db_session, game) == 0
+
+    modlist_id = modlist.id
+    db_session.expire_all()
+    entries = await _entries(db_session, modlist_id)
+    assert entries[0].mod_id == entries[2].mod_id is not None
+    assert entries[1].mod_id is not None and entries[3].mod_id is None
+    assert await db_session.scalar(select(func.count()).select_from(Mod)) == 2
@@ -0,0 +1,107 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from app.models.game import Game
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.models.modlist_archive import ModlistArchive
+from app.models.user import User
+from app.services.modlist_archive import archive_modlists
+
+
+@pytest_asyncio.fixture
+async def modlists(db_session):
+    user = User(email="keeper@example.com")
+    db_session.add(user)
+    await db_session.flush()
+
+    old = datetime.utcnow() - timedelta(days=120)
+    created = {
+        "old_anonymous": Modlist(game_id=1, playstyle_id=1, created_at=old),
+        "recent_anonymous": Modlist(game_id=1, playstyle_id=1),
+        "old_owned": Modlist(game_id=1, playstyle_id=1, user_id=user.id, created_at=old),
+    }
+    for ml in created.values():
+        db_session.add(ml)
+        await db_session.flush()
+        for order in (1, 2):
+            db_session.add(ModlistEntry(
+                modlist_id=ml.id, nexus_mod_id=100 + order, name=f"Mod {order}", load_order=order,
+            ))
+        db_session.add(ModlistKnowledgeFlag(
+            modlist_id=ml.id, mod_a_name="A", mod_b_name="B", issue="x", severity="warning",
+        ))
+    await db_session.commit()
+    return {name: ml.id for name, ml in created.items()}
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_only_old_anonymous_modlists(db_session, modlists):
+    assert await archive_modlists(db_session, older_than_days=90) == 1
+    assert await archive_modlists(db_session, older_than_days=90) == 0
+
+    remaining = set((await db_session.execute(select(Modlist.id))).scalars().all())
+    assert remaining == {modlists["recent_anonymous"], modlists["old_owned"]}
+    assert await db_session.scalar(select(func.count()).select_from(ModlistEntry)) == 4
+    archive = await db_session.get(ModlistArchive, modlists["old_anonymous"])
+    assert archive.entry_count == 2
+
+
+@pytest.mark.asyncio
+async def test_reads_fall_back_to_archive(client, db_session, modlists):
+    url = f"/api/modlist/{modlists['old_anonymous']}"
+    before = (await client.get(url)).json()
+
+    await archive_modlists(db_session, older_than_days=90)
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.json() == before
+
+    lines = [json.loads(line) for line in
+             (await client.get(url, headers={"Accept": "application/x-ndjson"})).text.splitlines()]
+    assert [line["type"] for line in lines] == ["modlist", "entry", "entry", "flag"]
+    assert lines[1]["name"] == "Mod 1"
+
+
+@pytest.mark.asyncio
+async def test_entry_without_name_is_archived(client, db_session):
+    old = datetime.utcnow() - timedelta(days=120)
+    ml = Modlist(game_id=1, playstyle_id=1, created_at=old)
+    db_session.add(ml)
+    await db_session.flush()
+    db_session.add(ModlistEntry(modlist_id=ml.id, nexus_mod_id=7, name=None, load_order=1))
+    await db_session.commit()
+
+    assert await archive_modlists(db_session, older_than_days=90) == 1
+    response = await client.get(f"/api/modlist/{ml.id}")
+    assert response.json()["entries"][0]["name"] == "Unknown"
+
+
+@pytest.mark.asyncio
+async def test_export_falls_back_to_archive(client, db_session):
+    game = Game(name="Skyrim SE", slug="skyrimse", nexus_domain="skyrimspecialedition")
+    db_session.add(game)
+    await db_session.flush()
+    ml = Modlist(game_id=game.id, playstyle_id=1, created_at=datetime.utcnow() - timedelta(days=120))
+    db_session.add(ml)
+    await db_session.flush()
+    for order in (1, 2):
+        db_session.add(ModlistEntry(
+            modlist_id=ml.id, nexus_mod_id=100 + order, nexus_file_id=500 + order,
+            name=f"Mod {order}", load_order=order,
+        ))
+    await db_session.commit()
+
+    url = f"/api/modlist/{ml.id}/export"
+    before = (await client.get(url)).json()
+    await archive_modlists(db_session, older_than_days=90)
+
+    response = await client.get(url)
+    assert response.status_code == 200
+    assert response.json() == before
+    assert [e["file_id"] for e in response.json()["entries"]] == [501, 502]
+    cached = await client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
@@ -0,0 +1,104 @@
+"""Tests for the materialized MO2 export endpoint."""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from app.models.game import Game
+from app.models.modlist import Modlist, ModlistEntry
+from app.services import modlist_export
+from tests.conftest import TestSessionLocal
+
+
+@pytest_asyncio.fixture
+async def modlist(db_session):
+    game = Game(name="Skyrim SE", slug="skyrimse", nexus_domain="skyrimspecialedition")
+    db_session.add(game)
+    await db_session.flush()
+    ml = Modlist(game_id=game.id, playstyle_id=1)
+    db_session.add(ml)
+    await db_session.flush()
+    for n in range(40):
+        db_session.add(ModlistEntry(
+            modlist_id=ml.id, nexus_mod_id=1000 + n, nexus_file_id=5000 + n if n else None,
+            name=f"Mod {n}", summary="x" * 50, load_order=n,
+        ))
+    await db_session.commit()
+    return ml
+
+
+@pytest.mark.asyncio
+async def test_export_is_materialized_with_etag(client, db_session, modlist):
+    first = await client.get(f"/api/modlist/{modlist.id}/export")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    data = first.json()
+    assert data["mod_count"] == 40
+    assert data["entries"][0]["file_id"] is None
+    assert data["entries"][1]["file_id"] == 5001
+
+    await db_session.refresh(modlist)
+    assert modlist.export_etag == etag
+
+    again = await client.get(
+        f"/api/modlist/{modlist.id}/export", headers={"If-None-Match": etag},
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_export_is_gzip_compressed(client, modlist):
+    response = await client.get(
+        f"/api/modlist/{modlist.id}/export", headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["mod_count"] == 40
+
+
+@pytest.mark.asyncio
+async def test_export_unknown_modlist_404(client):
+    response = await client.get("/api/modlist/00000000-0000-0000-0000-000000000000/export")
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """Fake Nexus lookup that never finds mod 1000 and records its calls."""
+    calls = []
+
+    async def resolve(game_domain, nexus_mod_ids, nexus_api_key):
+        calls.append(list(nexus_mod_ids))
+        await asyncio.sleep(0.01)
+        return {mid: None if mid == 1000 else 9000 + mid for mid in nexus_mod_ids}
+
+    monkeypatch.setattr(modlist_export, "_resolve_primary_file_ids", resolve)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unresolvable_file_id_is_not_retried_per_request(client, modlist, resolver):
+    for _ in range(3):
+        response = await client.get(f"/api/modlist/{modlist.id}/export?nexus_api_key=key")
+        assert response.json()["entries"][0]["file_id"] is None
+
+    assert resolver == [[1000]]
+
+
+@pytest.mark.asyncio
+async def test_keyless_build_does_not_count_as_resolution(client, modlist, resolver):
+    await client.get(f"/api/modlist/{modlist.id}/export")
+    await client.get(f"/api/modlist/{modlist.id}/export?nexus_api_key=key")
+    assert resolver == [[1000]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_are_coalesced(modlist, resolver, monkeypatch):
+    monkeypatch.setattr(modlist_export, "async_session", TestSessionLocal)
+
+    await asyncio.gather(*(modlist_export.refresh_export(modlist.id, "key") for _ in range(3)))
+
+    assert len(resolver) == 1
+    assert len(resolver[0]) == 40
+    assert not modlist_export._refreshing
@@ -0,0 +1,81 @@
+"""Tests for GET /api/modlist/mine pagination and summary mode."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.api.deps import get_current_user
+from app.main import app
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.models.user import User
+
+
+@pytest_asyncio.fixture
+async def user_with_modlists(db_session):
+    user = User(email="pager@example.com")
+    db_session.add(user)
+    await db_session.flush()
+
+    base = datetime(2025, 1, 1)
+    for i in range(5):
+        ml = Modlist(game_id=1, playstyle_id=1, user_id=user.id, created_at=base + timedelta(hours=i))
+        db_session.add(ml)
+        await db_session.flush()
+        for order in (2, 1):
+            db_session.add(ModlistEntry(modlist_id=ml.id, name=f"Mod {i}.{order}", load_order=order))
+        db_session.add(ModlistKnowledgeFlag(
+            modlist_id=ml.id, mod_a_name="A", mod_b_name="B", issue="x", severity="warning",
+        ))
+    await db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+
+
+@pytest.mark.asyncio
+async def test_mine_without_limit_returns_everything(client, user_with_modlists):
+    response = await client.get("/api/modlist/mine")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 5
+    assert "X-Next-Cursor" not in response.headers
+    assert [e["load_order"] for e in data[0]["entries"]] == [1, 2]
+    assert len(data[0]["user_knowledge_flags"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_mine_keyset_pages_cover_all_lists_once(client, user_with_modlists):
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/modlist/mine", params=params)
+        assert response.status_code == 200
+        seen.extend(ml["id"] for ml in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_mine_summary_returns_counts(client, user_with_modlists):
+    response = await client.get("/api/modlist/mine/summary", params={"limit": 3})
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 3
+    assert data[0]["entry_count"] == 2
+    assert data[0]["flag_count"] == 1
+    assert data[0]["created_at"] > data[1]["created_at"]
+    assert response.headers["X-Next-Cursor"]
+
+
+@pytest.mark.asyncio
+async def test_mine_rejects_bad_cursor(client, user_with_modlists):
+    response = await client.get("/api/modlist/mine", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import select
+
+from app.api.modlist import clone_modlist, save_modlist_to_db
+from app.models.modlist import ModlistEntry, ModlistKnowledgeFlag
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.modlist_generator import GenerationResult
+
+
+RESULT = GenerationResult(
+    entries=[
+        {"nexus_mod_id": 12604, "name": "SkyUI", "load_order": 1},
+        {"name": "SkyUI Patch", "is_patch": True, "patches_mods": ["SkyUI"]},
+    ],
+    knowledge_flags=[{"mod_a": "SkyUI", "mod_b": "Other", "issue": "conflict"}],
+    llm_provider="test",
+)
+
+
+@pytest.mark.asyncio
+async def test_save_modlist_bulk_inserts_entries_and_flags(db_session):
+    request = ModlistGenerateRequest(game_id=1, playstyle_id=1)
+    modlist = await save_modlist_to_db(db_session, request, RESULT)
+
+    entries = (await db_session.execute(
+        select(ModlistEntry).where(ModlistEntry.modlist_id == modlist.id)
+        .order_by(ModlistEntry.load_order)
+    )).scalars().all()
+    assert [e.name for e in entries] == ["SkyUI", "SkyUI Patch"]
+    assert entries[1].load_order == 2
+    assert entries[1].is_patch and entries[1].patches_mods == ["SkyUI"]
+    assert all(e.enabled and e.download_status == "pending" for e in entries)
+
+    flags = (await db_session.execute(
+        select(ModlistKnowledgeFlag).where(ModlistKnowledgeFlag.modlist_id == modlist.id)
+    )).scalars().all()
+    assert [(f.mod_a_name, f.severity) for f in flags] == [("SkyUI", "warning")]
+
+
+@pytest.mark.asyncio
+async def test_clone_modlist_copies_children(db_session):
+    request = ModlistGenerateRequest(game_id=1, playstyle_id=1, gpu="RTX 4070")
+    source = await save_modlist_to_db(db_session, request, RESULT)
+    copy = await clone_modlist(db_session, source.id, request)
+
+    assert copy.id != source.id
+    assert copy.gpu_model == "RTX 4070"
+    entries = (await db_session.execute(
+        select(ModlistEntry).where(ModlistEntry.modlist_id == copy.id)
+    )).scalars().all()
+    assert len(entries) == 2
@@ -0,0 +1,106 @@
+"""Tests for NDJSON streaming of modlist reads (Accept: application/x-ndjson)."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+
+from app.api import modlist as modlist_api
+from app.api.deps import get_current_user
+from app.main import app
+from app.models.modlist import Modlist, ModlistEntry, ModlistKnowledgeFlag
+from app.models.user import User
+from tests.conftest import TestSessionLocal
+
+NDJSON = {"Accept": "application/x-ndjson"}
+
+
+def _lines(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+@pytest_asyncio.fixture
+async def streamed_modlists(db_session, monkeypatch):
+    # Streams open their own sessions; point them at the test database
+    monkeypatch.setattr(modlist_api, "async_session", TestSessionLocal)
+    monkeypatch.setattr(modlist_api, "async_read_session", TestSessionLocal)
+
+    user = User(email="stream@example.com")
+    db_session.add(user)
+    await db_session.flush()
+
+    base = datetime(2025, 1, 1)
+    modlists = []
+    for i in range(3):
+        ml = Modlist(game_id=1, playstyle_id=1, user_id=user.id, created_at=base + timedelta(hours=i))
+        db_session.add(ml)
+        await db_session.flush()
+        for order in (3, 1, 2):
+            db_session.add(ModlistEntry(modlist_id=ml.id, name=f"Mod {i}.{order}", load_order=order))
+        db_session.add(ModlistKnowledgeFlag(
+            modlist_id=ml.id, mod_a_name="A", mod_b_name="B", issue="x", severity="warning",
+        ))
+        modlists.append(ml)
+    await db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield modlists
+
+
+@pytest.mark.asyncio
+async def test_get_modlist_streams_header_entries_then_flags(client, streamed_modlists):
+    ml = streamed_modlists[0]
+    response = await client.get(f"/api/modlist/{ml.id}", headers=NDJSON)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = _lines(response)
+    assert [line["type"] for line in lines] == ["modlist", "entry", "entry", "entry", "flag"]
+    assert lines[0]["id"] == str(ml.id)
+    assert [line["load_order"] for line in lines[1:4]] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_modlist_stream_matches_json_response(client, streamed_modlists):
+    ml = streamed_modlists[1]
+    plain = (await client.get(f"/api/modlist/{ml.id}")).json()
+    lines = _lines(await client.get(f"/api/modlist/{ml.id}", headers=NDJSON))
+
+    assert [line["name"] for line in lines if line["type"] == "entry"] == [
+        entry["name"] for entry in plain["entries"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_modlist_stream_missing_is_404(client, streamed_modlists):
+    response = await client.get(
+        "/api/modlist/00000000-0000-0000-0000-000000000000", headers=NDJSON,
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_mine_streams_newest_first_with_cursors(client, streamed_modlists):
+    response = await client.get("/api/modlist/mine", headers=NDJSON)
+    assert response.status_code == 200
+
+    lines = _lines(response)
+    headers = [line for line in lines if line["type"] == "modlist"]
+    assert [h["id"] for h in headers] == [str(ml.id) for ml in reversed(streamed_modlists)]
+    assert all(h["cursor"] for h in headers)
+    assert sum(line["type"] == "entry" for line in lines) == 9
+    assert sum(line["type"] == "flag" for line in lines) == 3
+
+    # Resuming from the first list's cursor skips it
+    resumed = _lines(await client.get(
+        "/api/modlist/mine", params={"cursor": headers[0]["cursor"], "limit": 1}, headers=NDJSON,
+    ))
+    assert [line["id"] for line in resumed if line["type"] == "modlist"] == [headers[1]["id"]]
+    assert {line["modlist_id"] for line in resumed if line["type"] != "modlist"} == {headers[1]["id"]}
+
+
+@pytest.mark.asyncio
+async def test_mine_stream_rejects_bad_cursor(client, streamed_modlists):
+    response = await client.get("/api/modlist/mine", params={"cursor": "nope"}, headers=NDJSON)
+    assert response.status_code == 400
@@ -0,0 +1,52 @@
+"""EXPLAIN QUERY PLAN checks: hot API queries must use an index, not a scan."""
+
+import uuid
+
+import pytest
+from sqlalchemy import select
+
+from app.api.modlist import _paginate_mine
+from app.models.compatibility import CompatibilityRule
+from app.models.mod import Mod
+from app.models.mod_build_phase import ModBuildPhase
+from app.models.modlist import ModlistEntry, ModlistKnowledgeFlag, Modlist
+from app.models.playstyle_mod import PlaystyleMod
+from app.models.refresh_token import RefreshToken
+
+
+QUERIES = {
+    "get_modlist entries": select(ModlistEntry)
+        .where(ModlistEntry.modlist_id == uuid.uuid4())
+        .order_by(ModlistEntry.load_order, ModlistEntry.id),
+    "get_modlist flags": select(ModlistKnowledgeFlag)
+        .where(ModlistKnowledgeFlag.modlist_id == uuid.uuid4()),
+    "mine page": _paginate_mine(select(Modlist), uuid.uuid4(), 20, None),
+    "phases for game": select(ModBuildPhase)
+        .where(ModBuildPhase.game_id == 1)
+        .order_by(ModBuildPhase.phase_number),
+    "rag playstyle mods": select(PlaystyleMod).where(PlaystyleMod.playstyle_id == 1),
+    "compatibility rules": select(CompatibilityRule).where(CompatibilityRule.mod_id.in_([1, 2])),
+    "refresh token lookup": select(RefreshToken).where(RefreshToken.token_hash == "abc"),
+    "mod by nexus id": select(Mod).where(
+        Mod.nexus_game_domain == "skyrimspecialedition", Mod.nexus_mod_id == 12604,
+    ),
+}
+
+
+async def _plan(session, stmt) -> list[str]:
+    conn = await session.connection()
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    # Parameter values don't affect the plan shape; bind NULLs
+    params = tuple(None for _ in compiled.positiontup)
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return [row[-1] for row in result.all()]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(QUERIES))
+async def test_query_uses_index(db_session, name):
+    plan = await _plan(db_session, QUERIES[name])
+    assert plan, name
+    for step in plan:
+        assert "INDEX" in step, f"{name}: {plan}"
+    assert not any("TEMP B-TREE" in step for step in plan), f"{name}: {plan}"
@@ -0,0 +1,84 @@
+"""Tests for cached reference-data endpoints and app counters."""
+
+import pytest
+import pytest_asyncio
+
+from app.api.modlist import save_modlist_to_db
+from app.models.game import Game
+from app.schemas.modlist import ModlistGenerateRequest
+from app.services.modlist_generator import GenerationResult
+from app.services.reference_cache import (
+    ReferenceDataCache,
+    bump_reference_version,
+    get_counter,
+    increment_counter,
+)
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def fresh_cache():
+    ReferenceDataCache._instance = ReferenceDataCache(ttl_seconds=0)
+    yield
+    ReferenceDataCache._instance = None
+
+
+@pytest.mark.asyncio
+async def test_games_sends_etag_and_honours_if_none_match(client, db_session):
+    db_session.add(Game(name="Skyrim SE", slug="skyrimse", nexus_domain="skyrimspecialedition"))
+    await db_session.commit()
+
+    response = await client.get("/api/games/")
+    assert response.status_code == 200
+    assert response.json()[0]["slug"] == "skyrimse"
+    assert "max-age" in response.headers["cache-control"]
+
+    cached = await client.get("/api/games/", headers={"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_games_cache_rebuilds_only_after_version_bump(client, db_session):
+    db_session.add(Game(name="Skyrim SE", slug="skyrimse", nexus_domain="skyrimspecialedition"))
+    await db_session.commit()
+    assert len((await client.get("/api/games/")).json()) == 1
+
+    db_session.add(Game(name="Fallout 4", slug="fallout4", nexus_domain="fallout4"))
+    await db_session.commit()
+    assert len((await client.get("/api/games/")).json()) == 1
+
+    await bump_reference_version(db_session)
+    await db_session.commit()
+    assert len((await client.get("/api/games/")).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_uses_generation_counter(client, db_session):
+    request = ModlistGenerateRequest(game_id=1, playstyle_id=1)
+    result = GenerationResult(entries=[], knowledge_flags=[], llm_provider="test")
+    await save_modlist_to_db(db_session, request, result)
+    await save_modlist_to_db(db_session, request, result)
+
+    response = await client.get("/api/stats/")
+    assert response.status_code == 200
+    assert response.json()["modlists_generated"] == 2
+    assert response.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_playstyles_for_unknown_game_are_not_cached(client, db_session):
+    game = Game(name="Skyrim SE", slug="skyrimse", nexus_domain="skyrimspecialedition")
+    db_session.add(game)
+    await db_session.commit()
+
+    assert (await client.get(f"/api/games/{game.id}/playstyles")).status_code == 200
+    for game_id in (game.id + 1, game.id + 2):
+        assert (await client.get(f"/api/games/{game_id}/playstyles")).status_code == 404
+    assert set(ReferenceDataCache.get_instance()._entries) == {"games", f"playstyles:{game.id}"}
+
+
+@pytest.mark.asyncio
+async def test_increment_counter_creates_then_adds(db_session):
+    await increment_counter(db_session, "test_counter", 2)
+    await increment_counter(db_session, "test_counter", 3)
+    await db_session.commit()
+    assert await get_counter(db_session, "test_counter") == 5
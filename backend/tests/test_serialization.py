@@ -0,0 +1,28 @@
+import json
+import uuid
+from datetime import datetime
+
+from app.api.http_cache import compute_etag
+from app.serialization import dumps, loads, sse_frame
+
+
+def test_dumps_matches_stdlib_semantics():
+    payload = {"results": [{"mod_id": 1, "name": "SkyUI – ünïcode"}], "count": 1}
+    assert json.loads(dumps(payload)) == payload
+
+
+def test_dumps_accepts_int_keys_and_native_types():
+    ml_id = uuid.uuid4()
+    decoded = loads(dumps({12604: "desc", "id": ml_id, "at": datetime(2025, 1, 1)}))
+    assert decoded == {"12604": "desc", "id": str(ml_id), "at": "2025-01-01T00:00:00"}
+
+
+def test_sse_frame_format():
+    frame = sse_frame({"type": "phase_start", "phase": 1})
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):]) == {"type": "phase_start", "phase": 1}
+
+
+def test_etag_ignores_key_order():
+    assert compute_etag({"a": 1, "b": [1, 2]}) == compute_etag({"b": [1, 2], "a": 1})
+    assert compute_etag({"a": 1}) != compute_etag({"a": 2})
@@ -0,0 +1,128 @@
+"""Tests for the LLM spec-parse cache, call coalescing and deferred refinement."""
+
+import asyncio
+
+import pytest
+
+from app.schemas.specs import HardwareSpecs
+from app.services import spec_cache, spec_parser
+from app.services.spec_cache import SpecParseCache, spec_text_hash
+from app.services.spec_parser import parse_specs
+from tests.conftest import TestSessionLocal
+
+# Nothing the regex parser recognises, so every parse needs the LLM
+TEXT = "my pc has the green card thing (the big one)\nand the fast red processor"
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """Fake parse_specs_llm that records its calls."""
+    calls = []
+    result = {"specs": HardwareSpecs(gpu="NVIDIA GeForce RTX 4090", cpu="AMD Ryzen 9 7950X")}
+
+    async def fake_parse_specs_llm(raw_text):
+        calls.append(raw_text)
+        await asyncio.sleep(0.05)
+        return result["specs"]
+
+    monkeypatch.setattr(spec_parser, "parse_specs_llm", fake_parse_specs_llm)
+    monkeypatch.setattr(spec_cache, "async_session", TestSessionLocal)
+    monkeypatch.setattr(SpecParseCache, "_instance", SpecParseCache(max_entries=10))
+    return calls, result
+
+
+def test_hash_ignores_whitespace_differences():
+    assert spec_text_hash("GPU:  RTX 4090\r\n CPU: x ") == spec_text_hash("GPU: RTX 4090 CPU: x")
+    assert spec_text_hash("RTX 4090") != spec_text_hash("RTX 4080")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_texts_share_one_llm_call(llm):
+    calls, _ = llm
+    variants = [TEXT, TEXT + "\n", "  " + TEXT.replace("\n", "  "), TEXT, TEXT]
+
+    results = await asyncio.gather(*(parse_specs(text) for text in variants))
+
+    assert len(calls) == 1
+    assert all(method == "llm" for _, method in results)
+    assert SpecParseCache.get_instance().stats()["coalesced"] == 4
+
+    specs, method = await parse_specs(TEXT)
+    assert (specs.gpu, method) == ("NVIDIA GeForce RTX 4090", "llm")
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_database_tier_survives_a_new_process(llm):
+    calls, _ = llm
+    await parse_specs(TEXT)
+
+    SpecParseCache._instance = SpecParseCache(max_entries=10)  # fresh memory
+    specs, method = await parse_specs(TEXT)
+
+    assert method == "llm"
+    assert specs.cpu == "AMD Ryzen 9 7950X"
+    assert len(calls) == 1
+    assert SpecParseCache.get_instance().stats()["db_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_llm_call_is_not_cached(llm):
+    calls, result = llm
+    result["specs"] = None
+
+    assert (await parse_specs(TEXT))[1] == "regex_partial"
+    assert (await parse_specs(TEXT))[1] == "regex_partial"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_deferred_parse_returns_regex_result_then_refines(client, llm):
+    calls, _ = llm
+    response = await client.post("/api/specs/parse", json={"raw_text": TEXT, "defer_llm": True})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["parse_method"] == "regex_partial"
+    assert data["refine_id"] == spec_text_hash(TEXT)
+
+    refined = await client.get(f"/api/specs/refine/{data['refine_id']}")
+    assert refined.status_code == 200
+    assert refined.json()["status"] == "done"
+    assert refined.json()["specs"]["gpu"] == "NVIDIA GeForce RTX 4090"
+    assert refined.json()["tier"] is not None
+
+    # Once cached, a deferred parse answers with the LLM result directly
+    again = (await client.post("/api/specs/parse", json={"raw_text": TEXT, "defer_llm": True})).json()
+    assert (again["parse_method"], again["refine_id"]) == ("llm", None)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_refine_reports_pending_and_unknown(client, llm):
+    response = await client.post("/api/specs/parse", json={"raw_text": TEXT, "defer_llm": True})
+    refine_id = response.json()["refine_id"]
+
+    pending = await client.get(f"/api/specs/refine/{refine_id}", params={"wait": 0})
+    assert pending.status_code == 202
+    assert pending.json()["status"] == "pending"
+
+    assert (await client.get(f"/api/specs/refine/{refine_id}")).json()["status"] == "done"
+    assert (await client.get(f"/api/specs/refine/{'0' * 64}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_database_failure_is_logged_not_raised(llm, monkeypatch, caplog):
+    calls, _ = llm
+
+    def broken_session():
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(spec_cache, "async_session", broken_session)
+    text_hash, task = SpecParseCache.get_instance().start(TEXT)
+
+    specs = await task
+    assert specs.gpu == "NVIDIA GeForce RTX 4090"
+    assert "Failed to persist spec parse result" in caplog.text
+    # Still served from memory
+    assert await SpecParseCache.get_instance().lookup(text_hash) == specs
+    assert len(calls) == 1
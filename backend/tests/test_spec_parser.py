@@ -1,4 +1,21 @@
-from app.services.spec_parser import parse_specs_regex
+from pathlib import Path
+
+import pytest
+
+from app.services.spec_parser import (
+    _ANCHORS,
+    CPU_CORE_PATTERNS,
+    CPU_PATTERNS,
+    CPU_SPEED_PATTERNS,
+    DRIVE_PATTERN,
+    GPU_PATTERNS,
+    RAM_PATTERNS,
+    VRAM_PATTERNS,
+    _FullScan,
+    _parse_scan,
+    _Scan,
+    parse_specs_regex,
+)
 
 
 def test_parse_nvidia_gpu():
@@ -82,3 +99,64 @@ def test_parse_empty_text():
     assert specs.vram_mb is None
     assert specs.cpu is None
     assert specs.ram_gb is None
+
+
+# Keyword-anchored scanning must return exactly what full-text search does
+
+DUMPS_DIR = Path(__file__).parent / "fixtures" / "spec_dumps"
+SPEC_DUMPS = sorted(DUMPS_DIR.glob("*.txt"))
+ALL_PATTERNS = [
+    *GPU_PATTERNS, *VRAM_PATTERNS, *CPU_PATTERNS, *RAM_PATTERNS,
+    *CPU_CORE_PATTERNS, *CPU_SPEED_PATTERNS, DRIVE_PATTERN,
+]
+
+
+def _texts():
+    texts = [path.read_text(encoding="utf-8") for path in SPEC_DUMPS]
+    return texts + ["\n".join(texts), "\n".join(reversed(texts))]
+
+
+@pytest.mark.parametrize("path", SPEC_DUMPS, ids=lambda p: p.stem)
+def test_scan_matches_full_search_on_dump(path):
+    text = path.read_text(encoding="utf-8")
+    assert _parse_scan(_Scan(text)) == _parse_scan(_FullScan(text))
+
+
+def test_scan_matches_full_search_per_pattern():
+    for text in _texts():
+        scan, full = _Scan(text), _FullScan(text)
+        for pattern in ALL_PATTERNS:
+            ours, reference = scan.search(pattern), full.search(pattern)
+            assert (ours and ours.span()) == (reference and reference.span()), pattern.pattern
+
+
+def test_anchor_keywords_appear_in_every_match():
+    for text in _texts():
+        for pattern, (starts, requires) in _ANCHORS.items():
+            for match in pattern.finditer(text):
+                matched = match.group(0).lower()
+                if starts:
+                    assert matched.startswith(starts), pattern.pattern
+                else:
+                    assert any(k in matched for k in requires), pattern.pattern
+
+
+def test_scan_falls_back_when_lowercasing_changes_length():
+    # "İ".lower() is two characters, so keyword positions would drift
+    text = "İİİ GPU: NVIDIA GeForce RTX 3080, 10 GB GDDR6X, System Memory: 32 GB"
+    assert _parse_scan(_Scan(text)) == _parse_scan(_FullScan(text))
+    assert parse_specs_regex(text).gpu == "NVIDIA GeForce RTX 3080"
+
+
+def test_parse_dxdiag_dump():
+    specs = parse_specs_regex((DUMPS_DIR / "dxdiag.txt").read_text(encoding="utf-8"))
+    assert specs.gpu == "NVIDIA GeForce RTX 4070 Ti"
+    assert specs.cpu == "AMD Ryzen 7 7800X3D"
+    assert specs.ram_gb == 32
+    assert specs.cpu_cores == 8
+    assert specs.cpu_speed_ghz == 4.2
+
+
+def test_infer_vram_prefers_longest_model_name():
+    specs = parse_specs_regex("RTX 4070 Ti SUPER")
+    assert specs.vram_mb == 16 * 1024
@@ -0,0 +1,82 @@
+"""Tests for POST /api/specs/parse-batch and the re-tier job."""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.api.deps import get_current_user
+from app.jobs.retier_users import retier_users
+from app.main import app
+from app.models.user import User
+from app.services.spec_parser import parse_specs_regex
+from app.services.tier_classifier import classify_hardware_tier
+
+TEXTS = [
+    "NVIDIA GeForce RTX 4090 24GB GDDR6X, AMD Ryzen 7 7800X3D, 64 GB DDR5",
+    "GTX 1050 Ti, Intel Core i5-7400, 8 GB DDR4",
+    "no idea what is in this box",
+]
+
+
+@pytest_asyncio.fixture
+async def user(db_session):
+    user = User(email="batch@example.com")
+    db_session.add(user)
+    await db_session.commit()
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield user
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_matches_single_parse(client, user):
+    response = await client.post("/api/specs/parse-batch", json={"raw_texts": TEXTS})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [r["parse_method"] for r in data["results"]] == ["regex", "regex", "regex_partial"]
+    for text, result in zip(TEXTS, data["results"]):
+        specs = parse_specs_regex(text)
+        assert result["specs"] == specs.model_dump()
+        assert result["tier"] == classify_hardware_tier(
+            gpu=specs.gpu, vram_mb=specs.vram_mb, cpu=specs.cpu, ram_gb=specs.ram_gb,
+            cpu_cores=specs.cpu_cores, cpu_speed_ghz=specs.cpu_speed_ghz,
+        )["tier"]
+    assert sum(data["tier_counts"].values()) == len(TEXTS)
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_rejects_oversized_batch(client, user, monkeypatch):
+    from app.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "specs_batch_max_items", 2)
+    response = await client.post("/api/specs/parse-batch", json={"raw_texts": TEXTS})
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_parse_batch_requires_auth(client):
+    response = await client.post("/api/specs/parse-batch", json={"raw_texts": TEXTS})
+    assert response.status_code == 403  # HTTPBearer rejects a missing token
+
+
+@pytest.mark.asyncio
+async def test_retier_updates_only_changed_users(db_session):
+    stale = User(email="stale@example.com", gpu_model="RTX 4090", vram_mb=24576, ram_gb=64, hardware_tier="low")
+    current = User(email="current@example.com", gpu_model="GTX 1050", vram_mb=2048, ram_gb=8, hardware_tier="low")
+    no_specs = User(email="nospecs@example.com")
+    db_session.add_all([stale, current, no_specs])
+    await db_session.commit()
+
+    dry = await retier_users(db_session, batch_size=1, dry_run=True)
+    assert dry == {"low -> high": 1}
+
+    changes = await retier_users(db_session, batch_size=1)
+    assert changes == {"low -> high": 1}
+
+    tiers = dict((await db_session.execute(select(User.email, User.hardware_tier))).all())
+    assert tiers == {
+        "stale@example.com": "high",
+        "current@example.com": "low",
+        "nospecs@example.com": None,
+    }
+    assert await retier_users(db_session) == {}
@@ -0,0 +1,90 @@
+import itertools
+
+import pytest
+
+from app.schemas.specs import HardwareSpecs
+from app.services.tier_classifier import _tier_from_score, classify_hardware_tier, classify_hardware_tiers
+
+GPUS = [None, "NVIDIA GeForce RTX 4090", "GTX 1060", "AMD Radeon RX 6700 XT", "Intel Arc B580", "Voodoo 3"]
+VRAM = [None, 2048, 4095, 4096, 8192, 12288, 16384]
+CPUS = [None, "AMD Ryzen 7 7800X3D", "Intel Core i5-12600K", "Intel Core Ultra 7 265K"]
+RAM = [None, 4, 8, 16, 32, 64]
+CORES = [None, 2, 4, 6, 8, 12, 16]
+SPEEDS = [None, 3.0, 3.5, 4.0, 4.5, 5.0]
+FIELDS = ["gpu", "vram_mb", "cpu", "ram_gb", "cpu_cores", "cpu_speed_ghz"]
+
+
+def test_band_boundaries():
+    assert classify_hardware_tier(vram_mb=16 * 1024)["vram_score"] == 30
+    assert classify_hardware_tier(vram_mb=16 * 1024 - 1)["vram_score"] == 27
+    assert classify_hardware_tier(vram_mb=1)["vram_score"] == 5
+    assert classify_hardware_tier(cpu_cores=16, cpu_speed_ghz=5.0)["cpu_score"] == 22
+    assert classify_hardware_tier(cpu_cores=3, cpu_speed_ghz=3.49)["cpu_score"] == 2
+    assert classify_hardware_tier(ram_gb=64)["ram_score"] == 20
+    assert classify_hardware_tier(ram_gb=63)["ram_score"] == 17
+
+
+# Values of the if/elif ladders the band tables replaced, on and just
+# below every cut-off
+@pytest.mark.parametrize("vram_gb,expected", [
+    (16, 30), (15.99, 27), (12, 27), (11.99, 23), (8, 23), (7.99, 18),
+    (6, 18), (5.99, 12), (4, 12), (3.99, 5), (0.5, 5),
+])
+def test_vram_ladder(vram_gb, expected):
+    assert classify_hardware_tier(vram_mb=round(vram_gb * 1024))["vram_score"] == expected
+
+
+@pytest.mark.parametrize("cores,expected", [
+    (32, 18), (16, 18), (15, 15), (12, 15), (11, 12), (8, 12), (7, 8), (6, 8), (5, 5), (4, 5), (3, 2), (1, 2),
+])
+def test_cpu_core_ladder(cores, expected):
+    assert classify_hardware_tier(cpu_cores=cores)["cpu_score"] == expected
+
+
+@pytest.mark.parametrize("speed,expected", [
+    (5.5, 4), (5.0, 4), (4.99, 3), (4.5, 3), (4.49, 2), (4.0, 2), (3.99, 1), (3.5, 1), (3.49, 0), (1.0, 0),
+])
+def test_cpu_speed_ladder(speed, expected):
+    assert classify_hardware_tier(cpu_speed_ghz=speed)["cpu_score"] == expected
+
+
+@pytest.mark.parametrize("ram_gb,expected", [
+    (128, 20), (64, 20), (63, 17), (32, 17), (31, 12), (16, 12), (15, 5), (8, 5), (7, 2), (1, 2),
+])
+def test_ram_ladder(ram_gb, expected):
+    assert classify_hardware_tier(ram_gb=ram_gb)["ram_score"] == expected
+
+
+@pytest.mark.parametrize("overall,expected", [
+    (100, "ultra"), (76, "ultra"), (75, "high"), (56, "high"), (55, "mid"), (31, "mid"), (30, "low"), (0, "low"),
+])
+def test_tier_ladder(overall, expected):
+    assert _tier_from_score(overall) == expected
+
+
+def test_tier_thresholds():
+    # RTX 5090 = 25 and any VRAM >= 5: 30 is the top "low" score
+    assert classify_hardware_tier(gpu="RTX 5090", vram_mb=1)["tier"] == "low"
+    assert classify_hardware_tier(gpu="RTX 5090", vram_mb=1, ram_gb=1)["tier"] == "mid"
+    assert classify_hardware_tier(gpu="RTX 5090", vram_mb=16384, ram_gb=1)["tier"] == "high"
+    assert classify_hardware_tier()["tier"] == "low"
+    top = classify_hardware_tier(
+        gpu="RTX 5090", vram_mb=32768, cpu="Ryzen 7 9800X3D",
+        ram_gb=64, cpu_cores=16, cpu_speed_ghz=5.2,
+    )
+    assert top["tier"] == "ultra"
+    assert top["overall_score"] == 100
+
+
+def test_batch_matches_scalar_for_every_combination():
+    records = [dict(zip(FIELDS, values)) for values in itertools.product(GPUS, VRAM, CPUS, RAM, CORES, SPEEDS)]
+    assert classify_hardware_tiers(records) == [classify_hardware_tier(**r) for r in records]
+
+
+def test_batch_accepts_specs_objects_and_user_field_names():
+    specs = HardwareSpecs(gpu="RTX 4070", vram_mb=12288, cpu="Ryzen 5 5600X", ram_gb=32)
+    user_row = {"gpu_model": "RTX 4070", "vram_mb": 12288, "cpu_model": "Ryzen 5 5600X", "ram_gb": 32}
+    expected = classify_hardware_tier(gpu="RTX 4070", vram_mb=12288, cpu="Ryzen 5 5600X", ram_gb=32)
+
+    assert classify_hardware_tiers([specs, user_row]) == [expected, expected]
+    assert classify_hardware_tiers([]) == []
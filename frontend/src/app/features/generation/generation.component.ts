@@ -355,7 +355,9 @@ interface TimelineItem {
             @for (mod of gen.modsAdded(); track mod.mod_id) {
               <div class="mod-card">
                 <div class="mod-card-top">
-                  <span class="lo-badge">#{{ mod.load_order }}</span>
+                  @if (mod.load_order != null) {
+                    <span class="lo-badge">#{{ mod.load_order }}</span>
+                  }
                   <span class="mod-name">{{ mod.name }}</span>
                 </div>
                 <p class="mod-reason">{{ mod.reason }}</p>
@@ -61,7 +61,8 @@ export interface ModAddedEvent {
   mod_id: number;
   name: string;
   reason: string;
-  load_order: number;
+  // Optional LLM hint; the final order is solved after generation
+  load_order: number | null;
   timestamp?: number;
 }
 
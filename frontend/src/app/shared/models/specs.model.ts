@@ -22,4 +22,5 @@ export interface SpecsParseResponse {
   parse_method: string;
   tier?: string;
   tier_scores?: TierScores;
+  refine_id?: string | null;
 }
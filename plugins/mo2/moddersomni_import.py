@@ -211,7 +211,12 @@ class ImportDialog(QDialog):
     def _set_load_order(self):
         """Set mod priorities based on the modlist load order."""
         modlist = self._organizer.modList()
-        ordered = sorted(self._pending_downloads, key=lambda e: e.get("load_order", 999))
+        # Export order already follows load_order; the stable sort keeps it
+        # for ties and puts entries without a position last
+        ordered = sorted(
+            self._pending_downloads,
+            key=lambda e: e["load_order"] if e.get("load_order") is not None else 999,
+        )
 
         for priority, entry in enumerate(ordered):
             name = entry.get("name", "")